@@ -1,16 +1,24 @@
+import abc
+import array
 import base64
+import binascii
+import collections.abc
+import contextvars
 import copy
 import datetime
 import decimal
 import functools
 from iso8601 import iso8601
 import itertools
+import json
 import mimetypes
 import pprint
 import re
+import string
 import translationstring
 import types
 import warnings
+import weakref
 
 _ = translationstring.TranslationStringFactory('colander')
 
@@ -180,26 +188,25 @@ class Invalid(Exception):
         the root schema node, the rightmost item will represent the
         leaf schema node.
         """
-
-        def traverse(node, stack):
-            stack.append(node)
-
-            if not node.children:
-                yield tuple(stack)
-
-            for child in node.children:
-                yield from traverse(child, stack)
-
-            stack.pop()
-
-        return traverse(self, [])
+        path = []
+        stack = [(self, 0)]
+        while stack:
+            exc, depth = stack.pop()
+            del path[depth:]
+            path.append(exc)
+            children = exc.children
+            if children:
+                depth += 1
+                stack.extend([(child, depth) for child in children[::-1]])
+            else:
+                yield tuple(path)
 
     def _keyname(self):
         if self.positional:
             return str(self.pos)
         return str(self.node.name)
 
-    def asdict(self, translate=None, separator='; '):
+    def asdict(self, translate=None, separator='; ', limit=None):
         """Return a dict holding a basic error report for this exception.
 
         The values in the dict will **not** be language-translated by
@@ -211,24 +218,32 @@ class Invalid(Exception):
         language-translated.
 
         If ``separator`` is supplied, error messages are joined with that.
+
+        If ``limit`` is supplied, at most ``limit`` paths are reported.
         """
-        paths = self.paths()
+        # the messages of each exception are rendered once and passed
+        # down to its descendants with its dotted path
         errors = {}
-        for path in paths:
-            keyparts = []
-            msgs = []
-            for exc in path:
-                exc.msg and msgs.extend(exc.messages())
-                keyname = exc._keyname()
-                keyname and keyparts.append(keyname)
-            if translate:
-                msgs = [translate(msg) for msg in msgs]
-            msgs = interpolate(msgs)
-            if separator:
-                msgs = separator.join(msgs)
+        stack = [(self, '', ())]
+        while stack:
+            exc, path, msgs = stack.pop()
+            keyname = exc._keyname()
+            if keyname:
+                path = f'{path}.{keyname}' if path else keyname
+            if exc.msg:
+                own = exc.messages()
+                if translate:
+                    own = [translate(msg) for msg in own]
+                msgs = msgs + tuple(interpolate(own))
+            children = exc.children
+            if children:
+                stack.extend([(child, path, msgs) for child in children[::-1]])
+            elif limit is not None and len(errors) >= limit:
+                break
+            elif separator:
+                errors[path] = separator.join(msgs)
             else:
-                msgs = list(msgs)
-            errors['.'.join(keyparts)] = msgs
+                errors[path] = list(msgs)
         return errors
 
     def __str__(self):
@@ -243,7 +258,224 @@ class UnsupportedFields(Invalid):
         self.fields = fields
 
 
-class All:
+class ErrorCollector:
+    """An append-only buffer of compact error records, filled by
+    :meth:`colander.SchemaNode.deserialize` when it is passed as its
+    ``errors`` argument, or by :meth:`add`.
+
+    Each error message of an :exc:`colander.Invalid` is stored as a record
+    ``(index, path, msgid, mapping)``: ``index`` is the position of the
+    deserialized data structure among those passed through the collector,
+    ``path`` is the dotted name of the failing node, as a key of the
+    dictionary returned by :meth:`colander.Invalid.asdict`, ``msgid`` is the
+    message (the message identifier of a translation string) and
+    ``mapping`` its replacement values, or ``None``.  The records are kept
+    in columns and neither the schema nodes nor the exceptions are
+    retained, so that a collector is cheap to keep, to :mod:`pickle` and
+    to send to another process; the messages are rendered or translated
+    later, in bulk, by :meth:`messages` or :meth:`asdicts`.
+
+    Iterating over a collector yields its records; its length is their
+    number.  The ``records`` attribute is the number of data structures
+    passed through the collector, valid or not.
+    """
+
+    def __init__(self):
+        self.records = 0
+        self.indexes = array.array('q')
+        self.paths = []
+        # the (msgid, domain, default, context) of the distinct messages,
+        # ``default`` being None for messages which are plain strings, and
+        # the position of the message of each record (-1 for none)
+        self.templates = []
+        self.template_ids = array.array('q')
+        self.mappings = []
+        self._template_index = {}
+        self._path_index = {}
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self):
+        templates = self.templates
+        for index, path, template_id, mapping in zip(
+            self.indexes, self.paths, self.template_ids, self.mappings
+        ):
+            msgid = templates[template_id][0] if template_id >= 0 else None
+            yield index, path, msgid, mapping
+
+    def _template_id(self, msg):
+        # the position of the template of the message ``msg``
+        if isinstance(msg, translationstring.TranslationString):
+            # equal to the template, whose msgid is a plain string
+            key = (msg, msg.domain, msg.default, msg.context)
+        else:
+            key = (msg, None, None, None)
+        template_id = self._template_index.get(key)
+        if template_id is None:
+            template_id = len(self.templates)
+            template = (str(msg),) + key[1:]
+            self._template_index[template] = template_id
+            self.templates.append(template)
+        return template_id
+
+    def add(self, exc, index=None):
+        """Add a record for each error message of the
+        :exc:`colander.Invalid` ``exc``, as reported by its
+        :meth:`colander.Invalid.asdict` method; the messages of a node
+        apply to each of its failing descendants.  A failing node without
+        messages gets a record whose ``msgid`` is ``None``.
+
+        ``index`` defaults to the position of a new data structure, which
+        is counted in ``records``."""
+        if index is None:
+            index = self.records
+        self.records = max(self.records, index + 1)
+        template_id = self._template_id
+        intern = self._path_index.setdefault
+        indexes = self.indexes
+        paths = self.paths
+        template_ids = self.template_ids
+        mappings = self.mappings
+        stack = [(exc, '', ())]
+        while stack:
+            exc, path, msgs = stack.pop()
+            keyname = exc._keyname()
+            if keyname:
+                path = f'{path}.{keyname}' if path else keyname
+            if exc.msg:
+                msgs = msgs + tuple(
+                    [
+                        (template_id(msg), getattr(msg, 'mapping', None))
+                        for msg in exc.messages()
+                    ]
+                )
+            children = exc.children
+            if children:
+                for child in reversed(children):
+                    stack.append((child, path, msgs))
+                continue
+            path = intern(path, path)
+            for msg_id, mapping in msgs or ((-1, None),):
+                indexes.append(index)
+                paths.append(path)
+                template_ids.append(msg_id)
+                mappings.append(mapping)
+
+    def extend(self, other, offset=None):
+        """Append the records of the collector ``other``, adding
+        ``offset`` to their index; ``offset`` defaults to ``records``, so
+        that the data structures passed through ``other`` are counted
+        after those already passed through this collector."""
+        if offset is None:
+            offset = self.records
+        ids = [self._template_id(_message(t)) for t in other.templates]
+        for index, path, template_id, mapping in zip(
+            other.indexes, other.paths, other.template_ids, other.mappings
+        ):
+            template_id = ids[template_id] if template_id >= 0 else -1
+            self.indexes.append(index + offset)
+            self.paths.append(self._path_index.setdefault(path, path))
+            self.template_ids.append(template_id)
+            self.mappings.append(mapping)
+        self.records = max(self.records, offset + other.records)
+
+    def messages(self, translate=None):
+        """Return the list of the rendered message of each record, like
+        :meth:`colander.Invalid.asdict` renders them: ``translate``, if
+        supplied, is called with each translation string and the result is
+        interpolated.  Records with the same message and replacement
+        values are only rendered once.  The message of a record whose
+        ``msgid`` is ``None`` is ``None``."""
+        templates = self.templates
+        cache = {}
+        result = []
+        for template_id, mapping in zip(self.template_ids, self.mappings):
+            if template_id < 0:
+                result.append(None)
+                continue
+            try:
+                # the types tell apart the values which are equal but are
+                # rendered differently, e.g. 1, 1.0 and True
+                items = mapping.items() if mapping else ()
+                key = template_id, frozenset(
+                    [(k, type(v), v) for k, v in items]
+                )
+                text = cache.get(key)
+            except TypeError:
+                # unhashable replacement values
+                key = text = None
+            if text is None:
+                text = _render(templates[template_id], mapping, translate)
+                if key is not None:
+                    cache[key] = text
+            result.append(text)
+        return result
+
+    def asdicts(self, translate=None, separator='; '):
+        """Return a dictionary mapping the index of each invalid data
+        structure to the dictionary :meth:`colander.Invalid.asdict` returns
+        for its error, with the same ``translate`` and ``separator``
+        arguments."""
+        result = {}
+        messages = self.messages(translate)
+        for index, path, text in zip(self.indexes, self.paths, messages):
+            errors = result.get(index)
+            if errors is None:
+                errors = result[index] = {}
+            msgs = errors.get(path)
+            if msgs is None:
+                msgs = errors[path] = []
+            if text is not None:
+                msgs.append(text)
+        if separator:
+            for errors in result.values():
+                for path, msgs in errors.items():
+                    errors[path] = separator.join(msgs)
+        return result
+
+
+def _message(template, mapping=None):
+    msgid, domain, default, context = template
+    if default is None:
+        return msgid
+    return translationstring.TranslationString(
+        msgid, domain, default, mapping, context
+    )
+
+
+def _render(template, mapping, translate):
+    msg = _message(template, mapping)
+    if translate:
+        msg = translate(msg)
+    if hasattr(msg, 'interpolate'):
+        msg = msg.interpolate()
+    return msg
+
+
+class _Validator:
+    # base class of the built-in validators, which return their error
+    # from ``_error`` rather than raising it, so that it can be collected
+    # without raising an exception
+
+    def __call__(self, node, value):
+        error = self._error(node, value)
+        if error is not None:
+            raise error
+
+
+def _validator_error(validator, node, value):
+    # return the error of ``validator`` for ``value``, or None
+    if type(validator).__call__ is _Validator.__call__:
+        return validator._error(node, value)
+    try:
+        validator(node, value)
+    except Invalid as e:
+        return e
+    return None
+
+
+class All(_Validator):
     """Composite validator
 
     Succeeds if none of its subvalidators raises :class:`colander.Invalid`.
@@ -252,13 +484,12 @@ class All:
     def __init__(self, *validators):
         self.validators = validators
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         excs = []
         for validator in self.validators:
-            try:
-                validator(node, value)
-            except Invalid as e:
-                excs.append(e)
+            exc = _validator_error(validator, node, value)
+            if exc is not None:
+                excs.append(exc)
 
         if excs:
             children = []
@@ -272,7 +503,8 @@ class All:
                 children.extend(exception.children)
             exc = Invalid(node, messages)
             exc.children.extend(children)
-            raise exc
+            return exc
+        return None
 
 
 class Any(All):
@@ -282,17 +514,15 @@ class Any(All):
     :class:`colander.Invalid`.
     """
 
-    def __call__(self, node, value):
-        try:
-            return super().__call__(node, value)
-        except Invalid as e:
-            if len(e.msg) < len(self.validators):
-                # At least one validator did not fail:
-                return
-            raise
+    def _error(self, node, value):
+        exc = super()._error(node, value)
+        if exc is not None and len(exc.msg) < len(self.validators):
+            # At least one validator did not fail:
+            return None
+        return exc
 
 
-class Function:
+class Function(_Validator):
     """Validator accepting a function and an optional message.
 
     ``function`` is called with ``value`` during validation.
@@ -336,25 +566,181 @@ class Function:
             msg = message
         self.msg = msg
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         result = self.function(value)
         if not result:
-            raise Invalid(
+            return Invalid(
                 node,
                 translationstring.TranslationString(
                     self.msg, mapping={'val': value}
                 ),
             )
         if isinstance(result, str):
-            raise Invalid(
+            return Invalid(
                 node,
                 translationstring.TranslationString(
                     result, mapping={'val': value}
                 ),
             )
+        return None
+
+
+class BatchValidator(_Validator, metaclass=abc.ABCMeta):
+    """Base class of the validators which check the values of a node in
+    batches, e.g. to look up all the values of a foreign key in one query
+    rather than one query per value.  Subclasses must override
+    :meth:`validate_batch`, which is abstract: a subclass which does not
+    cannot be instantiated.
+
+    When the node of such a validator is under a node of type
+    :class:`colander.Sequence`, at any depth, the deserialization of the
+    outermost sequence only collects the deserialized values of the node,
+    in the order of the cstruct; once all the items have been
+    deserialized, :meth:`validate_batch` is called once with all of them,
+    for each pair of validator and node.  If it finds errors, the sequence
+    is deserialized again with the values already checked, so that the
+    errors take the places in the tree of :exc:`colander.Invalid` which
+    errors raised by a regular validator would take, along with the other
+    errors of the sequence.  The cstruct is thus deserialized twice when a
+    batch has an error, reusing the lists of the items of its sequences,
+    so that iterators are only consumed once; the types, preparers and
+    other validators under the sequence must return the same results both
+    times, and a :exc:`ValueError` is raised when fewer values are found
+    the second time.
+
+    :meth:`colander.SchemaNode.deserialize`,
+    :meth:`colander.SchemaNode.try_deserialize` and
+    :meth:`colander.SchemaNode.validate` collect the values; elsewhere,
+    e.g. outside of a sequence or in
+    :meth:`colander.SchemaNode.check_appstruct`, each value is checked as
+    a batch of one.
+    """
+
+    @abc.abstractmethod
+    def validate_batch(self, node, values):
+        """Check the list ``values`` of deserialized values of ``node`` and
+        return a dictionary mapping the indexes in ``values`` of the
+        invalid values to their error messages, or ``None`` when they are
+        all valid."""
+
+    def _errors(self, node, values):
+        errors = self.validate_batch(node, values) or {}
+        indexes = range(len(values))
+        for index in errors:
+            if index not in indexes:
+                raise ValueError(
+                    f'{type(self).__name__}.validate_batch returned the '
+                    f'index {index!r} for a batch of {len(values)} values'
+                )
+        return {index: Invalid(node, msg) for index, msg in errors.items()}
+
+    def _error(self, node, value):
+        batch = _batches.get()
+        if batch is not None:
+            return batch.error(self, node, value)
+        return self._errors(node, [value]).get(0)
+
+
+class _Batch:
+    # the values collected for the batch validators under the outermost
+    # sequence being deserialized, then their errors, returned in the same
+    # order when the sequence is deserialized again
+
+    def __init__(self):
+        self.records = []
+        self.errors = None
+        self.position = 0
+        # the lists of the items of the cstructs of sequences by id
+        self.lists = {}
+
+    def list_items(self, cstruct):
+        # the list of the items of ``cstruct``, the same list in both
+        # deserializations of the sequence
+        entry = self.lists.get(id(cstruct))
+        if entry is None or entry[0] is not cstruct:
+            entry = self.lists[id(cstruct)] = (cstruct, list(cstruct))
+        return entry[1]
+
+    def error(self, validator, node, value):
+        if self.errors is None:
+            self.records.append((validator, node, value))
+            return None
+        position = self.position
+        self.position += 1
+        if position < len(self.records):
+            record = self.records[position]
+            if record[0] is validator and record[1] is node:
+                return self.errors[position]
+        # not the value checked at this position the first time
+        return validator._errors(node, [value]).get(0)
+
+    def validate(self):
+        # call each validator once per node, returning whether a value is
+        # invalid
+        groups = {}
+        for position, (validator, node, _value) in enumerate(self.records):
+            key = (id(validator), id(node))
+            groups.setdefault(key, []).append(position)
+        errors = [None] * len(self.records)
+        for positions in groups.values():
+            validator, node = self.records[positions[0]][:2]
+            values = [self.records[position][2] for position in positions]
+            for index, error in validator._errors(node, values).items():
+                errors[positions[index]] = error
+        self.errors = errors
+        return any(error is not None for error in errors)
+
+
+_batches = contextvars.ContextVar('colander_batches', default=None)
+
+
+def _reiterable(value):
+    # ``value``, an iterable, or the list of its items when it may be an
+    # iterator which is deserialized twice by a batch
+    if isinstance(value, (list, tuple)):
+        return value
+    batch = _batches.get()
+    if batch is None:
+        return value
+    return batch.list_items(value)
+
+
+def _batched(func, *args):
+    # call ``func``, which deserializes the items of a sequence, deferring
+    # the batch validators of its descendants to the end of the outermost
+    # sequence
+    if _batches.get() is not None:
+        return func(*args)
+    batch = _Batch()
+    token = _batches.set(batch)
+    try:
+        result, error = func(*args), None
+    except Invalid as e:
+        result, error = null, e
+    finally:
+        _batches.reset(token)
+    if not batch.records or not batch.validate():
+        if error is not None:
+            raise error
+        return result
+    token = _batches.set(batch)
+    try:
+        result, error = func(*args), None
+    except Invalid as e:
+        result, error = null, e
+    finally:
+        _batches.reset(token)
+    if batch.position < len(batch.records):
+        # values with errors may have been skipped
+        raise ValueError(
+            'The sequence was deserialized differently the second time'
+        )
+    if error is not None:
+        raise error
+    return result
 
 
-class Regex:
+class Regex(_Validator):
     """Regular expression validator.
 
     ``regex`` is a regular expression pattern that will be compiled and
@@ -392,9 +778,34 @@ class Regex:
         else:
             self.msg = msg
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         if self.match_object.match(value) is None:
-            raise Invalid(node, self.msg)
+            return Invalid(node, self.msg)
+        return None
+
+
+class _LinearRegex(Regex):
+    # A Regex whose strings are matched by ``function``, a hand-written
+    # equivalent of the pattern which runs in linear time.  The pattern is
+    # only compiled when ``match_object`` is used.
+
+    def __init__(self, regex, function, msg, flags=0):
+        self.regex = regex
+        self.function = function
+        self.flags = flags
+        self.msg = msg
+
+    @functools.cached_property
+    def match_object(self):
+        return re.compile(self.regex, self.flags)
+
+    def _error(self, node, value):
+        if not isinstance(value, str):
+            # raise the same error as the pattern
+            return super()._error(node, value)
+        if not self.function(value):
+            return Invalid(node, self.msg)
+        return None
 
 
 # Regex for email addresses.
@@ -409,8 +820,52 @@ EMAIL_RE = (
     r"(?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$"
 )
 
+_EMAIL_LOCAL_TABLE = dict.fromkeys(
+    map(ord, string.ascii_letters + string.digits + ".!#$%&'*+/=?^_`{|}~-")
+)
+_HOST_TABLE = dict.fromkeys(
+    map(ord, string.ascii_letters + string.digits + '-.')
+)
+
+
+def _is_labels(text):
+    # whether ``text`` is labels of 1 to 63 characters separated by dots,
+    # which neither start nor end with a dash
+    return bool(
+        text
+        and text[0] not in '-.'
+        and text[-1] not in '-.'
+        and '..' not in text
+        and '.-' not in text
+        and '-.' not in text
+        and (len(text) <= 63 or max(map(len, text.split('.'))) <= 63)
+    )
+
 
-class Email(Regex):
+def _only_host_chars(text, table):
+    # whether the characters of ``text`` which ``table`` does not delete are
+    # in the "\u00a1-\uffff" range of the host names of URL_REGEX
+    rest = text.translate(table)
+    return not rest or ('\u00a1' <= min(rest) and max(rest) <= '\uffff')
+
+
+def _is_email(value):
+    # EMAIL_RE without backtracking
+    if value.endswith('\n'):
+        # "$" matches before a final newline
+        value = value[:-1]
+    local, at, domain = value.partition('@')
+    return bool(
+        local
+        and local.isascii()
+        and not local.translate(_EMAIL_LOCAL_TABLE)
+        and domain.isascii()
+        and _is_labels(domain)
+        and _only_host_chars(domain, _HOST_TABLE)
+    )
+
+
+class Email(_LinearRegex):
     """Email address validator.
 
     If ``msg`` is supplied, it will be the error message to be used
@@ -421,7 +876,7 @@ class Email(Regex):
     def __init__(self, msg=None):
         if msg is None:
             msg = _("Invalid email address")
-        super().__init__(EMAIL_RE, msg=msg)
+        super().__init__(EMAIL_RE, _is_email, msg)
 
 
 # Regex for data URLs, loosely based on MDN:
@@ -469,10 +924,10 @@ class DataURL(Regex):
         self.base64_err = base64_err
         super().__init__(DATA_URL_REGEX, msg=url_err, flags=re.IGNORECASE)
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         match_ = self.match_object.match(value)
         if match_ is None:
-            raise Invalid(node, self.url_err)
+            return Invalid(node, self.url_err)
         excs = []
         mime, is_base64_data, data = match_.groups()
         if mime and mime not in mimetypes.types_map.values():
@@ -483,12 +938,13 @@ class DataURL(Regex):
         except Exception:
             excs.append(self.base64_err)
         if len(excs) == 1:
-            raise Invalid(node, excs[0])
+            return Invalid(node, excs[0])
         elif len(excs) == 2:
-            raise Invalid(node, excs)
+            return Invalid(node, excs)
+        return None
 
 
-class Range:
+class Range(_Validator):
     """Enforces that a value lies within a given range.
 
     Raises if the value it is less than ``min`` or greater than ``max``.
@@ -527,23 +983,24 @@ class Range:
         self.min_err = min_err
         self.max_err = max_err
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         if self.min is not None:
             if value < self.min:
                 min_err = _(
                     self.min_err, mapping={'val': value, 'min': self.min}
                 )
-                raise Invalid(node, min_err)
+                return Invalid(node, min_err)
 
         if self.max is not None:
             if value > self.max:
                 max_err = _(
                     self.max_err, mapping={'val': value, 'max': self.max}
                 )
-                raise Invalid(node, max_err)
+                return Invalid(node, max_err)
+        return None
 
 
-class Length:
+class Length(_Validator):
     """Enforces that the length of a value falls within a given range.
 
     Raises if the value's length does not fall within the range described
@@ -582,18 +1039,51 @@ class Length:
         self.min_err = min_err
         self.max_err = max_err
 
-    def __call__(self, node, value):
+    def _length(self, value):
+        return len(value)
+
+    def _error(self, node, value):
         if self.min is not None:
-            if len(value) < self.min:
+            if self._length(value) < self.min:
                 min_err = _(self.min_err, mapping={'min': self.min})
-                raise Invalid(node, min_err)
+                return Invalid(node, min_err)
         if self.max is not None:
-            if len(value) > self.max:
+            if self._length(value) > self.max:
                 max_err = _(self.max_err, mapping={'max': self.max})
-                raise Invalid(node, max_err)
+                return Invalid(node, max_err)
+        return None
+
 
+def _byte_size(value):
+    # the size of the bytes-like ``value``, or of the data encoded by the
+    # base64 text ``value``, computed from its length and padding
+    if isinstance(value, str):
+        size = len(value) // 4 * 3
+        if value.endswith('=='):
+            return size - 2
+        if value.endswith('='):
+            return size - 1
+        return size
+    return memoryview(value).nbytes
 
-class OneOf:
+
+class ByteLength(Length):
+    """Enforces that the size in bytes of a value falls within a given
+    range, like :class:`colander.Length` does for its length.
+
+    The value may be a bytes-like object, such as the :term:`appstruct`
+    of :class:`colander.Bytes`, or base64 text, whose decoded size is
+    computed from its length without decoding it.
+
+    The arguments and the default error messages are the same as those of
+    :class:`colander.Length`.
+    """
+
+    def _length(self, value):
+        return _byte_size(value)
+
+
+class OneOf(_Validator):
     """Enforces that a value is one of a fixed set of values.
 
     ``msg_err`` is used to form the ``msg`` of the :exc:`colander.Invalid`
@@ -609,14 +1099,15 @@ class OneOf:
         self.msg_err = msg_err
         self.choices = choices
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         if value not in self.choices:
             choices = ', '.join(['%s' % x for x in self.choices])
             err = _(self.msg_err, mapping={'val': value, 'choices': choices})
-            raise Invalid(node, err)
+            return Invalid(node, err)
+        return None
 
 
-class NoneOf:
+class NoneOf(_Validator):
     """Enforces that a value is *not* one of a fixed set of values.
 
     ``msg_err`` is used to form the ``msg`` of the :exc:`colander.Invalid`
@@ -632,17 +1123,17 @@ class NoneOf:
         self.forbidden = choices
         self.msg_err = msg_err
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         if value not in self.forbidden:
-            return
+            return None
 
         choices = ', '.join(['%s' % x for x in self.forbidden])
         err = _(self.msg_err, mapping={'val': value, 'choices': choices})
 
-        raise Invalid(node, err)
+        return Invalid(node, err)
 
 
-class ContainsOnly:
+class ContainsOnly(_Validator):
     """Enforces that each element in a sequence value is one of a fixeed set.
 
     Useful when attached to a schemanode with, e.g., a :class:`colander.Set`
@@ -654,13 +1145,14 @@ class ContainsOnly:
     def __init__(self, choices):
         self.choices = choices
 
-    def __call__(self, node, value):
+    def _error(self, node, value):
         if not set(value).issubset(self.choices):
             err = _(
                 self.err_template,
                 mapping={'val': value, 'choices': self.choices},
             )
-            raise Invalid(node, err)
+            return Invalid(node, err)
+        return None
 
 
 def luhnok(node, value):
@@ -754,7 +1246,114 @@ def _make_url_regex_src():
 URL_REGEX = _make_url_regex_src()
 del _make_url_regex_src
 
-url = Regex(URL_REGEX, msg=_('Must be a URL'), flags=re.IGNORECASE)
+# the characters which match the ASCII letters of URL_REGEX, e.g. "\u017f"
+# (long s) matches "s" when the case is ignored
+_FOLD_TABLE = str.maketrans(
+    string.ascii_uppercase + '\u017f', string.ascii_lowercase + 's'
+)
+_TLD_TABLE = dict.fromkeys(map(ord, string.ascii_letters + '-'))
+_PUNYCODE_CHARS = (
+    string.ascii_letters + string.digits + '\u0130\u0131\u017f\u212a'
+)
+_IPV6_CHARS = string.hexdigits + ':.'
+
+
+def _fold(text):
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD_TABLE)
+
+
+def _no_space(text):
+    # str.split() splits at the characters matched by "\s"
+    return text.split(None, 1) == [text]
+
+
+def _is_ipv4(host):
+    parts = host.split('.')
+    return len(parts) == 4 and all(
+        len(part) <= 3
+        and part.isascii()
+        and part.isdigit()
+        and str(int(part)) == part
+        and int(part) <= 255
+        for part in parts
+    )
+
+
+def _is_hostname(host):
+    if len(host) == 9 and _fold(host) == 'localhost':
+        return True
+    if host.endswith('.'):
+        host = host[:-1]
+    labels, dot, tld = host.rpartition('.')
+    if not (
+        dot and _is_labels(labels) and _only_host_chars(labels, _HOST_TABLE)
+    ):
+        return False
+    if (
+        _fold(tld[:4]) == 'xn--'
+        and 4 < len(tld) <= 63
+        and not tld[4:].lstrip(_PUNYCODE_CHARS)
+    ):
+        return True
+    return (
+        2 <= len(tld) <= 63
+        and tld[0] != '-'
+        and tld[-1] != '-'
+        and _only_host_chars(tld, _TLD_TABLE)
+    )
+
+
+def _is_location(text):
+    # the host, port and path of URL_REGEX
+    if text.startswith('['):
+        end = text.find(']')
+        if end < 2 or text[1:end].lstrip(_IPV6_CHARS):
+            return False
+        end += 1
+    else:
+        # none of the characters which may follow the host is in the host
+        end = len(text)
+        for sep in ':/?#':
+            found = text.find(sep, 0, end)
+            if found != -1:
+                end = found
+        host = text[:end]
+        if not (_is_ipv4(host) or _is_hostname(host)):
+            return False
+    rest = text[end:]
+    if rest.startswith(':'):
+        path = rest[1:].lstrip(string.digits)
+        if not 0 < len(rest) - len(path) - 1 <= 5:
+            return False
+        rest = path
+    return not rest or (rest[0] in '/?#' and _no_space(rest))
+
+
+def _is_url(value):
+    # URL_REGEX without backtracking
+    scheme = _fold(value[:8])
+    for prefix in ('http://', 'https://', 'ftp://', 'ftps://'):
+        if scheme.startswith(prefix):
+            start = len(prefix)
+            value = value[start:]
+            break
+    userinfo, at, location = value.partition('@')
+    if at:
+        user, password = userinfo.partition(':')[::2]
+        if (
+            user
+            and ':' not in password
+            and '/' not in userinfo
+            and _no_space(userinfo)
+            and _is_location(location)
+        ):
+            return True
+    return _is_location(value)
+
+
+url = _LinearRegex(URL_REGEX, _is_url, _('Must be a URL'), re.IGNORECASE)
 
 
 URI_REGEX = (
@@ -774,6 +1373,14 @@ UUID_REGEX = (
 uuid = Regex(UUID_REGEX, _('Invalid UUID string'), re.IGNORECASE)
 
 
+def _converts_like(typ, base):
+    # whether the type ``typ`` serializes and deserializes like ``base``
+    cls = type(typ)
+    return (
+        cls.serialize is base.serialize and cls.deserialize is base.deserialize
+    )
+
+
 class SchemaType:
     """Base class for all schema types"""
 
@@ -797,9 +1404,43 @@ class SchemaType:
     def get_value(self, node, appstruct, path):
         raise AssertionError("Can't call 'get_value' on a leaf node.")
 
+    def project(self, node, tree):
+        # a leaf has none of the children named by ``tree``
+        raise KeyError(next(iter(tree)))
+
+    def _path_step(self, node, name):
+        raise AssertionError("Can't traverse a leaf node.")
+
     def cstruct_children(self, node, cstruct):
         return []
 
+    def _try_deserialize(self, node, cstruct):
+        # return ``(appstruct, error)`` rather than raising the error
+        try:
+            return self.deserialize(node, cstruct), None
+        except Invalid as e:
+            return null, e
+
+    def _try_validate(self, node, cstruct):
+        # return the error of ``cstruct`` for a node which has neither a
+        # preparer nor a validator; container types override this to
+        # avoid building their appstruct
+        appstruct, error = self._try_deserialize(node, cstruct)
+        if appstruct is null and error is None:
+            # the node may be required
+            return node._try_deserialize(cstruct)[1]
+        return error
+
+    def _check_appstruct(self, node, appstruct):
+        # return ``(appstruct, error)`` for the appstruct of a node, before
+        # its preparer, ``missing`` and validator; the built-in types
+        # override this to check the appstruct without the round trip
+        try:
+            cstruct = self.serialize(node, appstruct)
+        except Invalid as e:
+            return null, e
+        return self._try_deserialize(node, cstruct)
+
 
 class Mapping(SchemaType):
     """A type which represents a mapping of names to nodes.
@@ -831,6 +1472,32 @@ class Mapping(SchemaType):
 
         Default: ``ignore``.
 
+    The constructor also accepts the optional keyword arguments
+    ``zero_copy`` and ``preserve_copy``, which are available as attributes
+    of the same name as well.
+
+    zero_copy
+        By default the value passed to ``serialize`` or ``deserialize`` is
+        copied into a new dictionary before its items are processed.  If
+        ``zero_copy`` is true and the value is a mapping, it is read in
+        place instead, and unknown keys are only looked for when
+        ``unknown`` is not ``ignore``.  The value must not be mutated
+        while it is being processed.
+
+        Default: ``False``.
+
+    preserve_copy
+        ``preserve_copy`` controls how the values of unknown keys are
+        copied into the result when ``unknown`` is ``preserve``:
+
+        - ``deep`` copies them with :func:`copy.deepcopy`.
+
+        - ``shallow`` copies them with :func:`copy.copy`.
+
+        - ``reference`` does not copy them.
+
+        Default: ``deep``.
+
     Special behavior is exhibited when a subvalue of a mapping is
     present in the schema but is missing from the mapping passed to
     either the ``serialize`` or ``deserialize`` method of this class.
@@ -848,8 +1515,12 @@ class Mapping(SchemaType):
     representation of the null value for its type.
     """
 
-    def __init__(self, unknown='ignore'):
+    def __init__(
+        self, unknown='ignore', zero_copy=False, preserve_copy='deep'
+    ):
         self.unknown = unknown
+        self.zero_copy = zero_copy
+        self.preserve_copy = preserve_copy
 
     def _set_unknown(self, value):
         if value not in ('ignore', 'raise', 'preserve'):
@@ -864,6 +1535,19 @@ class Mapping(SchemaType):
 
     unknown = property(_get_unknown, _set_unknown)
 
+    def _set_preserve_copy(self, value):
+        if value not in ('deep', 'shallow', 'reference'):
+            raise ValueError(
+                'preserve_copy attribute must be one of "deep", "shallow", '
+                'or "reference"'
+            )
+        self._preserve_copy = value
+
+    def _get_preserve_copy(self):
+        return self._preserve_copy
+
+    preserve_copy = property(_get_preserve_copy, _set_preserve_copy)
+
     def _validate(self, node, value):
         try:
             if hasattr(value, 'items'):
@@ -893,15 +1577,23 @@ class Mapping(SchemaType):
             children.append(subval)
         return children
 
+    def _reader(self, node, value, in_place):
+        # return ``(value, get)``: the mapping of ``value``, read in place if
+        # ``in_place`` and it is a mapping and copied otherwise, and the
+        # function returning the value of a child from it
+        if not in_place or not isinstance(value, collections.abc.Mapping):
+            value = self._validate(node, value)
+        return value, value.get
+
     def _impl(self, node, value, callback, default_or_missing):
-        value = self._validate(node, value)
+        value, get = self._reader(node, value, self.zero_copy)
 
         error = None
         result = {}
 
         for num, subnode in enumerate(node.children):
             name = subnode.name
-            subval = value.pop(name, null)
+            subval = get(name, null)
             if subval is drop or (
                 subval is null
                 and getattr(subnode, default_or_missing, None) is drop
@@ -918,25 +1610,45 @@ class Mapping(SchemaType):
                     continue
                 result[name] = sub_result
 
-        if self.unknown == 'raise':
-            if value:
-                raise UnsupportedFields(
-                    node,
-                    value,
-                    msg=_(
-                        'Unrecognized keys in mapping: "${val}"',
-                        mapping={'val': value},
-                    ),
-                )
+        if self.unknown != 'ignore':
+            value = self._unknown_items(node, value)
+
+            if self.unknown == 'raise':
+                if value:
+                    raise self._unsupported(node, value)
 
-        elif self.unknown == 'preserve':
-            result.update(copy.deepcopy(value))
+            else:
+                result.update(self._preserve(value))
 
         if error is not None:
             raise error
 
         return result
 
+    def _unknown_items(self, node, value):
+        unknown = value.keys() - {subnode.name for subnode in node.children}
+        if not unknown:
+            return {}
+        # keep the order of the original mapping
+        return {name: value[name] for name in value if name in unknown}
+
+    def _preserve(self, value):
+        if self.preserve_copy == 'deep':
+            return copy.deepcopy(value)
+        if self.preserve_copy == 'shallow':
+            return {name: copy.copy(subval) for name, subval in value.items()}
+        return value
+
+    def _unsupported(self, node, value):
+        return UnsupportedFields(
+            node,
+            value,
+            msg=_(
+                'Unrecognized keys in mapping: "${val}"',
+                mapping={'val': value},
+            ),
+        )
+
     def serialize(self, node, appstruct):
         if appstruct is null:
             appstruct = {}
@@ -955,6 +1667,147 @@ class Mapping(SchemaType):
 
         return self._impl(node, cstruct, callback, 'missing')
 
+    def _try_deserialize(self, node, cstruct):
+        # the same as ``deserialize`` and ``_impl``, collecting the errors
+        # of the children without raising them
+        cls = type(self)
+        if (
+            cls.deserialize is not Mapping.deserialize
+            or cls._impl is not Mapping._impl
+            or cstruct is null
+        ):
+            return super()._try_deserialize(node, cstruct)
+        return self._try_deserialize_items(node, cstruct)
+
+    def _try_deserialize_items(self, node, cstruct):
+        try:
+            value, get = self._reader(node, cstruct, self.zero_copy)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = {}
+
+        for num, subnode in enumerate(node.children):
+            name = subnode.name
+            subval = get(name, null)
+            if subval is drop or (
+                subval is null and getattr(subnode, 'missing', None) is drop
+            ):
+                continue
+            sub_result, sub_error = subnode._try_deserialize(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            elif sub_result is not drop:
+                result[name] = sub_result
+
+        if self.unknown != 'ignore':
+            value = self._unknown_items(node, value)
+
+            if self.unknown == 'raise':
+                if value:
+                    return null, self._unsupported(node, value)
+
+            else:
+                result.update(self._preserve(value))
+
+        if error is not None:
+            return null, error
+
+        return result, None
+
+    def _try_validate(self, node, cstruct):
+        # the same errors as ``_try_deserialize``, reading the cstruct in
+        # place without building the result
+        cls = type(self)
+        if (
+            cls.deserialize is not Mapping.deserialize
+            or cls._impl is not Mapping._impl
+        ):
+            return super()._try_validate(node, cstruct)
+        return self._try_validate_items(node, cstruct)
+
+    def _try_validate_items(self, node, cstruct):
+        try:
+            value, get = self._reader(node, cstruct, True)
+        except Invalid as e:
+            return e
+
+        if self.unknown == 'raise':
+            # reported instead of the errors of the children
+            unknown = self._unknown_items(node, value)
+            if unknown:
+                return self._unsupported(node, unknown)
+
+        error = None
+        for num, subnode in enumerate(node.children):
+            subval = get(subnode.name, null)
+            if subval is drop or (
+                subval is null and getattr(subnode, 'missing', None) is drop
+            ):
+                continue
+            sub_error = subnode._try_validate(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+        return error
+
+    def _check_appstruct(self, node, appstruct):
+        # the same as ``serialize`` followed by ``deserialize``, reading a
+        # mapping in place
+        if (
+            not _converts_like(self, Mapping)
+            or type(self)._impl is not Mapping._impl
+        ):
+            return super()._check_appstruct(node, appstruct)
+        return self._check_items(node, appstruct)
+
+    def _check_items(self, node, appstruct):
+        if appstruct is null:
+            appstruct = {}
+        try:
+            value, get = self._reader(node, appstruct, True)
+        except Invalid as e:
+            return null, e
+
+        unknown = None
+        if self.unknown != 'ignore':
+            unknown = self._unknown_items(node, value)
+            if unknown and self.unknown == 'raise':
+                return null, self._unsupported(node, unknown)
+
+        error = None
+        result = {}
+        for num, subnode in enumerate(node.children):
+            name = subnode.name
+            subval = get(name, null)
+            if subval is drop or (
+                subval is null and getattr(subnode, 'default', None) is drop
+            ):
+                # left out of the cstruct
+                if getattr(subnode, 'missing', None) is drop:
+                    continue
+                sub_result, sub_error = subnode._try_deserialize(null)
+            else:
+                sub_result, sub_error = subnode._check_appstruct(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            elif sub_result is not drop:
+                result[name] = sub_result
+
+        if unknown:
+            result.update(self._preserve(unknown))
+
+        if error is not None:
+            return null, error
+
+        return result, None
+
     def flatten(self, node, appstruct, prefix='', listitem=False):
         result = {}
         if listitem:
@@ -995,28 +1848,264 @@ class Mapping(SchemaType):
             return next_node.typ.get_value(next_node, appstruct[name], rest)
         return appstruct[path]
 
-
-class Positional:
-    """
-    Marker abstract base class meaning 'this type has children which
-    should be addressed by position instead of name' (e.g. via seq[0],
-    but never seq['name']).  This is consulted by Invalid.asdict when
-    creating a dictionary representation of an error tree.
+    def project(self, node, tree):
+        children = _project_children(node, tree, keep_others=False)
+        projected = _copy_node(node, children)
+        # the remaining keys of the cstruct belong to nodes which were
+        # projected away; they must not be reported or preserved
+        projected.typ = copy.copy(self)
+        projected.typ.unknown = 'ignore'
+        return projected
+
+    def _path_step(self, node, name):
+        return _named_step(node, name)
+
+
+class Tagged(SchemaType):
+    """A type which represents a mapping which is one of several variants,
+    told apart by the value of one of its keys: its tag.
+
+    Each subnode of the :class:`colander.SchemaNode` that wraps this type
+    is a variant, usually a mapping node, named by the tag of the values
+    it describes.  The tag of a value selects its variant through a
+    dictionary, so only that variant serializes or deserializes the value
+    and reports its errors, which are reported for this node, as if it
+    were the variant.
+
+    The constructor of this type accepts one optional argument: ``key``,
+    the key of the tag, also available as an attribute of the same name.
+    Default: ``type``.
+
+    The value is passed to its variant as it is, tag included, so a
+    variant whose ``unknown`` is ``raise`` must have a child for the tag.
+    The tag is added to the :term:`cstruct` and to a dictionary
+    :term:`appstruct` which do not hold it after their variant processed
+    them.  The tag of an appstruct which is an object rather than a
+    mapping, e.g. one built by :class:`colander.objects.Object`, is read
+    from its attribute named ``key``.
+
+    A value whose tag is missing or unknown is invalid; the error is
+    reported for the key of the tag.
     """
 
+    def __init__(self, key='type'):
+        self.key = key
 
-class Tuple(Positional, SchemaType):
-    """A type which represents a fixed-length sequence of nodes.
+    def _variant(self, node, tag):
+        # return the child of ``node`` named ``tag``, looked up in a table
+        # of the children by name which is rebuilt when they change
+        entry = _tagged_tables.get(node)
+        if entry is None or entry[0] != node.children:
+            entry = _tagged_tables[node] = self._table(node)
+        try:
+            subnode = entry[1].get(tag)
+        except TypeError:  # an unhashable tag
+            raise self._tag_error(node, tag)
+        if subnode is None or subnode.name != tag:
+            # a child may have been renamed since
+            entry = _tagged_tables[node] = self._table(node)
+            subnode = entry[1].get(tag)
+            if subnode is None:
+                raise self._tag_error(node, tag)
+        return subnode
+
+    def _table(self, node):
+        children = list(node.children)
+        # the first child of a name wins, like for node[name]
+        return children, {sub.name: sub for sub in reversed(children)}
+
+    def _tag_error(self, node, tag):
+        if tag is null:
+            msg = _('Required')
+        else:
+            msg = _(
+                '"${val}" is not one of ${choices}',
+                mapping={
+                    'val': tag,
+                    'choices': ', '.join(sub.name for sub in node.children),
+                },
+            )
+        error = Invalid(node)
+        error.add(Invalid(SchemaNode(String(), name=self.key), msg))
+        return error
+
+    def _select(self, node, value, attributes):
+        # return ``(subnode, tag)`` for ``value``, a mapping, or an object
+        # if ``attributes`` is true
+        if hasattr(value, 'get'):
+            tag = value.get(self.key, null)
+        elif attributes and value is not null:
+            tag = getattr(value, self.key, null)
+        else:
+            raise _not_a_mapping(node, value)
+        return self._variant(node, tag), tag
 
-    The subnodes of the :class:`colander.SchemaNode` that wraps
-    this type imply the positional elements of the tuple in the order
-    they are added.
+    def _adopt(self, node, error):
+        # the error of a variant, reported for ``node``
+        error = copy.copy(error)
+        error.node = node
+        return error
 
-    This type is willing to serialize and deserialized iterables that,
-    when converted to a tuple, have the same number of elements as the
-    number of the associated node's subnodes.
+    def _tagged(self, value, tag):
+        if isinstance(value, dict) and self.key not in value:
+            value[self.key] = tag
+        return value
 
-    If the :attr:`colander.null` value is passed to the serialize
+    def serialize(self, node, appstruct):
+        if appstruct is null:
+            return null
+        subnode, tag = self._select(node, appstruct, True)
+        try:
+            cstruct = subnode.serialize(appstruct)
+        except Invalid as e:
+            raise self._adopt(node, e)
+        return self._tagged(cstruct, tag)
+
+    def deserialize(self, node, cstruct):
+        if cstruct is null:
+            return null
+        subnode, tag = self._select(node, cstruct, False)
+        try:
+            appstruct = subnode.deserialize(cstruct)
+        except Invalid as e:
+            raise self._adopt(node, e)
+        return self._tagged(appstruct, tag)
+
+    def _try_deserialize(self, node, cstruct):
+        if type(self).deserialize is not Tagged.deserialize or cstruct is null:
+            return super()._try_deserialize(node, cstruct)
+        try:
+            subnode, tag = self._select(node, cstruct, False)
+        except Invalid as e:
+            return null, e
+        appstruct, error = subnode._try_deserialize(cstruct)
+        if error is not None:
+            return null, self._adopt(node, error)
+        return self._tagged(appstruct, tag), None
+
+    def _try_validate(self, node, cstruct):
+        if type(self).deserialize is not Tagged.deserialize:
+            return super()._try_validate(node, cstruct)
+        try:
+            subnode, tag = self._select(node, cstruct, False)
+        except Invalid as e:
+            return e
+        error = subnode._try_validate(cstruct)
+        if error is not None:
+            return self._adopt(node, error)
+        return None
+
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Tagged) or appstruct is null:
+            return super()._check_appstruct(node, appstruct)
+        try:
+            subnode, tag = self._select(node, appstruct, True)
+        except Invalid as e:
+            return null, e
+        appstruct, error = subnode._check_appstruct(appstruct)
+        if error is not None:
+            return null, self._adopt(node, error)
+        return self._tagged(appstruct, tag), None
+
+    def cstruct_children(self, node, cstruct):
+        # the cstruct for its variant, and null ones for the others
+        try:
+            selected = self._select(node, cstruct, False)[0]
+        except Invalid:
+            selected = None
+        return [
+            cstruct if subnode is selected else subnode.serialize(null)
+            for subnode in node.children
+        ]
+
+    def flatten(self, node, appstruct, prefix='', listitem=False):
+        subnode, tag = self._select(node, appstruct, True)
+        if listitem:
+            selfprefix = prefix
+        elif node.name:
+            selfprefix = f'{prefix}{node.name}.'
+        else:
+            selfprefix = prefix
+        result = subnode.typ.flatten(
+            subnode, appstruct, prefix=selfprefix, listitem=True
+        )
+        result.setdefault(selfprefix + self.key, tag)
+        return result
+
+    def unflatten(self, node, paths, fstruct):
+        values = _relative_fstruct(node, paths, fstruct)
+        tag = values.get(self.key, null)
+        subnode = self._variant(node, tag)
+        if self.key not in subnode:
+            del values[self.key]
+        # the paths of the variant
+        subprefix = f'{subnode.name}.' if subnode.name else ''
+        subfstruct = {
+            subprefix + path: value for path, value in values.items()
+        }
+        appstruct = subnode.typ.unflatten(
+            subnode, list(subfstruct), subfstruct
+        )
+        return self._tagged(appstruct, tag)
+
+    def set_value(self, node, appstruct, path, value):
+        subnode = self._select(node, appstruct, True)[0]
+        return subnode.typ.set_value(subnode, appstruct, path, value)
+
+    def get_value(self, node, appstruct, path):
+        subnode = self._select(node, appstruct, True)[0]
+        return subnode.typ.get_value(subnode, appstruct, path)
+
+
+# the children of the tagged nodes by name, see Tagged._variant
+_tagged_tables = weakref.WeakKeyDictionary()
+
+
+def _not_a_mapping(node, value):
+    return Invalid(
+        node,
+        _(
+            '"${val}" is not a mapping type: ${err}',
+            mapping={
+                'val': value,
+                'err': 'Does not implement dict-like functionality.',
+            },
+        ),
+    )
+
+
+def _relative_fstruct(node, paths, fstruct):
+    # the values of ``paths`` by their path below ``node``; the paths of
+    # an unnamed item of a sequence start with a dot
+    name = node.name
+    if name or paths and paths[0].startswith('.'):
+        start = len(name) + 1
+    else:
+        start = 0
+    return {path[start:]: fstruct[path] for path in paths if path != name}
+
+
+class Positional:
+    """
+    Marker abstract base class meaning 'this type has children which
+    should be addressed by position instead of name' (e.g. via seq[0],
+    but never seq['name']).  This is consulted by Invalid.asdict when
+    creating a dictionary representation of an error tree.
+    """
+
+
+class Tuple(Positional, SchemaType):
+    """A type which represents a fixed-length sequence of nodes.
+
+    The subnodes of the :class:`colander.SchemaNode` that wraps
+    this type imply the positional elements of the tuple in the order
+    they are added.
+
+    This type is willing to serialize and deserialized iterables that,
+    when converted to a tuple, have the same number of elements as the
+    number of the associated node's subnodes.
+
+    If the :attr:`colander.null` value is passed to the serialize
     method of this class, the :attr:`colander.null` value will be
     returned.
     """
@@ -1094,6 +2183,96 @@ class Tuple(Positional, SchemaType):
 
         return self._impl(node, cstruct, callback)
 
+    def _try_deserialize(self, node, cstruct):
+        # the same as ``deserialize`` and ``_impl``, collecting the errors
+        # of the children without raising them
+        cls = type(self)
+        if (
+            cls.deserialize is not Tuple.deserialize
+            or cls._impl is not Tuple._impl
+            or cstruct is null
+        ):
+            return super()._try_deserialize(node, cstruct)
+
+        try:
+            value = self._validate(node, cstruct)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = []
+
+        for num, subnode in enumerate(node.children):
+            sub_result, sub_error = subnode._try_deserialize(value[num])
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            else:
+                result.append(sub_result)
+
+        if error is not None:
+            return null, error
+
+        return tuple(result), None
+
+    def _try_validate(self, node, cstruct):
+        # the same errors as ``_try_deserialize``, without building the
+        # result
+        cls = type(self)
+        if (
+            cls.deserialize is not Tuple.deserialize
+            or cls._impl is not Tuple._impl
+        ):
+            return super()._try_validate(node, cstruct)
+
+        try:
+            value = self._validate(node, cstruct)
+        except Invalid as e:
+            return e
+
+        error = None
+        for num, subnode in enumerate(node.children):
+            sub_error = subnode._try_validate(value[num])
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+        return error
+
+    def _check_appstruct(self, node, appstruct):
+        # the same as ``serialize`` followed by ``deserialize``
+        if (
+            not _converts_like(self, Tuple)
+            or type(self)._impl is not Tuple._impl
+        ):
+            return super()._check_appstruct(node, appstruct)
+
+        if appstruct is null:
+            return null, None
+
+        try:
+            value = self._validate(node, appstruct)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = []
+
+        for num, subnode in enumerate(node.children):
+            sub_result, sub_error = subnode._check_appstruct(value[num])
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            else:
+                result.append(sub_result)
+
+        if error is not None:
+            return null, error
+
+        return tuple(result), None
+
     def flatten(self, node, appstruct, prefix='', listitem=False):
         result = {}
         if listitem:
@@ -1149,6 +2328,14 @@ class Tuple(Positional, SchemaType):
             return next_node.typ.get_value(next_node, appstruct[index], rest)
         return appstruct[index]
 
+    def project(self, node, tree):
+        # a tuple is positional: unprojected elements must stay in place
+        children = _project_children(node, tree, keep_others=True)
+        return _copy_node(node, children)
+
+    def _path_step(self, node, name):
+        return _named_step(node, name)
+
 
 class Set(SchemaType):
     """A type representing a non-overlapping set of items.
@@ -1259,7 +2446,7 @@ class Sequence(Positional, SchemaType):
             and not hasattr(value, 'get')
             and not isinstance(value, str)
         ):
-            return list(value)
+            return list(_reiterable(value))
         if accept_scalar:
             return [value]
         else:
@@ -1358,7 +2545,122 @@ class Sequence(Positional, SchemaType):
         def callback(subnode, subcstruct):
             return subnode.deserialize(subcstruct)
 
-        return self._impl(node, cstruct, callback, 'missing', accept_scalar)
+        return _batched(
+            self._impl, node, cstruct, callback, 'missing', accept_scalar
+        )
+
+    def _try_deserialize(self, node, cstruct):
+        # the same as ``deserialize`` and ``_impl``, collecting the errors
+        # of the items without raising them
+        cls = type(self)
+        if (
+            cls.deserialize is not Sequence.deserialize
+            or cls._impl is not Sequence._impl
+            or cstruct is null
+        ):
+            return super()._try_deserialize(node, cstruct)
+        return _batched(self._try_deserialize_items, node, cstruct)
+
+    def _try_deserialize_items(self, node, cstruct):
+        try:
+            value = self._validate(node, cstruct, self.accept_scalar)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = []
+
+        subnode = node.children[0]
+        skip_null = getattr(subnode, 'missing', None) is drop
+        for num, subval in enumerate(value):
+            if subval is drop or (subval is null and skip_null):
+                continue
+            sub_result, sub_error = subnode._try_deserialize(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            elif sub_result is not drop:
+                result.append(sub_result)
+
+        if error is not None:
+            return null, error
+
+        return result, None
+
+    def _try_validate(self, node, cstruct):
+        # the same errors as ``_try_deserialize``, iterating over the
+        # cstruct in place without building the result
+        cls = type(self)
+        if (
+            cls.deserialize is not Sequence.deserialize
+            or cls._impl is not Sequence._impl
+        ):
+            return super()._try_validate(node, cstruct)
+        return _batched(self._try_validate_items, node, cstruct)
+
+    def _try_validate_items(self, node, cstruct):
+        if (
+            hasattr(cstruct, '__iter__')
+            and not hasattr(cstruct, 'get')
+            and not isinstance(cstruct, str)
+        ):
+            value = _reiterable(cstruct)
+        else:
+            try:
+                value = self._validate(node, cstruct, self.accept_scalar)
+            except Invalid as e:
+                return e
+
+        error = None
+        subnode = node.children[0]
+        skip_null = getattr(subnode, 'missing', None) is drop
+        for num, subval in enumerate(value):
+            if subval is drop or (subval is null and skip_null):
+                continue
+            sub_error = subnode._try_validate(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+        return error
+
+    def _check_appstruct(self, node, appstruct):
+        # the same as ``serialize`` followed by ``deserialize``
+        if (
+            not _converts_like(self, Sequence)
+            or type(self)._impl is not Sequence._impl
+        ):
+            return super()._check_appstruct(node, appstruct)
+
+        if appstruct is null:
+            return null, None
+
+        try:
+            value = self._validate(node, appstruct, self.accept_scalar)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = []
+
+        subnode = node.children[0]
+        skip_null = getattr(subnode, 'default', None) is drop
+        for num, subval in enumerate(value):
+            if subval is drop or (subval is null and skip_null):
+                continue
+            sub_result, sub_error = subnode._check_appstruct(subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, num)
+            elif sub_result is not drop:
+                result.append(sub_result)
+
+        if error is not None:
+            return null, error
+
+        return result, None
 
     def flatten(self, node, appstruct, prefix='', listitem=False):
         result = {}
@@ -1420,10 +2722,278 @@ class Sequence(Positional, SchemaType):
             return next_node.typ.get_value(next_node, appstruct[index], rest)
         return appstruct[int(path)]
 
+    def project(self, node, tree):
+        # every element of a sequence is described by the same node, so
+        # the only name which may be projected is the wildcard
+        for name in tree:
+            if name != '*':
+                raise KeyError(name)
+        child = node.children[0]
+        subtree = tree['*']
+        if subtree is not None:
+            child = child.typ.project(child, subtree)
+        return _copy_node(node, [child])
+
+    def _path_step(self, node, name):
+        return node.children[0], int(name)
+
 
 Seq = Sequence
 
 
+class Map(Positional, SchemaType):
+    """A type which represents a mapping of any number of keys to values,
+    all of which must be of the same type, e.g. a mapping of product codes
+    to quantities.
+
+    The first subnode of the :class:`colander.SchemaNode` that wraps this
+    type describes the keys of the mapping, and the second one its values.
+    Keys and values are processed in one pass over the items of the
+    mapping, and the errors of an item are reported under its key, like
+    the errors of the items of a sequence are reported under their
+    position.  The non-empty string keys described by a
+    :class:`colander.String` node without an encoding, a preparer or a
+    validator are kept as they are, without calling the node.
+
+    The constructor accepts the optional keyword arguments ``min_len``
+    and ``max_len``, available as attributes of the same name as well: the
+    minimum and maximum numbers of items of the mapping, or ``None`` for
+    no limit.  A mapping out of these limits is invalid, and none of its
+    items are processed.  Default: ``None``.
+
+    The dotted names of the values of the mapping used by
+    :meth:`colander.SchemaNode.flatten`,
+    :meth:`colander.SchemaNode.get_value` and
+    :meth:`colander.SchemaNode.set_value` are their serialized keys.
+
+    If the :attr:`colander.null` value is passed to the serialize
+    method of this class, the :attr:`colander.null` value is returned.
+    """
+
+    def __init__(self, min_len=None, max_len=None):
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def _validate(self, node, value):
+        if not hasattr(value, 'items'):
+            raise _not_a_mapping(node, value)
+        size = len(value)
+        if self.min_len is not None and size < self.min_len:
+            raise Invalid(
+                node, _(Length._MIN_ERR, mapping={'min': self.min_len})
+            )
+        if self.max_len is not None and size > self.max_len:
+            raise Invalid(
+                node, _(Length._MAX_ERR, mapping={'max': self.max_len})
+            )
+        return value
+
+    def _plain_keys(self, node):
+        # whether the non-empty string keys are their own serialization and
+        # deserialization, so that the key node is not called for them
+        key_node = node.children[0]
+        typ = key_node.typ
+        cls = type(key_node)
+        return (
+            type(typ) is String
+            and not typ.encoding
+            and cls.serialize is _SchemaNode.serialize
+            and cls.deserialize is _SchemaNode.deserialize
+            and key_node.preparer is None
+            and key_node.validator is None
+        )
+
+    def _key(self, node, name):
+        # the key of the item named ``name`` in a dotted name
+        if self._plain_keys(node):
+            return name
+        return node.children[0].deserialize(name)
+
+    def _impl(self, node, value, callback, default_or_missing):
+        value = self._validate(node, value)
+
+        error = None
+        result = {}
+
+        key_node, value_node = node.children
+        plain = self._plain_keys(node)
+        skip_null = getattr(value_node, default_or_missing, None) is drop
+        for name, subval in value.items():
+            try:
+                key = name
+                if not (plain and type(name) is str and name):
+                    key = callback(key_node, name)
+                if (
+                    key is drop
+                    or subval is drop
+                    or (subval is null and skip_null)
+                ):
+                    continue
+                sub_result = callback(value_node, subval)
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(node)
+                error.add(e, name)
+            else:
+                if sub_result is drop:
+                    continue
+                result[key] = sub_result
+
+        if error is not None:
+            raise error
+
+        return result
+
+    def serialize(self, node, appstruct):
+        if appstruct is null:
+            return null
+
+        def callback(subnode, subappstruct):
+            return subnode.serialize(subappstruct)
+
+        return self._impl(node, appstruct, callback, 'default')
+
+    def deserialize(self, node, cstruct):
+        if cstruct is null:
+            return null
+
+        def callback(subnode, subcstruct):
+            return subnode.deserialize(subcstruct)
+
+        return self._impl(node, cstruct, callback, 'missing')
+
+    def _try_items(self, node, value, check):
+        # the same as ``_impl``, collecting the errors of the items without
+        # raising them: deserializing them, or checking them as appstructs
+        # if ``check`` is true
+        try:
+            value = self._validate(node, value)
+        except Invalid as e:
+            return null, e
+
+        error = None
+        result = {}
+
+        key_node, value_node = node.children
+        plain = self._plain_keys(node)
+        if check:
+            attempt = _SchemaNode._check_appstruct
+            skip_null = getattr(value_node, 'default', None) is drop
+        else:
+            attempt = _SchemaNode._try_deserialize
+            skip_null = getattr(value_node, 'missing', None) is drop
+        for name, subval in value.items():
+            key = name
+            if not (plain and type(name) is str and name):
+                key, sub_error = attempt(key_node, name)
+                if sub_error is not None:
+                    if error is None:
+                        error = Invalid(node)
+                    error.add(sub_error, name)
+                    continue
+            if key is drop or subval is drop or (subval is null and skip_null):
+                continue
+            sub_result, sub_error = attempt(value_node, subval)
+            if sub_error is not None:
+                if error is None:
+                    error = Invalid(node)
+                error.add(sub_error, name)
+            elif sub_result is not drop:
+                result[key] = sub_result
+
+        if error is not None:
+            return null, error
+
+        return result, None
+
+    def _try_deserialize(self, node, cstruct):
+        cls = type(self)
+        if (
+            cls.deserialize is not Map.deserialize
+            or cls._impl is not Map._impl
+            or cstruct is null
+        ):
+            return super()._try_deserialize(node, cstruct)
+        return self._try_items(node, cstruct, False)
+
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Map) or type(self)._impl is not Map._impl:
+            return super()._check_appstruct(node, appstruct)
+        if appstruct is null:
+            return null, None
+        return self._try_items(node, appstruct, True)
+
+    def flatten(self, node, appstruct, prefix='', listitem=False):
+        result = {}
+        if listitem:
+            selfprefix = prefix
+        else:
+            if node.name:
+                selfprefix = f'{prefix}{node.name}.'
+            else:
+                selfprefix = prefix
+
+        key_node, value_node = node.children
+        plain = self._plain_keys(node)
+        for key, subval in appstruct.items():
+            name = key if plain else key_node.serialize(key)
+            result.update(
+                value_node.typ.flatten(
+                    value_node,
+                    subval,
+                    prefix=f'{selfprefix}{name}.',
+                    listitem=True,
+                )
+            )
+        return result
+
+    def unflatten(self, node, paths, fstruct):
+        value_node = node.children[1]
+        value_name = value_node.name
+        items = {}
+        for path, value in _relative_fstruct(node, paths, fstruct).items():
+            name, dot, rest = path.partition('.')
+            # the path of the value relative to the value node
+            if not value_name:
+                subpath = rest
+            elif rest:
+                subpath = f'{value_name}.{rest}'
+            else:
+                subpath = value_name
+            items.setdefault(name, {})[subpath] = value
+        return {
+            self._key(node, name): value_node.typ.unflatten(
+                value_node, sorted(subfstruct), subfstruct
+            )
+            for name, subfstruct in items.items()
+        }
+
+    def set_value(self, node, appstruct, path, value):
+        if '.' in path:
+            next_name, rest = path.split('.', 1)
+            key = self._key(node, next_name)
+            next_node = node.children[1]
+            next_appstruct = appstruct[key]
+            appstruct[key] = next_node.typ.set_value(
+                next_node, next_appstruct, rest, value
+            )
+        else:
+            appstruct[self._key(node, path)] = value
+        return appstruct
+
+    def get_value(self, node, appstruct, path):
+        if '.' in path:
+            name, rest = path.split('.', 1)
+            next_node = node.children[1]
+            return next_node.typ.get_value(
+                next_node, appstruct[self._key(node, name)], rest
+            )
+        return appstruct[self._key(node, path)]
+
+    def _path_step(self, node, name):
+        return node.children[1], self._key(node, name)
+
+
 class String(SchemaType):
     """A type representing a text string.
 
@@ -1524,9 +3094,143 @@ class String(SchemaType):
                 ),
             )
 
+    def _check_appstruct(self, node, appstruct):
+        if (
+            not isinstance(appstruct, str)
+            or self.encoding
+            or not _converts_like(self, String)
+        ):
+            return super()._check_appstruct(node, appstruct)
+
+        if not appstruct:
+            return ('' if self.allow_empty else null), None
+        return appstruct, None
+
 
 Str = String
 
+_BASE64_ALPHABET = (
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+)
+
+
+class Bytes(SchemaType):
+    """A type representing binary data, such as an image.
+
+    Deserialization accepts a bytes-like object, e.g. :class:`bytes`,
+    :class:`bytearray` or :class:`memoryview`, which is returned as it is,
+    without a copy, or base64 text, which is decoded into a
+    :class:`bytearray`.  The text is decoded in chunks of a bounded size,
+    directly into the result, which is only allocated once the size of the
+    data, computed from the length of the text, has been checked.
+
+    Serialization returns the base64 text of a bytes-like
+    :term:`appstruct`, encoded directly from its buffer.
+
+    The constructor accepts the optional keyword arguments ``min_len`` and
+    ``max_len``, also available as attributes of the same name: if
+    supplied, the size of the data in bytes must be at least ``min_len``
+    and at most ``max_len``.
+
+    If the :attr:`colander.null` value is passed to the serialize
+    method of this class, the :attr:`colander.null` value will be
+    returned.  The empty string deserializes to :attr:`colander.null`.
+
+    The subnodes of the :class:`colander.SchemaNode` that wraps
+    this type are ignored.
+    """
+
+    # the number of characters of base64 text decoded at once
+    chunk_size = 65536
+
+    def __init__(self, min_len=None, max_len=None):
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def _check_size(self, node, size):
+        if self.min_len is not None and size < self.min_len:
+            raise Invalid(
+                node, _(Length._MIN_ERR, mapping={'min': self.min_len})
+            )
+        if self.max_len is not None and size > self.max_len:
+            raise Invalid(
+                node, _(Length._MAX_ERR, mapping={'max': self.max_len})
+            )
+
+    def _not_bytes(self, node, value):
+        return Invalid(
+            node,
+            _('"${val}" is not a bytes-like object', mapping={'val': value}),
+        )
+
+    def _decode(self, node, text):
+        length = len(text)
+        size = _byte_size(text)
+        self._check_size(node, size)
+        error = Invalid(node, _(DataURL._BASE64_ERR))
+        if length % 4:
+            raise error
+        result = bytearray(size)
+        pos = 0
+        chunk_size = self.chunk_size // 4 * 4
+        for start in range(0, length, chunk_size):
+            end = start + chunk_size
+            try:
+                chunk = text[start:end].encode('ascii')
+            except UnicodeEncodeError:
+                raise error
+            # binascii ignores the characters out of the alphabet
+            rest = chunk.translate(None, _BASE64_ALPHABET)
+            if rest and not (
+                end >= length
+                and rest in (b'=', b'==')
+                and chunk.endswith(rest)
+            ):
+                raise error
+            data = binascii.a2b_base64(chunk)
+            end = pos + len(data)
+            result[pos:end] = data
+            pos = end
+        return result
+
+    def serialize(self, node, appstruct):
+        if appstruct is null:
+            return null
+        try:
+            view = memoryview(appstruct)
+        except TypeError:
+            raise self._not_bytes(node, appstruct)
+        if not view.c_contiguous:
+            view = view.tobytes()
+        return binascii.b2a_base64(view, newline=False).decode('ascii')
+
+    def deserialize(self, node, cstruct):
+        if isinstance(cstruct, str):
+            if not cstruct:
+                return null
+            return self._decode(node, cstruct)
+        if cstruct is null:
+            return null
+        try:
+            size = memoryview(cstruct).nbytes
+        except TypeError:
+            raise self._not_bytes(node, cstruct)
+        self._check_size(node, size)
+        return cstruct
+
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Bytes) or appstruct is null:
+            return super()._check_appstruct(node, appstruct)
+        try:
+            size = memoryview(appstruct).nbytes
+        except TypeError:
+            return null, self._not_bytes(node, appstruct)
+        try:
+            self._check_size(node, size)
+        except Invalid as e:
+            return null, e
+        return appstruct, None
+
 
 class Number(SchemaType):
     """Abstract base class for float, int, decimal"""
@@ -1545,16 +3249,41 @@ class Number(SchemaType):
             )
 
     def deserialize(self, node, cstruct):
+        appstruct, error = self._deserialize(node, cstruct)
+        if error is not None:
+            raise error
+        return appstruct
+
+    def _deserialize(self, node, cstruct):
         if cstruct != 0 and not cstruct:
-            return null
+            return null, None
 
         try:
-            return self.num(cstruct)
+            return self.num(cstruct), None
         except Exception:
-            raise Invalid(
+            return null, Invalid(
                 node, _('"${val}" is not a number', mapping={'val': cstruct})
             )
 
+    def _try_deserialize(self, node, cstruct):
+        if type(self).deserialize is not Number.deserialize:
+            return super()._try_deserialize(node, cstruct)
+        return self._deserialize(node, cstruct)
+
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Number):
+            return super()._check_appstruct(node, appstruct)
+
+        if appstruct in (null, None):
+            return null, None
+
+        try:
+            return self.num(appstruct), None
+        except Exception:
+            return null, Invalid(
+                node, _('"${val}" is not a number', mapping={'val': appstruct})
+            )
+
 
 class Integer(Number):
     """A type representing an integer.
@@ -1664,6 +3393,191 @@ class Money(Decimal):
         super().__init__(decimal.Decimal('.01'), decimal.ROUND_UP)
 
 
+class NumberArray(SchemaType):
+    """Abstract base class for :class:`colander.FloatArray` and
+    :class:`colander.IntArray`, types representing a homogeneous sequence
+    of numbers.
+
+    Deserialization converts an iterable of numbers (or of strings
+    representing numbers) into an :class:`array.array` in a single pass,
+    which stores the numbers unboxed.  Serialization returns a list of
+    numbers.
+
+    The constructor accepts these keyword arguments:
+
+    - ``typecode``: the :mod:`array` type code of the result, which
+      determines the range and the precision of the numbers it can hold.
+      The default is ``'d'`` (double precision floats) for
+      :class:`colander.FloatArray` and ``'q'`` (signed 64 bit integers)
+      for :class:`colander.IntArray`.
+
+    - ``min`` and ``max``: if supplied, every number must be greater than
+      or equal to ``min`` and less than or equal to ``max``.
+
+    - ``min_len`` and ``max_len``: if supplied, the number of elements
+      must be at least ``min_len`` and at most ``max_len``.
+
+    - ``use_numpy``: if true, deserialization returns a NumPy array sharing
+      the memory of the :class:`array.array` instead.  NumPy must be
+      installed.
+
+    The checks are performed on the whole array at once, and an
+    :exc:`colander.Invalid` error reports the first offending element.
+
+    If the :attr:`colander.null` value is passed to the serialize
+    method of this class, the :attr:`colander.null` value will be
+    returned.
+
+    The subnodes of the :class:`colander.SchemaNode` that wraps
+    this type are ignored.
+    """
+
+    num = None
+    typecode = None
+
+    def __init__(
+        self,
+        typecode=None,
+        min=None,
+        max=None,
+        min_len=None,
+        max_len=None,
+        use_numpy=False,
+    ):
+        if typecode is not None:
+            self.typecode = typecode
+        self.min = min
+        self.max = max
+        self.min_len = min_len
+        self.max_len = max_len
+        if use_numpy:
+            import numpy  # noqa: F401 (fail early when it is missing)
+        self.use_numpy = use_numpy
+
+    def _not_iterable(self, node, value):
+        return Invalid(
+            node, _('"${val}" is not iterable', mapping={'val': value})
+        )
+
+    def _array(self, node, value):
+        if (
+            not hasattr(value, '__iter__')
+            or hasattr(value, 'get')
+            or isinstance(value, (str, bytes))
+        ):
+            raise self._not_iterable(node, value)
+        if not hasattr(value, '__len__'):
+            # iterators can only be consumed once
+            value = list(value)
+        try:
+            return array.array(self.typecode, map(self.num, value))
+        except (TypeError, ValueError, OverflowError):
+            pass
+        # convert the elements one by one to find the offending one
+        result = array.array(self.typecode)
+        for element in value:
+            try:
+                result.append(self.num(element))
+            except OverflowError:
+                raise Invalid(
+                    node,
+                    _(
+                        '${val} cannot be stored in an array of type '
+                        '"${typecode}"',
+                        mapping={'val': element, 'typecode': self.typecode},
+                    ),
+                )
+            except (TypeError, ValueError):
+                raise Invalid(
+                    node,
+                    _('"${val}" is not a number', mapping={'val': element}),
+                )
+        return result
+
+    def _check(self, node, result):
+        if self.min_len is not None and len(result) < self.min_len:
+            raise Invalid(
+                node,
+                _(
+                    'Shorter than minimum length ${min}',
+                    mapping={'min': self.min_len},
+                ),
+            )
+        if self.max_len is not None and len(result) > self.max_len:
+            raise Invalid(
+                node,
+                _(
+                    'Longer than maximum length ${max}',
+                    mapping={'max': self.max_len},
+                ),
+            )
+        if not result:
+            return
+        if self.min is not None:
+            lowest = min(result)
+            # min() returns NaN only when it is the first element
+            if lowest < self.min or lowest != lowest:
+                for value in result:
+                    if value < self.min:
+                        raise Invalid(
+                            node,
+                            _(
+                                '${val} is less than minimum value ${min}',
+                                mapping={'val': value, 'min': self.min},
+                            ),
+                        )
+        if self.max is not None:
+            highest = max(result)
+            if highest > self.max or highest != highest:
+                for value in result:
+                    if value > self.max:
+                        raise Invalid(
+                            node,
+                            _(
+                                '${val} is greater than maximum value ${max}',
+                                mapping={'val': value, 'max': self.max},
+                            ),
+                        )
+
+    def serialize(self, node, appstruct):
+        if appstruct is null:
+            return null
+
+        if isinstance(appstruct, array.array) or hasattr(appstruct, 'dtype'):
+            return appstruct.tolist()
+        return self._array(node, appstruct).tolist()
+
+    def deserialize(self, node, cstruct):
+        if cstruct is null:
+            return null
+
+        result = self._array(node, cstruct)
+        self._check(node, result)
+        if self.use_numpy:
+            import numpy
+
+            return numpy.frombuffer(result, dtype=result.typecode)
+        return result
+
+
+class FloatArray(NumberArray):
+    """A type representing a sequence of floats, deserialized into an
+    :class:`array.array` of type code ``'d'`` by default.  See
+    :class:`colander.NumberArray` for the constructor arguments."""
+
+    num = float
+    typecode = 'd'
+
+
+class IntArray(NumberArray):
+    """A type representing a sequence of integers, deserialized into an
+    :class:`array.array` of type code ``'q'`` by default.  See
+    :class:`colander.NumberArray` for the constructor arguments."""
+
+    num = int
+    typecode = 'q'
+
+
 class Boolean(SchemaType):
     """A type representing a boolean object.
 
@@ -1724,24 +3638,30 @@ class Boolean(SchemaType):
         return appstruct and self.true_val or self.false_val
 
     def deserialize(self, node, cstruct):
+        appstruct, error = self._deserialize(node, cstruct)
+        if error is not None:
+            raise error
+        return appstruct
+
+    def _deserialize(self, node, cstruct):
         if cstruct is null:
-            return null
+            return null, None
 
         try:
             result = str(cstruct)
         except Exception:
-            raise Invalid(
+            return null, Invalid(
                 node, _('${val} is not a string', mapping={'val': cstruct})
             )
         result = result.lower()
 
         if result in self.false_choices:
-            return False
+            return False, None
         elif self.true_choices:
             if result in self.true_choices:
-                return True
+                return True, None
             else:
-                raise Invalid(
+                return null, Invalid(
                     node,
                     _(
                         '"${val}" is neither in (${false_choices}) '
@@ -1754,7 +3674,24 @@ class Boolean(SchemaType):
                     ),
                 )
 
-        return True
+        return True, None
+
+    def _try_deserialize(self, node, cstruct):
+        if type(self).deserialize is not Boolean.deserialize:
+            return super()._try_deserialize(node, cstruct)
+        return self._deserialize(node, cstruct)
+
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Boolean):
+            return super()._check_appstruct(node, appstruct)
+
+        if appstruct is null:
+            return null, None
+
+        # the serialized value is one of two constants
+        return self._deserialize(
+            node, appstruct and self.true_val or self.false_val
+        )
 
 
 Bool = Boolean
@@ -1998,6 +3935,30 @@ class DateTime(SchemaType):
             )
         return result
 
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, DateTime):
+            return super()._check_appstruct(node, appstruct)
+
+        if not appstruct:
+            return null, None
+
+        # cant use isinstance; dt subs date
+        if type(appstruct) is datetime.date:
+            appstruct = datetime.datetime.combine(appstruct, datetime.time())
+
+        if not isinstance(appstruct, datetime.datetime):
+            return null, Invalid(
+                node,
+                _(
+                    '"${val}" is not a datetime object',
+                    mapping={'val': appstruct},
+                ),
+            )
+
+        if appstruct.tzinfo is None and self.default_tzinfo is not None:
+            appstruct = appstruct.replace(tzinfo=self.default_tzinfo)
+        return appstruct, None
+
 
 class Date(SchemaType):
     """A type representing a Python ``datetime.date`` object.
@@ -2076,6 +4037,23 @@ class Date(SchemaType):
             )
         return result
 
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Date):
+            return super()._check_appstruct(node, appstruct)
+
+        if not appstruct:
+            return null, None
+
+        if isinstance(appstruct, datetime.datetime):
+            appstruct = appstruct.date()
+
+        if not isinstance(appstruct, datetime.date):
+            return null, Invalid(
+                node,
+                _('"${val}" is not a date object', mapping={'val': appstruct}),
+            )
+        return appstruct, None
+
 
 class Time(SchemaType):
     """A type representing a Python ``datetime.time`` object.
@@ -2153,6 +4131,22 @@ class Time(SchemaType):
             node, _(self.err_template, mapping={'val': cstruct, 'err': err})
         )
 
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Time):
+            return super()._check_appstruct(node, appstruct)
+
+        if isinstance(appstruct, datetime.datetime):
+            appstruct = appstruct.time()
+
+        if not isinstance(appstruct, datetime.time):
+            if not appstruct:
+                return null, None
+            return null, Invalid(
+                node,
+                _('"${val}" is not a time object', mapping={'val': appstruct}),
+            )
+        return appstruct, None
+
 
 class Enum(SchemaType):
     """A type representing a Python ``enum.Enum`` object.
@@ -2218,6 +4212,23 @@ class Enum(SchemaType):
             )
         return self.values[result]
 
+    def _check_appstruct(self, node, appstruct):
+        if not _converts_like(self, Enum):
+            return super()._check_appstruct(node, appstruct)
+
+        if appstruct is null:
+            return null, None
+
+        if not isinstance(appstruct, self.enum_cls):
+            return null, Invalid(
+                node,
+                _(
+                    '"${val}" is not a valid "${cls}"',
+                    mapping={'val': appstruct, 'cls': self.enum_cls.__name__},
+                ),
+            )
+        return appstruct, None
+
 
 def _add_node_child(node, child):
     insert_before = getattr(child, 'insert_before', None)
@@ -2406,14 +4417,46 @@ class _SchemaNode:
         cstruct = self.typ.serialize(self, appstruct)
         return cstruct
 
+    def serialize_json(self, appstruct=null, fp=None, chunk_size=1000):
+        """Serialize the :term:`appstruct` based on the schema represented
+        by this node and return the JSON text of the resulting
+        :term:`cstruct`, or write it to the file-like object ``fp`` and
+        return ``None``.
+
+        The result is identical to ``json.dumps(self.serialize(appstruct))``
+        but the schema is walked only once and no intermediate cstruct is
+        built for mapping, sequence and tuple nodes.  When ``fp`` is
+        supplied, the text is written each time ``chunk_size`` sequence
+        elements have been serialized, so that large sequences are
+        streamed; if an error is raised, part of the text may already have
+        been written.
+
+        As with :func:`json.dumps`, a :exc:`TypeError` is raised if the
+        cstruct contains a value which cannot be represented in JSON, such
+        as :attr:`colander.null`.
+        """
+        writer = _JSONWriter(fp, chunk_size)
+        writer.write(self, appstruct, '', False)
+        if fp is None:
+            return ''.join(writer.parts)
+        writer.flush()
+
     def flatten(self, appstruct):
         """Create and return a data structure which is a flattened
         representation of the passed in struct based on the schema represented
         by this node.  The return data structure is a dictionary; its keys are
         dotted names.  Each dotted name represents a path to a location in the
         schema.  The values of of the flattened dictionary are subvalues of
-        the passed in struct."""
-        flat = self.typ.flatten(self, appstruct)
+        the passed in struct.
+
+        The dotted names of the nodes of a mapping, sequence or tuple schema
+        are computed once and reused by the following calls until the
+        names, types or children of its nodes change."""
+        plan = _flat_plan(self)
+        if plan is None:
+            return self.typ.flatten(self, appstruct)
+        flat = {}
+        plan.flatten(appstruct, '', flat)
         return flat
 
     def unflatten(self, fstruct):
@@ -2421,8 +4464,11 @@ class _SchemaNode:
         on the schema represented by this node using the flattened
         representation passed in. This is the inverse operation to
         :meth:`colander.SchemaNode.flatten`."""
-        paths = sorted(fstruct.keys())
-        return self.typ.unflatten(self, paths, fstruct)
+        plan = _flat_plan(self)
+        if plan is None:
+            paths = sorted(fstruct.keys())
+            return self.typ.unflatten(self, paths, fstruct)
+        return plan.unflatten(fstruct)
 
     def set_value(self, appstruct, dotted_name, value):
         """Uses the schema to set a value in a nested datastructure from a
@@ -2434,7 +4480,82 @@ class _SchemaNode:
         the value specified by the dotted name path."""
         return self.typ.get_value(self, appstruct, dotted_name)
 
-    def deserialize(self, cstruct=null):
+    def accessor(self, *dotted_names):
+        """Return a :class:`colander.Accessor` getting and setting the
+        values named by the dotted name paths ``dotted_names`` in the data
+        structures described by this node.  The paths are resolved once,
+        which makes the accessor faster than
+        :meth:`colander.SchemaNode.get_value` and
+        :meth:`colander.SchemaNode.set_value` when the same paths are used
+        for many data structures."""
+        return Accessor(self, *dotted_names)
+
+    def get_values(self, appstruct, dotted_names):
+        """Return the list of the values named by each of the dotted name
+        paths of ``dotted_names`` in ``appstruct``, as returned by
+        :meth:`colander.SchemaNode.get_value`.  The values shared by
+        several paths, like the mapping of ``a.b`` and ``a.c``, are only
+        looked up once; use :meth:`colander.SchemaNode.accessor` to
+        resolve the paths once for many data structures."""
+        accessor = Accessor(self, *dotted_names)
+        if len(accessor.paths) == 1:
+            return [accessor.get(appstruct)]
+        return accessor.get(appstruct)
+
+    def project(self, paths):
+        """Return a lightweight view of this schema which contains only
+        the nodes named by ``paths``, an iterable of dotted name paths.
+
+        The paths use the same conventions as
+        :meth:`colander.SchemaNode.get_value`, except that the elements of
+        a sequence are addressed with the ``*`` wildcard instead of an
+        index, e.g. ``items.*.id``.  A path naming a node which has
+        children selects that node and all of its descendants.
+
+        Subtrees which are not named by any path are skipped entirely
+        when the view is used to deserialize a :term:`cstruct`; the keys
+        of the cstruct belonging to them are ignored.  Elements of a
+        tuple are positional and are therefore never skipped.  Validators
+        of the projected nodes still run, against the partial appstruct.
+
+        The view shares its unprojected subnodes with this schema, so
+        neither should be mutated while the other is in use.  A
+        :exc:`KeyError` is raised if a path names a nonexistent node."""
+        return self.typ.project(self, _projection_tree(paths))
+
+    def deserialize_patch(self, appstruct, delta):
+        """Apply a partial update to an existing, already valid
+        :term:`appstruct` and return a tuple ``(appstruct, error)``.
+
+        ``delta`` is a dictionary mapping dotted name paths (as accepted
+        by :meth:`colander.SchemaNode.get_value`) to :term:`cstruct`
+        values.  Each value is deserialized by the node named by its
+        path and stored in the result using
+        :meth:`colander.SchemaNode.set_value` semantics; a value which
+        deserializes to :attr:`colander.drop` removes the item instead.
+        The indexes in the paths are those of the items of ``appstruct``:
+        removing an item does not change the item another path names.
+        Once every path has been handled, the validators of the ancestor
+        nodes of the changed paths are rerun, deepest first.  No other
+        node of the schema is deserialized or validated.
+
+        ``appstruct`` itself is not modified: only the containers along
+        the changed paths are copied.  Paths which fail deserialization
+        are left unchanged in the result.
+
+        ``error`` is ``None`` when the update is valid.  Otherwise it is a
+        :exc:`colander.Invalid` exception rooted at this node which only
+        reports errors for the changed paths and their ancestors.
+
+        A :exc:`KeyError` is raised if a path names a nonexistent node or
+        an item beyond the end of a sequence.
+        """
+        # colander.patch imports this module
+        from colander.patch import deserialize_patch
+
+        return deserialize_patch(self, appstruct, delta)
+
+    def deserialize(self, cstruct=null, only=None, errors=None):
         """Deserialize the :term:`cstruct` into an :term:`appstruct` based
         on the schema, run this :term:`appstruct` through the
         preparer, if one is present, then validate the
@@ -2457,7 +4578,30 @@ class _SchemaNode:
 
         If a ``cstruct`` argument is not explicitly provided, it
         defaults to :attr:`colander.null`.
+
+        If ``only`` is supplied, it must be an iterable of dotted name
+        paths; only the nodes named by it are deserialized, using the
+        view returned by :meth:`colander.SchemaNode.project`.  When the
+        same paths are used repeatedly, it is cheaper to create the view
+        once and call its ``deserialize`` method.
+
+        If ``errors`` is supplied, it must be a
+        :class:`colander.ErrorCollector`: instead of being raised, the
+        :exc:`colander.Invalid` error of an invalid ``cstruct`` is added to
+        the collector as compact records, and :attr:`colander.drop` is
+        returned.
         """
+        if only is not None:
+            return self.project(only).deserialize(cstruct, errors=errors)
+
+        if errors is not None:
+            appstruct, error = self.try_deserialize(cstruct)
+            if error is not None:
+                errors.add(error)
+                return drop
+            errors.records += 1
+            return appstruct
+
         appstruct = self.typ.deserialize(self, cstruct)
 
         if self.preparer is not None:
@@ -2486,6 +4630,10 @@ class _SchemaNode:
             # We never deserialize or validate the missing value
             return appstruct
 
+        self._run_validator(appstruct)
+        return appstruct
+
+    def _run_validator(self, appstruct):
         if self.validator is not None:
             if isinstance(self.validator, deferred):  # unbound
                 raise UnboundDeferredError(
@@ -2493,7 +4641,184 @@ class _SchemaNode:
                     "deferred validator".format(node=self)
                 )
             self.validator(self, appstruct)
-        return appstruct
+
+    def try_deserialize(self, cstruct=null):
+        """Deserialize the :term:`cstruct` like
+        :meth:`colander.SchemaNode.deserialize`, but return a tuple
+        ``(appstruct, error)`` instead of raising an exception.
+
+        ``error`` is ``None`` when the ``cstruct`` is valid.  Otherwise it
+        is the :exc:`colander.Invalid` exception
+        :meth:`colander.SchemaNode.deserialize` would raise, with the same
+        tree of children and messages, and ``appstruct`` is
+        :attr:`colander.null`.
+
+        The errors of the children of mapping, sequence and tuple nodes
+        are collected without being raised and caught again at each
+        level, and the built-in validators return their errors instead of
+        raising them, which makes this method much cheaper than
+        :meth:`colander.SchemaNode.deserialize` when many values are
+        invalid.  Types, validators and nodes with their own
+        ``deserialize`` method still raise their errors, which are caught
+        where they occur.
+        """
+        return self._try_deserialize(cstruct)
+
+    def validate(self, cstruct=null):
+        """Check the :term:`cstruct` without keeping its
+        :term:`appstruct`: return ``None`` if it is valid, and otherwise
+        the :exc:`colander.Invalid` exception
+        :meth:`colander.SchemaNode.deserialize` would raise.
+
+        The values of the nodes which have neither a preparer nor a
+        validator are not kept: the mappings, sequences and tuples among
+        them are read in place, without building the containers of the
+        appstruct.  The nodes which have a preparer or a validator, and
+        all of their descendants, are deserialized as usual, since the
+        preparer or validator needs their value.  The errors are collected
+        like :meth:`colander.SchemaNode.try_deserialize` does.
+        """
+        return self._try_validate(cstruct)
+
+    def _try_validate(self, cstruct):
+        if (
+            cstruct is not null
+            and self.preparer is None
+            and self.validator is None
+            and type(self).deserialize is _SchemaNode.deserialize
+        ):
+            return self.typ._try_validate(self, cstruct)
+        return self._try_deserialize(cstruct)[1]
+
+    def _try_deserialize(self, cstruct):
+        if type(self).deserialize is not _SchemaNode.deserialize:
+            try:
+                return self.deserialize(cstruct), None
+            except Invalid as e:
+                return null, e
+
+        appstruct, error = self.typ._try_deserialize(self, cstruct)
+        if error is not None:
+            return null, error
+        return self._finish(appstruct)
+
+    def check_appstruct(self, appstruct=null):
+        """Check the :term:`appstruct` directly: return ``None`` if it is
+        valid, and otherwise the :exc:`colander.Invalid` exception
+        ``self.deserialize(self.serialize(appstruct))`` would raise.
+
+        The built-in types check the Python values of the appstruct
+        without converting them to a :term:`cstruct` and back, e.g. a
+        :class:`colander.DateTime` node accepts a ``datetime.datetime``
+        and a :class:`colander.Money` node a number which it quantizes,
+        and the preparers, ``missing`` values and validators of the nodes
+        are then used as :meth:`colander.SchemaNode.deserialize` uses
+        them.  A value absent from a mapping, or
+        :attr:`colander.null`, is replaced by the ``default`` of its
+        node, as :meth:`colander.SchemaNode.serialize` would do.
+
+        The errors of all the nodes are reported together, where the
+        round trip only reports the errors of ``serialize`` if there are
+        any.  Where a conversion of the round trip would lose information,
+        such as the ``format`` of a :class:`colander.DateTime` without
+        microseconds, the value is checked as it is.  Types, and nodes,
+        which have their own ``serialize`` or ``deserialize`` method are
+        still checked with the round trip.
+        """
+        return self._check_appstruct(appstruct)[1]
+
+    def _check_appstruct(self, appstruct):
+        cls = type(self)
+        if (
+            cls.serialize is not _SchemaNode.serialize
+            or cls.deserialize is not _SchemaNode.deserialize
+        ):
+            try:
+                return self.deserialize(self.serialize(appstruct)), None
+            except Invalid as e:
+                return null, e
+
+        if appstruct is null:
+            appstruct = self.default
+        if isinstance(appstruct, deferred):  # unbound schema with deferreds
+            appstruct = null
+        appstruct, error = self.typ._check_appstruct(self, appstruct)
+        if error is not None:
+            return null, error
+        return self._finish(appstruct)
+
+    def _finish(self, appstruct):
+        # run the preparer, ``missing`` and the validator of the node on
+        # the value of its type, returning ``(appstruct, error)``
+        if self.preparer is not None:
+            # if the preparer is a function, call a single preparer
+            if callable(self.preparer):
+                appstruct = self.preparer(appstruct)
+            # if the preparer is a list, call each separate preparer
+            elif is_nonstr_iter(self.preparer):
+                for preparer in self.preparer:
+                    appstruct = preparer(appstruct)
+
+        if appstruct is null:
+            appstruct = self.missing
+            if appstruct is required:
+                return null, Invalid(
+                    self,
+                    _(
+                        self.missing_msg,
+                        mapping={'title': self.title, 'name': self.name},
+                    ),
+                )
+
+            if isinstance(appstruct, deferred):
+                # unbound schema with deferreds
+                return null, Invalid(self, self.missing_msg)
+            # We never deserialize or validate the missing value
+            return appstruct, None
+
+        validator = self.validator
+        if validator is not None:
+            error = None
+            if type(validator).__call__ is _Validator.__call__:
+                error = validator._error(self, appstruct)
+            else:
+                try:
+                    self._run_validator(appstruct)
+                except Invalid as e:
+                    error = e
+            if error is not None:
+                return null, error
+        return appstruct, None
+
+    def deserialize_lazy(self, cstruct=null):
+        """Deserialize the :term:`cstruct` like
+        :meth:`colander.SchemaNode.deserialize`, but defer the work done
+        for the children of mapping and sequence nodes until they are
+        accessed.
+
+        For a node of type :class:`colander.Mapping` this returns a
+        read-only :class:`colander.LazyMapping`, and for a node of type
+        :class:`colander.Sequence` a :class:`colander.LazySequence`.
+        Accessing an item of these proxies deserializes the corresponding
+        child the first time and caches the result; children which are
+        themselves mappings or sequences are returned as proxies too.
+        If a child fails to deserialize, the :exc:`colander.Invalid`
+        exception raised by the access is rooted at this node.
+
+        The checks which do not require deserializing the children are
+        performed eagerly: the type of the container, required keys
+        which are absent and, if the ``unknown`` attribute of the mapping
+        type is ``raise``, unknown keys.  The validators of the
+        containers themselves are only run by the ``validate`` method of
+        the proxies, which deserializes and validates the whole value,
+        raising the same exception as
+        :meth:`colander.SchemaNode.deserialize` would, and returns it as a
+        regular appstruct.
+
+        Nodes of other types, nodes with a preparer and nodes of classes
+        overriding ``deserialize`` are deserialized eagerly.
+        """
+        return _deserialize_lazy(self, cstruct, None, None)
 
     def add(self, node):
         """Append a subnode to this node. ``node`` must be a SchemaNode."""
@@ -2674,6 +4999,10 @@ class Schema(SchemaNode):
 MappingSchema = Schema
 
 
+class TaggedSchema(SchemaNode):
+    schema_type = Tagged
+
+
 class TupleSchema(SchemaNode):
     schema_type = Tuple
 
@@ -2704,6 +5033,19 @@ class SequenceSchema(SchemaNode):
         return cloned
 
 
+class MapSchema(SchemaNode):
+    schema_type = Map
+
+    def __init__(self, *args, **kw):
+        SchemaNode.__init__(self, *args, **kw)
+        if len(self.children) != 2:
+            raise Invalid(
+                self, 'Map schemas must have exactly two child nodes'
+            )
+
+    clone = SequenceSchema.clone
+
+
 class deferred:
     """A decorator which can be used to define deferred schema values
     (missing values, widgets, validators, etc.)"""
@@ -2716,6 +5058,81 @@ class deferred:
         return self.wrapped(node, kw)
 
 
+class Accessor:
+    """An object returned by :meth:`colander.SchemaNode.accessor` which
+    gets and sets the values named by the dotted name paths ``paths`` in
+    the data structures described by the schema ``node``, like
+    :meth:`colander.SchemaNode.get_value` and
+    :meth:`colander.SchemaNode.set_value` do.
+
+    The paths are resolved against the schema once, when the accessor is
+    created: the nodes they name must exist at that time and later changes
+    of the schema are not reflected."""
+
+    def __init__(self, node, *paths):
+        self.node = node
+        self.paths = paths
+        if len(paths) == 1:
+            names = paths[0].split('.')
+            self._steps, self._tail = _access_steps(node, names)
+            self._keys = [key for _, key in self._steps]
+            # the containers read by ``set``: the last one is only read
+            # when it is handed to a type with its own set_value method
+            self._read = self._keys if self._tail else self._keys[:-1]
+        else:
+            self._tree = _values_tree(node, paths)
+
+    def get(self, appstruct):
+        """Return the value named by the path in ``appstruct`` or, if the
+        accessor has several paths, the list of the values named by each
+        of them; the values shared by several paths, like the mapping of
+        ``a.b`` and ``a.c``, are only looked up once."""
+        if len(self.paths) != 1:
+            values = [None] * len(self.paths)
+            _get_values(appstruct, self._tree, values)
+            return values
+        for key in self._keys:
+            appstruct = appstruct[key]
+        if self._tail is not None:
+            node, rest = self._tail
+            return node.typ.get_value(node, appstruct, rest)
+        return appstruct
+
+    def set(self, appstruct, value):
+        """Set the value named by the path of the accessor in ``appstruct``
+        to ``value``; a :exc:`ValueError` is raised if the accessor has
+        several paths.
+
+        Mappings and sequences are changed in place while tuples, which
+        are immutable, are replaced by a modified copy.  Return
+        ``appstruct``, or its modified copy if it is a tuple."""
+        if len(self.paths) != 1:
+            raise ValueError('Only the value of a single path can be set')
+        containers = [appstruct]
+        for key in self._read:
+            containers.append(containers[-1][key])
+        if self._tail is not None:
+            node, rest = self._tail
+            value = node.typ.set_value(node, containers.pop(), rest, value)
+        for positional, key in reversed(self._steps):
+            container = containers.pop()
+            if not positional:
+                container[key] = value
+                return appstruct
+            container = list(container)
+            container[key] = value
+            value = tuple(container)
+        return value
+
+    def __repr__(self):
+        return '<{}.{} object at {} {!r}>'.format(
+            self.__module__,
+            self.__class__.__name__,
+            id(self),
+            self.paths,
+        )
+
+
 def _unflatten_mapping(
     node, paths, fstruct, get_child=None, rewrite_subpath=None
 ):
@@ -2768,6 +5185,805 @@ def _unflatten_mapping(
     return appstruct
 
 
+# kinds of nodes handled by _FlatPlan
+_FLAT_CUSTOM = 0
+_FLAT_LEAF = 1
+_FLAT_MAPPING = 2
+_FLAT_SEQUENCE = 3
+_FLAT_TUPLE = 4
+
+# the flatten plans of the schema nodes, see _flat_plan
+_flat_plans = weakref.WeakKeyDictionary()
+
+
+def _flat_kind(node):
+    cls = type(node.typ)
+    for kind, typ in (
+        (_FLAT_LEAF, SchemaType),
+        (_FLAT_MAPPING, Mapping),
+        (_FLAT_SEQUENCE, Sequence),
+        (_FLAT_TUPLE, Tuple),
+    ):
+        if cls.flatten is typ.flatten and cls.unflatten is typ.unflatten:
+            return kind
+    return _FLAT_CUSTOM
+
+
+def _flat_plan(node):
+    # return the flatten plan of the container ``node``, or None for other
+    # nodes; the plan is compiled once and reused as long as the names,
+    # types and children of the nodes of the schema are unchanged
+    kind = _flat_kind(node)
+    if kind == _FLAT_LEAF or kind == _FLAT_CUSTOM:
+        return None
+    plan = _flat_plans.get(node)
+    if plan is None or not plan.valid():
+        plan = _flat_plans[node] = _FlatPlan(node)
+    return plan
+
+
+class _FlatPlan:
+    # The dotted names of the nodes of a schema, compiled into functions
+    # flattening an appstruct in one pass, and the tree of the nodes by
+    # name used to unflatten one.  The types whose flatten and unflatten
+    # methods are overridden are delegated to.
+
+    def __init__(self, node):
+        # the plan is the value of ``node`` in _flat_plans, so it must not
+        # keep ``node`` alive: the nodes are only weakly referenced by
+        # ``nodes`` and the tree does not hold the root
+        self.name = node.name
+        self.nodes = []
+        self.states = []
+        self.flatten = self._flattener(node, '', False)[1]
+        kind, root, children, finish = self._tree(node)
+        self.tree = kind, None, children, finish
+
+    def _record(self, node):
+        # remember the state of ``node`` checked by ``valid``
+        self.nodes.append(weakref.ref(node))
+        self.states.append((node.name, node.typ, list(node.children)))
+        return _flat_kind(node)
+
+    def valid(self):
+        # the nodes are alive: the root is the key of the plan and the
+        # others are the children recorded in ``states``
+        nodes = [ref() for ref in self.nodes]
+        states = [(node.name, node.typ, node.children) for node in nodes]
+        return states == self.states
+
+    def _flattener(self, node, static, listitem):
+        # return ``(key, None)`` for a leaf stored under the static ``key``
+        # below the prefix, or ``(None, flatten)`` where ``flatten(value,
+        # prefix, result)`` stores the flattened ``value`` in ``result``;
+        # ``static`` is the part of the prefix which does not depend on
+        # the position of the value in sequences
+        kind = self._record(node)
+        name = node.name
+        if kind == _FLAT_LEAF:
+            key = static if listitem else static + name
+            if key and not key.endswith('.'):
+                return key, None
+
+            def flatten(value, prefix, result):
+                result[(prefix + key).rstrip('.')] = value
+
+        elif kind == _FLAT_CUSTOM:
+            typ = node.typ
+            if listitem:
+
+                def flatten(value, prefix, result):
+                    result.update(
+                        typ.flatten(
+                            node, value, prefix=prefix + static, listitem=True
+                        )
+                    )
+
+            else:
+
+                def flatten(value, prefix, result):
+                    result.update(
+                        typ.flatten(node, value, prefix=prefix + static)
+                    )
+
+        elif kind == _FLAT_MAPPING:
+            if not listitem and name:
+                static = f'{static}{name}.'
+            entries = [
+                (subnode.name,) + self._flattener(subnode, static, False)
+                for subnode in node.children
+            ]
+
+            def flatten(value, prefix, result):
+                get = value.get
+                for subname, key, subflatten in entries:
+                    if key is None:
+                        subflatten(get(subname, null), prefix, result)
+                    else:
+                        result[prefix + key] = get(subname, null)
+
+        elif kind == _FLAT_TUPLE:
+            if not listitem:
+                static = f'{static}{name}.'
+            entries = [
+                (num,) + self._flattener(subnode, static, False)
+                for num, subnode in enumerate(node.children)
+            ]
+
+            def flatten(value, prefix, result):
+                for num, key, subflatten in entries:
+                    if key is None:
+                        subflatten(value[num], prefix, result)
+                    else:
+                        result[prefix + key] = value[num]
+
+        else:
+            if not listitem:
+                static = f'{static}{name}.'
+            childnode = node.children[0]
+            leaf = _flat_kind(childnode) == _FLAT_LEAF
+            subflatten = self._flattener(childnode, '', True)[1]
+
+            def flatten(value, prefix, result):
+                selfprefix = prefix + static
+                if leaf:
+                    # (prefix + 'num.').rstrip('.')
+                    for num, subval in enumerate(value):
+                        result[f'{selfprefix}{num}'] = subval
+                else:
+                    for num, subval in enumerate(value):
+                        subflatten(subval, f'{selfprefix}{num}.', result)
+
+        return None, flatten
+
+    def _tree(self, node):
+        # return ``(kind, node, children, finish)``: ``children`` are the
+        # trees of the children of a mapping or tuple by name, or the tree
+        # of the child of a sequence, and ``finish`` converts the
+        # dictionary of the values collected for the node by name to its
+        # unflattened value (None if it is that dictionary)
+        kind = _flat_kind(node)
+        if kind == _FLAT_LEAF:
+            return kind, node, None, None
+        children = None
+        if kind == _FLAT_CUSTOM:
+            typ = node.typ
+
+            def finish(fstruct):
+                return typ.unflatten(node, sorted(fstruct), fstruct)
+
+        elif kind == _FLAT_MAPPING:
+            children = {sub.name: self._tree(sub) for sub in node.children}
+            finishes = [
+                (name, tree[3])
+                for name, tree in children.items()
+                if tree[3] is not None
+            ]
+            if not finishes:
+                return kind, node, children, None
+
+            def finish(values):
+                for name, subfinish in finishes:
+                    if name in values:
+                        values[name] = subfinish(values[name])
+                return values
+
+        elif kind == _FLAT_TUPLE:
+            children = {sub.name: self._tree(sub) for sub in node.children}
+            elements = [
+                (sub.name, children[sub.name][3]) for sub in node.children
+            ]
+
+            def finish(values):
+                return tuple(
+                    [
+                        (
+                            values[name]
+                            if subfinish is None
+                            else subfinish(values[name])
+                        )
+                        for name, subfinish in elements
+                    ]
+                )
+
+        else:
+            children = self._tree(node.children[0])
+            subfinish = children[3]
+
+            def finish(values):
+                items = [values[str(num)] for num in range(len(values))]
+                if subfinish is None:
+                    return items
+                return [subfinish(item) for item in items]
+
+        return kind, node, children, finish
+
+    def unflatten(self, fstruct):
+        name = self.name
+        prefix = name + '.' if name else ''
+        start = len(prefix)
+        tree = self.tree
+        result = {}
+        for path, value in fstruct.items():
+            if path == name:
+                # flattened structs contain non-leaf nodes which are
+                # ignored during unflattening.
+                continue
+            if not path.startswith(prefix):
+                raise AssertionError('Bad node: %s' % path)
+            kind, node, children, finish = tree
+            values = result
+            pos = start
+            while True:
+                end = path.find('.', pos)
+                step = path[pos:] if end < 0 else path[pos:end]
+                if kind == _FLAT_SEQUENCE:
+                    subtree = children
+                else:
+                    subtree = children.get(step)
+                    if subtree is None:
+                        raise KeyError(step)
+                kind, node, children, finish = subtree
+                if kind == _FLAT_LEAF:
+                    if end >= 0:
+                        raise AssertionError(
+                            'paths should be [name] for leaf nodes.'
+                        )
+                    values[step] = value
+                    break
+                subvalues = values.get(step)
+                if subvalues is None:
+                    subvalues = values[step] = {}
+                if kind == _FLAT_CUSTOM:
+                    # the path relative to the parent of the node
+                    subpath = node.name if end < 0 else node.name + path[end:]
+                    subvalues[subpath] = value
+                    break
+                if end < 0:
+                    break
+                values = subvalues
+                pos = end + 1
+        finish = tree[3]
+        return result if finish is None else finish(result)
+
+
+def _copy_node(node, children):
+    # a shallow copy of ``node``; unlike ``clone`` the subnodes are shared
+    copied = copy.copy(node)
+    copied.children = children
+    return copied
+
+
+def _project_children(node, tree, keep_others):
+    children = []
+    found = set()
+    for subnode in node.children:
+        name = subnode.name
+        if name in tree:
+            found.add(name)
+            subtree = tree[name]
+            if subtree is not None:
+                subnode = subnode.typ.project(subnode, subtree)
+        elif not keep_others:
+            continue
+        children.append(subnode)
+    for name in tree:
+        if name not in found:
+            raise KeyError(name)
+    return children
+
+
+def _projection_tree(paths):
+    # a nested dict of path segments; ``None`` marks a whole subtree
+    tree = {}
+    for path in paths:
+        subtree = tree
+        names = path.split('.')
+        for name in names[:-1]:
+            subtree = subtree.setdefault(name, {})
+            if subtree is None:
+                break
+        else:
+            subtree[names[-1]] = None
+    return tree
+
+
+def _named_step(node, name):
+    for num, subnode in enumerate(node.children):
+        if subnode.name == name:
+            return subnode, num
+    raise KeyError(name)
+
+
+def _access_step(node, name):
+    # resolve ``name`` to (subnode, positional, key) where ``key`` is the
+    # subscript of the value of ``subnode`` in the value of ``node``, or
+    # return None if the type of ``node`` has its own get_value and
+    # set_value methods
+    cls = type(node.typ)
+    methods = (cls.get_value, cls.set_value)
+    if methods == (Mapping.get_value, Mapping.set_value):
+        return node.typ._path_step(node, name)[0], False, name
+    for typ, positional in ((Tuple, True), (Sequence, False)):
+        if methods == (typ.get_value, typ.set_value):
+            subnode, key = node.typ._path_step(node, name)
+            return subnode, positional, key
+    if methods == (SchemaType.get_value, SchemaType.set_value):
+        # a leaf node, which cannot be traversed
+        node.typ._path_step(node, name)
+    return None
+
+
+def _access_steps(node, names):
+    # resolve ``names`` to a list of (positional, key) steps and to
+    # (node, rest) for the rest of the path below a node whose type has
+    # its own get_value and set_value methods, or None
+    steps = []
+    for num, name in enumerate(names):
+        step = _access_step(node, name)
+        if step is None:
+            return steps, (node, '.'.join(names[num:]))
+        node, positional, key = step
+        steps.append((positional, key))
+    return steps, None
+
+
+def _values_tree(node, paths):
+    # group ``paths`` by their steps in a tree of (indexes, children,
+    # tails) where ``indexes`` are the indexes of the paths naming the
+    # node itself, ``children`` the (key, subnode, subtree) of its children
+    # by name and ``tails`` the (index, node, rest) of the paths handed to
+    # a type with its own get_value method
+    tree = ([], {}, [])
+    for index, path in enumerate(paths):
+        subtree = tree
+        subnode = node
+        names = path.split('.')
+        for num, name in enumerate(names):
+            children = subtree[1]
+            child = children.get(name)
+            if child is None:
+                step = _access_step(subnode, name)
+                if step is None:
+                    rest = '.'.join(names[num:])
+                    subtree[2].append((index, subnode, rest))
+                    break
+                child = children[name] = (step[2], step[0], ([], {}, []))
+            _, subnode, subtree = child
+        else:
+            subtree[0].append(index)
+    return tree
+
+
+def _get_values(appstruct, tree, values):
+    indexes, children, tails = tree
+    for index in indexes:
+        values[index] = appstruct
+    for index, node, rest in tails:
+        values[index] = node.typ.get_value(node, appstruct, rest)
+    for key, _, subtree in children.values():
+        _get_values(appstruct[key], subtree, values)
+
+
+def _deserialize_lazy(node, cstruct, parent, pos):
+    if (
+        cstruct is not null
+        and node.preparer is None
+        and type(node).deserialize is _SchemaNode.deserialize
+    ):
+        deserialize = type(node.typ).deserialize
+        if deserialize is Mapping.deserialize:
+            return LazyMapping(node, cstruct, parent, pos)
+        if deserialize is Sequence.deserialize:
+            return LazySequence(node, cstruct, parent, pos)
+    return node.deserialize(cstruct)
+
+
+def _force(value):
+    if isinstance(value, _LazyContainer):
+        return value._deserialize()
+    return value
+
+
+_json_encoder = json.JSONEncoder()
+_encode_string = json.encoder.encode_basestring_ascii
+
+# kinds of nodes handled by _JSONWriter
+_JSON_CUSTOM = 0
+_JSON_LEAF = 1
+_JSON_STRING = 2
+_JSON_NUMBER = 3
+_JSON_MAPPING = 4
+_JSON_SEQUENCE = 5
+_JSON_TUPLE = 6
+
+
+class _JSONWriter:
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.parts = []
+        self.count = 0
+        # per node: kind, fast path type and, for mappings, the children
+        # with their encoded keys
+        self.plans = {}
+
+    def plan(self, node):
+        plan = self.plans.get(id(node))
+        if plan is not None:
+            return plan
+        typ = node.typ
+        serialize = type(typ).serialize
+        children = None
+        fast = None
+        if type(node).serialize is not _SchemaNode.serialize:
+            kind = _JSON_CUSTOM
+        elif serialize is Mapping.serialize:
+            kind = _JSON_MAPPING
+            children = []
+            for num, subnode in enumerate(node.children):
+                key = _encode_string(subnode.name) + ': '
+                children.append(
+                    (
+                        num,
+                        subnode,
+                        subnode.name,
+                        (key, ', ' + key),
+                        getattr(subnode, 'default', None) is drop,
+                        self.plan(subnode)[1],
+                    )
+                )
+        elif serialize is Sequence.serialize:
+            kind = _JSON_SEQUENCE
+        elif serialize is Tuple.serialize:
+            kind = _JSON_TUPLE
+        elif type(typ) is String and not typ.encoding:
+            kind = _JSON_STRING
+            fast = str
+        elif type(typ) in (Integer, Float) and typ.num in (int, float):
+            # str(self.num(value)) is repr(value) for these types
+            kind = _JSON_NUMBER
+            fast = typ.num
+        else:
+            kind = _JSON_LEAF
+        plan = self.plans[id(node)] = (kind, fast, children)
+        return plan
+
+    def write(self, node, value, prefix, droppable=True):
+        # write the JSON text of ``node.serialize(value)`` preceded by
+        # ``prefix``; return False instead if it is a droppable drop
+        kind, fast, children = self.plan(node)
+        if type(value) is fast:
+            if kind == _JSON_STRING:
+                self.parts.append(prefix + _encode_string(value))
+            else:
+                self.parts.append(prefix + '"' + repr(value) + '"')
+            return True
+        if kind == _JSON_CUSTOM:
+            return self.leaf(node.serialize(value), prefix, droppable)
+        if value is null:
+            value = node.default
+        if isinstance(value, deferred):  # unbound schema with deferreds
+            value = null
+        if kind == _JSON_MAPPING:
+            self.mapping(node, children, value, prefix)
+        elif kind == _JSON_SEQUENCE and value is not null:
+            self.sequence(node, value, prefix)
+        elif kind == _JSON_TUPLE and value is not null:
+            self.tuple(node, value, prefix)
+        else:
+            return self.leaf(
+                node.typ.serialize(node, value), prefix, droppable
+            )
+        return True
+
+    def leaf(self, cstruct, prefix, droppable):
+        if cstruct is drop and droppable:
+            return False
+        if type(cstruct) is str:
+            self.parts.append(prefix + _encode_string(cstruct))
+        else:
+            self.parts.append(prefix + _json_encoder.encode(cstruct))
+        return True
+
+    def mapping(self, node, children, value, prefix):
+        typ = node.typ
+        if value is null:
+            value = {}
+        if type(value) is dict:
+            get = value.get
+        else:
+            value, get = typ._reader(node, value, typ.zero_copy)
+        self.parts.append(prefix + '{')
+        separated = 0
+        error = None
+        for num, subnode, name, keys, drops, fast in children:
+            subval = get(name, null)
+            if type(subval) is fast:
+                if fast is str:
+                    text = _encode_string(subval)
+                else:
+                    text = '"' + repr(subval) + '"'
+                self.parts.append(keys[separated] + text)
+                separated = 1
+                continue
+            if subval is drop or (subval is null and drops):
+                continue
+            try:
+                if self.write(subnode, subval, keys[separated]):
+                    separated = 1
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(node)
+                error.add(e, num)
+        if typ.unknown != 'ignore':
+            unknown = typ._unknown_items(node, value)
+            if typ.unknown == 'raise':
+                if unknown:
+                    raise typ._unsupported(node, unknown)
+            elif unknown:
+                text = _json_encoder.encode(unknown)[1:-1]
+                self.parts.append(', ' + text if separated else text)
+        self.parts.append('}')
+        if error is not None:
+            raise error
+
+    def sequence(self, node, value, prefix):
+        typ = node.typ
+        value = typ._validate(node, value, typ.accept_scalar)
+        self.parts.append(prefix + '[')
+        subnode = node.children[0]
+        drops = getattr(subnode, 'default', None) is drop
+        separator = ''
+        error = None
+        for num, subval in enumerate(value):
+            if subval is drop or (subval is null and drops):
+                continue
+            try:
+                if self.write(subnode, subval, separator):
+                    separator = ', '
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(node)
+                error.add(e, num)
+            self.count += 1
+            if self.count >= self.chunk_size and self.fp is not None:
+                self.flush()
+        self.parts.append(']')
+        if error is not None:
+            raise error
+
+    def tuple(self, node, value, prefix):
+        value = node.typ._validate(node, value)
+        self.parts.append(prefix + '[')
+        separator = ''
+        error = None
+        for num, subnode in enumerate(node.children):
+            try:
+                self.write(subnode, value[num], separator, False)
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(node)
+                error.add(e, num)
+            separator = ', '
+        self.parts.append(']')
+        if error is not None:
+            raise error
+
+    def flush(self):
+        if self.parts:
+            self.fp.write(''.join(self.parts))
+            self.parts.clear()
+        self.count = 0
+
+
+class _LazyContainer:
+    def __init__(self, node, cstruct, parent, pos):
+        self.node = node
+        self._cstruct = cstruct
+        self._parent = parent
+        self._pos = pos
+        self._values = {}
+
+    def _reroot(self, exc):
+        # wrap ``exc``, an error of this container, in the errors of the
+        # containers it was lazily deserialized from
+        proxy = self
+        while proxy._parent is not None:
+            error = Invalid(proxy._parent.node)
+            error.add(exc, proxy._pos)
+            exc = error
+            proxy = proxy._parent
+        return exc
+
+    def _child(self, subnode, subcstruct, pos):
+        try:
+            return _deserialize_lazy(subnode, subcstruct, self, pos)
+        except Invalid as e:
+            error = Invalid(self.node)
+            error.add(e, pos)
+            raise self._reroot(error)
+
+    def validate(self):
+        """Deserialize and validate the whole value, including the
+        children which have not been accessed, and return it as a regular
+        :term:`appstruct`.  Raises :exc:`colander.Invalid` on failure."""
+        try:
+            return self._deserialize()
+        except Invalid as e:
+            raise self._reroot(e)
+
+
+class LazyMapping(_LazyContainer, collections.abc.Mapping):
+    """A read-only mapping returned by
+    :meth:`colander.SchemaNode.deserialize_lazy` for mapping nodes; see
+    the documentation of that method."""
+
+    def __init__(self, node, cstruct, parent=None, pos=None):
+        super().__init__(node, cstruct, parent, pos)
+        typ = node.typ
+        value = typ._validate(node, cstruct)
+        error = None
+        # the names of the present children, in order, and the
+        # (position, node, cstruct) of those not deserialized yet
+        self._names = []
+        self._pending = {}
+        for num, subnode in enumerate(node.children):
+            name = subnode.name
+            subval = value.pop(name, null)
+            if subval is drop or (subval is null and subnode.missing is drop):
+                continue
+            if subval is null:
+                # an absent key is cheap to handle and may be required
+                try:
+                    self._values[name] = subnode.deserialize(null)
+                except Invalid as e:
+                    if error is None:
+                        error = Invalid(node)
+                    error.add(e, num)
+            else:
+                self._pending[name] = (num, subnode, subval)
+            self._names.append(name)
+
+        if typ.unknown == 'raise':
+            if value:
+                raise typ._unsupported(node, value)
+
+        elif typ.unknown == 'preserve':
+            self._values.update(typ._preserve(value))
+            self._names.extend(value)
+
+        if error is not None:
+            raise error
+
+    def _load(self, name):
+        num, subnode, subval = self._pending[name]
+        value = self._child(subnode, subval, num)
+        del self._pending[name]
+        if value is drop:
+            self._names.remove(name)
+        else:
+            self._values[name] = value
+
+    def _load_droppable(self):
+        # children with a ``missing`` value of ``drop`` may vanish once
+        # deserialized, the keys are only known after loading them
+        for name, (_, subnode, _) in list(self._pending.items()):
+            if subnode.missing is drop:
+                self._load(name)
+
+    def __getitem__(self, name):
+        if name in self._pending:
+            self._load(name)
+        return self._values[name]
+
+    def __contains__(self, name):
+        pending = self._pending.get(name)
+        if pending is not None and pending[1].missing is drop:
+            self._load(name)
+        return name in self._values or name in self._pending
+
+    def __iter__(self):
+        self._load_droppable()
+        return iter(list(self._names))
+
+    def __len__(self):
+        self._load_droppable()
+        return len(self._names)
+
+    def _deserialize(self):
+        def callback(subnode, subcstruct):
+            if subnode.name in self._values:
+                return _force(self._values[subnode.name])
+            return subnode.deserialize(subcstruct)
+
+        node = self.node
+        appstruct = node.typ._impl(node, self._cstruct, callback, 'missing')
+        node._run_validator(appstruct)
+        return appstruct
+
+
+class LazySequence(_LazyContainer, collections.abc.Sequence):
+    """A read-only sequence returned by
+    :meth:`colander.SchemaNode.deserialize_lazy` for sequence nodes; see
+    the documentation of that method."""
+
+    def __init__(self, node, cstruct, parent=None, pos=None):
+        super().__init__(node, cstruct, parent, pos)
+        typ = node.typ
+        subnode = self._subnode = node.children[0]
+        # the (position, cstruct) of the items which are not dropped
+        self._items = [
+            (num, subval)
+            for num, subval in enumerate(
+                typ._validate(node, cstruct, typ.accept_scalar)
+            )
+            if not (
+                subval is drop or (subval is null and subnode.missing is drop)
+            )
+        ]
+        if subnode.missing is drop:
+            # items which deserialize to ``drop`` shift the following
+            # ones, the positions are only known after loading them all
+            self._load_all()
+
+    def _load_all(self):
+        error = None
+        items = []
+        for num, subval in self._items:
+            try:
+                value = _deserialize_lazy(self._subnode, subval, self, num)
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(self.node)
+                error.add(e, num)
+            else:
+                if value is not drop:
+                    self._values[len(items)] = value
+                    items.append((num, subval))
+        if error is not None:
+            raise error
+        self._items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._items)
+        if index not in self._values:
+            num, subval = self._items[index]
+            self._values[index] = self._child(self._subnode, subval, num)
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, LazySequence)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def _deserialize(self):
+        error = None
+        result = []
+        for index, (num, subval) in enumerate(self._items):
+            try:
+                if index in self._values:
+                    value = _force(self._values[index])
+                else:
+                    value = self._subnode.deserialize(subval)
+            except Invalid as e:
+                if error is None:
+                    error = Invalid(self.node)
+                error.add(e, num)
+            else:
+                result.append(value)
+        if error is not None:
+            raise error
+        self.node._run_validator(result)
+        return result
+
+
 class instantiate:
     """
     A decorator which can be used to instantiate :class:`SchemaNode`
@@ -0,0 +1,480 @@
+"""Column by column deserialization of sequences of homogeneous mappings."""
+
+import array
+import functools
+from iso8601 import iso8601
+import itertools
+import operator
+
+from colander import (
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    Invalid,
+    Mapping,
+    OneOf,
+    Range,
+    Sequence,
+    String,
+    _SchemaNode,
+    drop,
+    null,
+)
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+# integers in this range are represented exactly by a float
+_FLOAT_EXACT = 2**53
+
+
+def deserialize(schema, cstruct, output='rows', use_numpy=None):
+    """Deserialize ``cstruct`` with ``schema``, a node of type
+    :class:`colander.Sequence` whose item is a node of type
+    :class:`colander.Mapping`, converting the values of each field of the
+    items in one bulk operation instead of one item at a time.
+
+    The result and the errors are the same as those of
+    ``schema.deserialize(cstruct)``: if any value is invalid, a
+    :exc:`colander.Invalid` with the same paths is raised.  Fields of type
+    :class:`colander.Integer`, :class:`colander.Float`,
+    :class:`colander.Boolean`, :class:`colander.String` and
+    :class:`colander.DateTime` are converted in bulk and their
+    :class:`colander.Range` and :class:`colander.OneOf` validators are
+    applied as masks, only the values they reject being validated again to
+    build the error messages.  The values of other fields, and the values
+    of a field which cannot be converted in bulk, are deserialized one by
+    one by their node.  Items which are not dictionaries are deserialized
+    by the item node.  Schemas which cannot be processed by columns, for
+    instance because of preparers or of an item mapping with an
+    ``unknown`` attribute other than ``ignore``, are deserialized by
+    ``schema.deserialize``.
+
+    If ``output`` is ``rows`` (the default), the result is the usual list
+    of dictionaries.  If it is ``columns``, the result is a dictionary
+    mapping the name of each field to the list of its values, one per
+    item; fields which are absent from an item have the value
+    :attr:`colander.drop`.  Complete columns of integers and floats are
+    returned as arrays instead: NumPy arrays when NumPy is installed and
+    ``use_numpy`` is not false, :class:`array.array` instances otherwise;
+    with NumPy, complete boolean columns are returned as arrays too.  A
+    result of ``schema.deserialize`` which is not a list, such as the
+    ``missing`` value of the sequence node, is returned unchanged.
+    """
+    if output not in ('rows', 'columns'):
+        raise ValueError('output must be one of "rows" or "columns"')
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if cstruct is null or not _is_columnar(schema):
+        result = schema.deserialize(cstruct)
+        if output == 'rows' or not isinstance(result, list):
+            return result
+        return _transpose(schema.children[0], result, use_numpy)
+    return _Columns(schema, cstruct, use_numpy).deserialize(output)
+
+
+def _is_plain(node, deserialize):
+    # ``node`` behaves exactly like its type's ``deserialize`` method
+    return (
+        type(node).deserialize is _SchemaNode.deserialize
+        and type(node.typ).deserialize is deserialize
+        and node.preparer is None
+    )
+
+
+def _is_columnar(schema):
+    if not _is_plain(schema, Sequence.deserialize):
+        return False
+    item = schema.children[0]
+    return (
+        _is_plain(item, Mapping.deserialize) and item.typ.unknown == 'ignore'
+    )
+
+
+class _Columns:
+    def __init__(self, schema, cstruct, use_numpy):
+        self.schema = schema
+        self.item = schema.children[0]
+        self.cstruct = cstruct
+        self.use_numpy = use_numpy
+
+    def deserialize(self, output):
+        schema, item = self.schema, self.item
+        typ = schema.typ
+        items = typ._validate(schema, self.cstruct, typ.accept_scalar)
+
+        # the positions of the items deserialized by column and, unless
+        # they all are, the (position, appstruct) of the items deserialized
+        # by the item node or None for each item of the result
+        errors = {}
+        if set(map(type, items)) <= {dict}:
+            positions = range(len(items))
+            rows = items
+            others = None
+        else:
+            positions, rows, others = self._split(items, errors)
+
+        names = []
+        columns = []
+        field_errors = {}
+        for fpos, field in enumerate(item.children):
+            name = field.name
+            cells = list(map(operator.methodcaller('get', name, null), rows))
+            values, failures = _column(field, cells, self.use_numpy)
+            names.append(name)
+            columns.append(values)
+            for index, exc in failures.items():
+                field_errors.setdefault(index, []).append((fpos, exc))
+
+        for index, excs in field_errors.items():
+            error = Invalid(item)
+            for fpos, exc in excs:
+                error.add(exc, fpos)
+            errors[positions[index]] = error
+
+        result = None
+        if item.validator is not None or output == 'rows':
+            result = self._rows(names, columns, others, len(rows))
+            if item.validator is not None:
+                self._validate_rows(
+                    result, others, positions, field_errors, errors
+                )
+
+        if errors:
+            error = Invalid(schema)
+            for num in sorted(errors):
+                error.add(errors[num], num)
+            raise error
+
+        if output == 'rows':
+            schema._run_validator(result)
+            return result
+        if schema.validator is not None:
+            if result is None:
+                result = self._rows(names, columns, others, len(rows))
+            schema._run_validator(result)
+        return _merge(item, names, columns, others, self.use_numpy)
+
+    def _split(self, items, errors):
+        positions = []
+        rows = []
+        others = []
+        item = self.item
+        item_missing = item.missing
+        for num, subval in enumerate(items):
+            if subval is drop or (subval is null and item_missing is drop):
+                continue
+            if type(subval) is dict:
+                positions.append(num)
+                rows.append(subval)
+                others.append(None)
+                continue
+            try:
+                value = item.deserialize(subval)
+            except Invalid as e:
+                errors[num] = e
+            else:
+                if value is not drop:
+                    others.append((num, value))
+        if len(rows) == len(others):
+            others = None
+        return positions, rows, others
+
+    def _rows(self, names, columns, others, count):
+        if not names:
+            rows = ({} for index in range(count))
+        elif all(drop not in values for values in columns):
+            rows = map(dict, map(zip, itertools.repeat(names), zip(*columns)))
+        else:
+            rows = (
+                {
+                    name: value
+                    for name, value in zip(names, values)
+                    if value is not drop
+                }
+                for values in zip(*columns)
+            )
+        if others is None:
+            return list(rows)
+        return [next(rows) if other is None else other[1] for other in others]
+
+    def _validate_rows(self, result, others, positions, field_errors, errors):
+        item = self.item
+        index = 0
+        for row, other in zip(result, others or itertools.repeat(None)):
+            if other is not None:
+                continue
+            if index not in field_errors:
+                try:
+                    item._run_validator(row)
+                except Invalid as e:
+                    errors[positions[index]] = e
+            index += 1
+
+
+def _column(node, cells, use_numpy):
+    # deserialize the ``cells`` of a field; returns the list of values,
+    # ``drop`` standing for values which are absent from the result, and a
+    # dictionary of the errors keyed by index
+    errors = {}
+    if _contains(cells, null) or _contains(cells, drop):
+        values = [drop] * len(cells)
+        present = []
+        missing = node.missing
+        for index, cell in enumerate(cells):
+            if cell is not null and cell is not drop:
+                present.append(index)
+            elif cell is not drop and missing is not drop:
+                _deserialize_cell(node, cell, index, values, errors)
+        cells = [cells[index] for index in present]
+    else:
+        values = None
+        present = range(len(cells))
+
+    converted = None
+    convert = _converter(node)
+    if convert is not None:
+        try:
+            converted = convert(cells)
+        except Exception:
+            pass
+    if converted is None:
+        if values is None:
+            values = [drop] * len(cells)
+        for index, cell in zip(present, cells):
+            _deserialize_cell(node, cell, index, values, errors)
+        return values, errors
+
+    if values is None:
+        values = converted
+    else:
+        for index, value in zip(present, converted):
+            values[index] = value
+    validator = node.validator
+    if validator is not None:
+        numeric = type(node.typ) in (Integer, Float)
+        for candidate in _failures(validator, converted, numeric, use_numpy):
+            index = present[candidate]
+            try:
+                node._run_validator(converted[candidate])
+            except Invalid as e:
+                errors[index] = e
+    return values, errors
+
+
+def _contains(cells, marker):
+    return any(map(operator.is_, cells, itertools.repeat(marker)))
+
+
+def _deserialize_cell(node, cell, index, values, errors):
+    try:
+        value = node.deserialize(cell)
+    except Invalid as e:
+        errors[index] = e
+    else:
+        values[index] = value
+
+
+def _converter(node):
+    # a function converting a list of cells exactly like the ``deserialize``
+    # method of the type of ``node`` would convert each of them, raising
+    # an exception if any of them would not be converted to a value
+    if type(node).deserialize is not _SchemaNode.deserialize or (
+        node.preparer is not None
+    ):
+        return None
+    typ = node.typ
+    kind = type(typ)
+    if kind is Integer and typ.num is int:
+        return _convert_int
+    if kind is Float:
+        return _convert_float
+    if kind is Boolean:
+        return functools.partial(
+            _convert_boolean, typ.false_choices, typ.true_choices
+        )
+    if kind is String and typ.encoding is None:
+        return functools.partial(_convert_string, typ.allow_empty)
+    if kind is DateTime and not typ.format:
+        return functools.partial(
+            _convert_datetime,
+            functools.partial(
+                iso8601.parse_date, default_timezone=typ.default_tzinfo
+            ),
+        )
+    return None
+
+
+def _convert_int(cells):
+    # ``int`` raises for each of the false values other than zero, which
+    # ``Integer`` deserializes to ``null``
+    return list(map(int, cells))
+
+
+def _convert_float(cells):
+    return list(map(float, cells))
+
+
+def _convert_boolean(false_choices, true_choices, cells):
+    lowered = list(map(str.lower, map(str, cells)))
+    values = [value not in false_choices for value in lowered]
+    if true_choices:
+        for value, result in zip(lowered, values):
+            if result and value not in true_choices:
+                raise ValueError(value)
+    return values
+
+
+def _convert_string(allow_empty, cells):
+    if not all(map(isinstance, cells, itertools.repeat(str))):
+        raise TypeError('not a string')
+    if not allow_empty and not all(cells):
+        raise ValueError('empty string')
+    return cells
+
+
+def _convert_datetime(parse, cells):
+    if not all(cells):
+        raise ValueError('empty value')
+    return list(map(parse, cells))
+
+
+def _failures(validator, values, numeric, use_numpy):
+    # the indexes of the ``values`` which may be rejected by ``validator``;
+    # Range and OneOf are applied as masks, other validators have to be
+    # called for each value
+    kind = type(validator)
+    try:
+        if kind is Range:
+            return _range_failures(validator, values, numeric, use_numpy)
+        if kind is OneOf:
+            return _oneof_failures(validator, values, numeric, use_numpy)
+    except Exception:
+        pass
+    return range(len(values))
+
+
+def _range_failures(validator, values, numeric, use_numpy):
+    low, high = validator.min, validator.max
+    if not values:
+        return []
+    if numeric and use_numpy:
+        arr = _as_array(values)
+        if arr is not None and all(
+            bound is None or _exact_bound(arr, bound) for bound in (low, high)
+        ):
+            mask = numpy.zeros(len(values), dtype=bool)
+            if low is not None:
+                mask |= arr < low
+            if high is not None:
+                mask |= arr > high
+            return numpy.flatnonzero(mask).tolist()
+    # numbers are totally ordered: a column whose extremes are in range
+    # has no value out of range
+    if (
+        numeric
+        and (low is None or min(values) >= low)
+        and (high is None or max(values) <= high)
+    ):
+        return []
+    return [
+        index
+        for index, value in enumerate(values)
+        if (low is not None and value < low)
+        or (high is not None and value > high)
+    ]
+
+
+def _oneof_failures(validator, values, numeric, use_numpy):
+    choices = validator.choices
+    if numeric and use_numpy:
+        arr = _as_array(values)
+        if arr is not None and all(
+            _exact_bound(arr, choice) for choice in choices
+        ):
+            mask = numpy.isin(arr, list(choices), invert=True)
+            return numpy.flatnonzero(mask).tolist()
+    # a value found in the set is equal to one of the choices, others are
+    # checked again by the validator itself
+    choices = set(choices)
+    return [
+        index for index, value in enumerate(values) if value not in choices
+    ]
+
+
+def _as_array(values):
+    kinds = set(map(type, values))
+    if kinds == {int}:
+        try:
+            return numpy.array(values, dtype=numpy.int64)
+        except OverflowError:
+            return None
+    if kinds == {float}:
+        return numpy.array(values, dtype=numpy.float64)
+    return None
+
+
+def _exact_bound(arr, bound):
+    # comparing ``arr`` with ``bound`` in NumPy gives the same result as
+    # comparing each of its values in Python
+    if arr.dtype == numpy.int64:
+        return type(bound) is int and _INT64_MIN <= bound <= _INT64_MAX
+    if type(bound) is float:
+        return True
+    return type(bound) is int and -_FLOAT_EXACT <= bound <= _FLOAT_EXACT
+
+
+def _merge(item, names, columns, others, use_numpy):
+    if others is not None:
+        # interleave the rows deserialized by the item node
+        merged = [[] for name in names]
+        rows = iter(zip(*columns))
+        for other in others:
+            if other is None:
+                cells = next(rows)
+            elif isinstance(other[1], dict):
+                cells = [other[1].get(name, drop) for name in names]
+            else:
+                cells = [drop] * len(names)
+            for column, cell in zip(merged, cells):
+                column.append(cell)
+        columns = merged
+    return {
+        name: _as_column(field, values, use_numpy)
+        for name, field, values in zip(names, item.children, columns)
+    }
+
+
+def _transpose(item, rows, use_numpy):
+    names = [field.name for field in item.children]
+    columns = [[] for name in names]
+    return _merge(
+        item, names, columns, [(None, row) for row in rows], use_numpy
+    )
+
+
+def _as_column(node, values, use_numpy):
+    kind = type(node.typ)
+    if kind not in (Integer, Float, Boolean):
+        return values
+    expected = {Integer: int, Float: float, Boolean: bool}[kind]
+    if set(map(type, values)) - {expected}:
+        return values
+    try:
+        if use_numpy:
+            dtype = {
+                Integer: numpy.int64,
+                Float: numpy.float64,
+                Boolean: numpy.bool_,
+            }[kind]
+            return numpy.array(values, dtype=dtype)
+        if kind is Boolean:
+            return values
+        return array.array('q' if kind is Integer else 'd', values)
+    except OverflowError:
+        return values
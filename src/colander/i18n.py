@@ -0,0 +1,134 @@
+"""Cached translation of error messages."""
+
+import functools
+import gettext
+import os
+import translationstring
+
+LOCALE_DIR = os.path.join(os.path.dirname(__file__), 'locale')
+
+
+def load_catalogs(localedir=LOCALE_DIR, domain='colander', locales=None):
+    """Read the compiled ``.mo`` message catalogs of ``domain`` found in
+    ``localedir``, by default those of Colander's own error messages, and
+    return a dictionary mapping each locale name to a dictionary mapping
+    each message identifier to its translation.
+
+    ``locales`` is the list of the locales to read; by default, every
+    locale of ``localedir`` which has a catalog for ``domain`` is read.
+    The files are only read here, so that looking up a translation later
+    is a dictionary lookup.  Catalogs may be merged with the catalogs of
+    other domains, e.g. those of the messages of an application's own
+    validators, before being passed to :class:`colander.i18n.Translator`.
+    """
+    filename = domain + '.mo'
+    if locales is None:
+        locales = sorted(
+            name
+            for name in os.listdir(localedir)
+            if os.path.isfile(
+                os.path.join(localedir, name, 'LC_MESSAGES', filename)
+            )
+        )
+    catalogs = {}
+    for locale in locales:
+        path = os.path.join(localedir, locale, 'LC_MESSAGES', filename)
+        with open(path, 'rb') as fp:
+            translations = gettext.GNUTranslations(fp)
+        # plural forms have tuple keys, and the metadata an empty msgid
+        catalogs[locale] = {
+            msgid: msgstr
+            for msgid, msgstr in translations._catalog.items()
+            if isinstance(msgid, str) and msgid and msgstr
+        }
+    return catalogs
+
+
+class Translator:
+    """Translate and interpolate messages, such as the error messages of
+    :exc:`colander.Invalid`, to the locales of ``catalogs``, a dictionary
+    like the one returned by :func:`colander.i18n.load_catalogs`, which is
+    called when ``catalogs`` is ``None``.
+
+    A message is looked up like :class:`translationstring.Translator`
+    does with :func:`translationstring.ugettext_policy`, regardless of its
+    domain: the translation of its identifier (prefixed by its context,
+    if any) is used if there is one, and its default otherwise, and is
+    then interpolated with its mapping.  The results are kept in a
+    least-recently-used cache of ``maxsize`` entries keyed by locale,
+    message and replacement values, so translating a message already seen
+    with the same values costs a dictionary lookup.  Messages whose
+    replacement values are not hashable are not cached.
+    """
+
+    def __init__(self, catalogs=None, maxsize=1024):
+        if catalogs is None:
+            catalogs = load_catalogs()
+        self.catalogs = catalogs
+        self._render = functools.lru_cache(maxsize)(self._render)
+        self._translates = {}
+
+    def translate(self, msg, locale):
+        """Return the string ``msg`` translated to ``locale`` and
+        interpolated.  A locale without a catalog leaves the messages
+        untranslated."""
+        return self.for_locale(locale)(msg)
+
+    def for_locale(self, locale):
+        """Return a function translating a message to ``locale``, to be
+        passed as the ``translate`` argument of
+        :meth:`colander.Invalid.asdict` or
+        :meth:`colander.ErrorCollector.messages`.  The same function is
+        returned for the same locale."""
+        translate = self._translates.get(locale)
+        if translate is None:
+            translate = self._translates[locale] = self._translate(locale)
+        return translate
+
+    def _translate(self, locale):
+        render = self._render
+
+        def translate(msg):
+            try:
+                mapping = msg.mapping
+            except AttributeError:
+                # a plain string
+                return render(locale, msg, msg, None, None)
+            if mapping:
+                # the types tell apart the values which are equal but are
+                # rendered differently, e.g. 1, 1.0 and True
+                items = [(k, type(v), v) for k, v in mapping.items()]
+                try:
+                    mapping = frozenset(items)
+                except TypeError:
+                    # unhashable replacement values
+                    return render.__wrapped__(
+                        locale, msg, msg.default, msg.context, items
+                    )
+            return render(locale, msg, msg.default, msg.context, mapping)
+
+        return translate
+
+    def cache_info(self):
+        """Return the statistics of the cache of the translated messages,
+        as :func:`functools.lru_cache` reports them."""
+        return self._render.cache_info()
+
+    def cache_clear(self):
+        """Empty the cache of the translated messages, e.g. after
+        modifying the catalogs."""
+        self._render.cache_clear()
+
+    def _render(self, locale, msgid, default, context, mapping):
+        catalog = self.catalogs.get(locale)
+        translated = None
+        if catalog is not None:
+            key = f'{context}\x04{msgid}' if context else msgid
+            translated = catalog.get(key)
+        if translated is None or translated == msgid:
+            translated = default
+        if mapping and '$' in translated:
+            translated = translationstring.TranslationString(
+                translated, mapping={k: v for k, _type, v in mapping}
+            ).interpolate()
+        return str(translated)
@@ -0,0 +1,264 @@
+"""Deserialization of mappings into objects rather than dictionaries."""
+
+import collections
+import functools
+
+from colander import Invalid, Mapping, SchemaType, _, null
+
+
+class Record:
+    """Base class of the classes returned by
+    :func:`colander.objects.record_class`.
+
+    Its constructor sets an attribute for each keyword argument.  Records
+    of the same class are equal when their attributes are; an attribute
+    which was never set is :attr:`colander.null`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **kw):
+        for name, value in kw.items():
+            setattr(self, name, value)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name, null) == getattr(other, name, null)
+            for name in self.__slots__
+        )
+
+    def __repr__(self):
+        values = ', '.join(
+            f'{name}={getattr(self, name)!r}'
+            for name in self.__slots__
+            if hasattr(self, name)
+        )
+        return f'{type(self).__name__}({values})'
+
+
+def record_class(node, name=None):
+    """Return a new subclass of :class:`colander.objects.Record` with a
+    slot for each child of ``node``, a mapping node, whose names must be
+    valid identifiers.  Its instances do not have a ``__dict__``, so they
+    use less memory than the dictionaries returned by
+    :class:`colander.Mapping`.
+
+    ``name`` is the name of the class; by default it is the name of the
+    class of ``node``, or ``Record`` for the node classes of Colander.
+    """
+    slots = tuple(subnode.name for subnode in node.children)
+    return type(_class_name(node, name), (Record,), {'__slots__': slots})
+
+
+def namedtuple_class(node, name=None):
+    """Return a new :func:`collections.namedtuple` class with a field for
+    each child of ``node``, a mapping node, in the order of the children.
+    The fields which are not passed to its constructor are
+    :attr:`colander.null`.
+
+    ``name`` is the name of the class, by default chosen like
+    :func:`colander.objects.record_class` does.
+    """
+    fields = [subnode.name for subnode in node.children]
+    return collections.namedtuple(
+        _class_name(node, name), fields, defaults=(null,) * len(fields)
+    )
+
+
+def _class_name(node, name):
+    if name is None:
+        cls = type(node)
+        name = 'Record' if cls.__module__ == 'colander' else cls.__name__
+    return name
+
+
+def _tuple_factory(node):
+    names = [subnode.name for subnode in node.children]
+
+    def factory(**kw):
+        return tuple([kw.get(name, null) for name in names])
+
+    return factory
+
+
+_RECORD_FACTORIES = {
+    'slots': record_class,
+    'namedtuple': namedtuple_class,
+    'tuple': _tuple_factory,
+}
+
+
+class Object(Mapping):
+    """A type which represents a mapping of names to nodes like
+    :class:`colander.Mapping`, but whose :term:`appstruct` is an object
+    built directly from the deserialized values of the children, instead
+    of a dictionary.
+
+    The constructor accepts the arguments of :class:`colander.Mapping`,
+    and ``factory`` and ``record_mode``, available as attributes of the
+    same name as well.
+
+    factory
+        The callable building the object, called with the value of each
+        child as a keyword argument, e.g. a dataclass.  The values of the
+        children dropped because of :attr:`colander.drop` are not passed,
+        and when ``unknown`` is ``preserve``, the unknown keys are passed
+        as well.  If ``factory`` is ``None``, a record generated from the
+        children of the node according to ``record_mode`` is built; it
+        has no room for unknown keys, so ``unknown`` cannot be
+        ``preserve`` without a factory.
+
+        Default: ``None``.
+
+    record_mode
+        The kind of the records built when ``factory`` is ``None``:
+
+        - ``slots`` builds the instances of a class with slots created by
+          :func:`colander.objects.record_class`.
+
+        - ``namedtuple`` builds the instances of a class created by
+          :func:`colander.objects.namedtuple_class`.
+
+        - ``tuple`` builds plain tuples of the values of the children, in
+          the order of the children.
+
+        In the last two modes, the values of the dropped children are
+        :attr:`colander.null`.
+
+        Default: ``slots``.
+
+    Serialization reads the values of the children from the attributes
+    of the appstruct, e.g. a dataclass, a named tuple or the row of an
+    ORM, without copying them to a dictionary; an attribute which does
+    not exist is a missing value.  A plain tuple holds the values of the
+    children in their order, like the records of the ``tuple`` mode.
+    Mappings are read like :class:`colander.Mapping` reads them.  The
+    :term:`cstruct` is a dictionary.
+    """
+
+    # checked by _check_unknown while the constructor sets the attributes
+    _unknown = 'ignore'
+
+    def __init__(
+        self,
+        factory=None,
+        unknown='ignore',
+        zero_copy=False,
+        preserve_copy='deep',
+        record_mode='slots',
+    ):
+        self.factory = factory
+        self.record_mode = record_mode
+        self._records = {}
+        super().__init__(unknown, zero_copy, preserve_copy)
+
+    def _check_unknown(self, unknown, factory):
+        # the generated records only have a field for each child
+        if unknown == 'preserve' and factory is None:
+            raise ValueError(
+                'unknown attribute cannot be "preserve" when factory is None'
+            )
+
+    def _set_unknown(self, value):
+        self._check_unknown(value, self.factory)
+        Mapping._set_unknown(self, value)
+
+    unknown = property(Mapping._get_unknown, _set_unknown)
+
+    def _set_factory(self, value):
+        self._check_unknown(self.unknown, value)
+        self._factory = value
+
+    def _get_factory(self):
+        return self._factory
+
+    factory = property(_get_factory, _set_factory)
+
+    def _set_record_mode(self, value):
+        if value not in _RECORD_FACTORIES:
+            raise ValueError(
+                'record_mode attribute must be one of "slots", '
+                '"namedtuple", or "tuple"'
+            )
+        self._record_mode = value
+
+    def _get_record_mode(self):
+        return self._record_mode
+
+    record_mode = property(_get_record_mode, _set_record_mode)
+
+    def _reader(self, node, value, in_place):
+        if type(value) is tuple:
+            # positional, like the records of the tuple mode
+            names = [subnode.name for subnode in node.children]
+            if len(value) != len(names):
+                raise Invalid(
+                    node,
+                    _(
+                        '"${val}" has an incorrect number of elements '
+                        '(expected ${exp}, was ${was})',
+                        mapping={
+                            'val': value,
+                            'exp': len(names),
+                            'was': len(value),
+                        },
+                    ),
+                )
+            value = dict(zip(names, value))
+            return value, value.get
+        if hasattr(value, 'items') or not (
+            hasattr(value, '__dict__') or hasattr(value, '__slots__')
+        ):
+            return super()._reader(node, value, in_place)
+        # an object: no copy and no unknown items
+        return {}, functools.partial(getattr, value)
+
+    def _build(self, node, result):
+        factory = self.factory
+        if factory is None:
+            key = (self.record_mode,) + tuple(
+                subnode.name for subnode in node.children
+            )
+            factory = self._records.get(key)
+            if factory is None:
+                make = _RECORD_FACTORIES[self.record_mode]
+                factory = self._records[key] = make(node)
+        return factory(**result)
+
+    def deserialize(self, node, cstruct):
+        result = super().deserialize(node, cstruct)
+        if result is null:
+            return null
+        return self._build(node, result)
+
+    def _fast(self):
+        # whether the fast paths of Mapping apply to this type
+        cls = type(self)
+        return (
+            cls.serialize is Mapping.serialize
+            and cls.deserialize is Object.deserialize
+            and cls._impl is Mapping._impl
+        )
+
+    def _try_deserialize(self, node, cstruct):
+        if cstruct is null or not self._fast():
+            return SchemaType._try_deserialize(self, node, cstruct)
+        result, error = self._try_deserialize_items(node, cstruct)
+        if error is not None:
+            return null, error
+        return self._build(node, result), None
+
+    def _try_validate(self, node, cstruct):
+        if not self._fast():
+            return SchemaType._try_validate(self, node, cstruct)
+        return self._try_validate_items(node, cstruct)
+
+    def _check_appstruct(self, node, appstruct):
+        if not self._fast():
+            return SchemaType._check_appstruct(self, node, appstruct)
+        result, error = self._check_items(node, appstruct)
+        if error is not None:
+            return null, error
+        return self._build(node, result), None
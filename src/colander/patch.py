@@ -0,0 +1,516 @@
+"""Schema-aware application of JSON Patch (RFC 6902) documents."""
+
+import copy
+
+from colander import (
+    Invalid,
+    Map,
+    Mapping,
+    Positional,
+    Sequence,
+    Tuple,
+    UnboundDeferredError,
+    deferred,
+    drop,
+    null,
+)
+
+
+class PatchError(ValueError):
+    """Raised by :func:`colander.patch.apply_patch` when an operation
+    cannot be applied: the operation is malformed, its path does not exist
+    in the document or cannot be changed in the requested way, or a
+    ``test`` operation fails."""
+
+
+def parse_pointer(pointer):
+    """Split the JSON Pointer (RFC 6901) ``pointer`` into a list of
+    unescaped reference tokens.  The empty string refers to the whole
+    document and results in an empty list."""
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError('Invalid JSON pointer "%s"' % pointer)
+    return [
+        token.replace('~1', '/').replace('~0', '~')
+        for token in pointer[1:].split('/')
+    ]
+
+
+def apply_patch(schema, appstruct, patch):
+    """Apply the JSON Patch ``patch`` (a sequence of operation
+    dictionaries) to ``appstruct``, which must be a valid :term:`appstruct`
+    for ``schema``, and return the patched appstruct.
+
+    The schema is used to navigate the document: paths address the items
+    of :class:`colander.Mapping` and :class:`colander.Tuple` nodes by name
+    and the items of :class:`colander.Sequence` nodes by position, ``-``
+    denoting the end of a sequence.  The ``value`` of ``add``, ``replace``
+    and ``test`` operations is a :term:`cstruct` which is deserialized by
+    the node it is stored in.  Values moved or copied to a location
+    described by a different node are converted by serializing them with
+    their source node and deserializing them with their target node.
+    Removing a mapping item behaves like deserializing a missing value: it
+    fails for required nodes and replaces the item by the ``missing`` value
+    of the node unless that value is :attr:`colander.drop`.  The elements of a
+    tuple cannot be removed, adding one replaces it.
+
+    Validation is incremental: only the values introduced by the patch
+    are deserialized, and only the validators of their ancestors are run
+    again once all operations have been applied.
+
+    ``appstruct`` itself is not modified; each container along the
+    changed paths is copied at most once.  If an operation fails a
+    :exc:`colander.patch.PatchError` is raised; if a value or an ancestor
+    fails validation a :exc:`colander.Invalid` rooted at ``schema`` is
+    raised.  In both cases the patch is not applied at all.
+    """
+    document = _Document(schema, appstruct)
+    for operation in patch:
+        document.apply(operation)
+    return document.finish()
+
+
+def deserialize_patch(schema, appstruct, delta):
+    """Apply the partial update ``delta``, a dictionary mapping dotted name
+    paths to :term:`cstruct` values, to ``appstruct`` and return a tuple
+    ``(appstruct, error)``, like :meth:`colander.SchemaNode.deserialize_patch`
+    called on ``schema`` does."""
+    error = Invalid(schema)
+    updates = []
+    removals = []
+    failed = []
+    for path in sorted(delta):
+        steps = _resolve_path(schema, path.split('.'))
+        subnode = steps[-1][2]
+        try:
+            value = subnode.deserialize(delta[path])
+        except Invalid as e:
+            _add_error(error, steps, e)
+            failed.append(steps)
+            continue
+        if value is drop:
+            removals.append((path, steps, _remove))
+        else:
+            updates.append((path, steps, _setter(value)))
+    # the indexes of the paths are those of ``appstruct``: the items are
+    # removed last, the last ones of each sequence first, so that they do
+    # not shift the items named by the other paths
+    removals.sort(key=lambda removal: _removal_order(removal[1]), reverse=True)
+    for path, steps, update in updates + removals:
+        try:
+            appstruct = _update_path(appstruct, steps, update)
+        except IndexError:
+            # beyond the end of a sequence
+            raise KeyError(path)
+    # the validators are run on the items where they are now
+    removed = [steps for _, steps, _ in removals]
+    changed = [
+        _shift_steps(steps, removed) for _, steps, _ in updates + removals
+    ]
+    failed = [_shift_steps(steps, removed) for steps in failed]
+    result = _validate_ancestors(schema, appstruct, changed, failed, error)
+    if result is error and not error.children:
+        return appstruct, None
+    return appstruct, result
+
+
+def _removal_order(steps):
+    # the indexes of the items of sequences along ``steps``
+    return tuple(
+        [
+            pos if isinstance(node.typ, Sequence) else 0
+            for node, _, _, pos in steps
+        ]
+    )
+
+
+def _shift_steps(steps, removed):
+    # the steps of a path once the items named by the ``removed`` steps are
+    # removed: the later items of a sequence move back, and a path below a
+    # removed item is cut at that item
+    result = []
+    for depth, (node, name, subnode, pos) in enumerate(steps):
+        if isinstance(node.typ, Sequence):
+            prefix = steps[:depth]
+            shift = 0
+            for other in removed:
+                if len(other) == depth + 1 and other[:depth] == prefix:
+                    if other[depth][3] == pos:
+                        return result + [steps[depth]]
+                    if other[depth][3] < pos:
+                        shift += 1
+            if shift:
+                pos -= shift
+                name = str(pos)
+        result.append((node, name, subnode, pos))
+    return result
+
+
+class _Document:
+    def __init__(self, schema, root):
+        self.schema = schema
+        self.root = root
+        # the containers copied while applying this patch, by id; they
+        # may be mutated in place
+        self.owned = {}
+        # name tuples of the containers whose validators must be rerun
+        self.dirty = set()
+
+    def apply(self, operation):
+        try:
+            op = operation['op']
+            path = parse_pointer(operation['path'])
+        except (KeyError, TypeError, AttributeError):
+            raise PatchError('Invalid operation %r' % (operation,))
+        if op in ('add', 'replace', 'test'):
+            if 'value' not in operation:
+                raise PatchError('Missing "value" in %r' % (operation,))
+            method = getattr(self, op)
+            method(path, operation['value'])
+        elif op == 'remove':
+            self.remove(path)
+        elif op in ('move', 'copy'):
+            if 'from' not in operation:
+                raise PatchError('Missing "from" in %r' % (operation,))
+            method = getattr(self, op)
+            method(parse_pointer(operation['from']), path)
+        else:
+            raise PatchError('Unknown operation "%s"' % op)
+
+    def add(self, path, cstruct):
+        if not path:
+            self._replace_root(cstruct)
+            return
+        steps, container = self._target(path, adding=True)
+        node = steps[-1][2]
+        value = self._deserialize(node, cstruct, steps)
+        self._insert(steps, container, value)
+
+    def remove(self, path):
+        if not path:
+            raise PatchError('The whole document cannot be removed')
+        steps, container = self._target(path)
+        parent, name, node, pos = steps[-1]
+        if isinstance(parent.typ, Tuple):
+            raise PatchError('Tuple elements cannot be removed')
+        if isinstance(parent.typ, Mapping):
+            value = self._deserialize(node, null, steps)
+            if value is not drop:
+                self._store(steps, value)
+                return
+        self._delete(steps)
+
+    def replace(self, path, cstruct):
+        if not path:
+            self._replace_root(cstruct)
+            return
+        steps, container = self._target(path)
+        value = self._deserialize(steps[-1][2], cstruct, steps)
+        if value is drop and not isinstance(steps[-1][0].typ, Tuple):
+            self._delete(steps)
+        else:
+            self._store(steps, value)
+
+    def move(self, source, path):
+        if path[: len(source)] == source:
+            if path == source:
+                return
+            raise PatchError('A value cannot be moved into itself')
+        value, node = self._source(source)
+        self.remove(source)
+        self._add_value(path, value, node)
+
+    def copy(self, source, path):
+        value, node = self._source(source)
+        self._add_value(path, copy.deepcopy(value), node)
+
+    def test(self, path, cstruct):
+        steps = self._steps(path)
+        node = steps[-1][2] if steps else self.schema
+        expected = self._deserialize(node, cstruct, steps)
+        if self._get(steps, path) != expected:
+            raise PatchError(
+                'Test failed: "%s" is not %r' % (_pointer(path), cstruct)
+            )
+
+    def finish(self):
+        targets = {}
+        for names in self.dirty:
+            targets[names] = _resolve_path(self.schema, names)
+        error = Invalid(self.schema)
+        result = _validate_nodes(self.schema, self.root, targets, set(), error)
+        if result is not error or error.children:
+            raise result
+        return self.root
+
+    def _steps(self, path):
+        try:
+            return _resolve_path(self.schema, path)
+        except KeyError:
+            raise PatchError('Path "%s" does not exist' % _pointer(path))
+
+    def _get(self, steps, path):
+        try:
+            return _get_path(self.root, steps)
+        except (KeyError, IndexError):
+            raise PatchError('Path "%s" does not exist' % _pointer(path))
+
+    def _target(self, path, adding=False):
+        # resolve ``path`` into steps and return them together with the
+        # current value of the container holding its last item
+        parent_steps = self._steps(path[:-1])
+        container = self._get(parent_steps, path[:-1])
+        parent = parent_steps[-1][2] if parent_steps else self.schema
+        name = path[-1]
+        if isinstance(parent.typ, Sequence):
+            size = len(container)
+            if adding and name == '-':
+                name = str(size)
+            if not name.isdecimal() or str(int(name)) != name:
+                raise PatchError('Invalid index in "%s"' % _pointer(path))
+            if int(name) > size or (int(name) == size and not adding):
+                raise PatchError('Index out of range in "%s"' % _pointer(path))
+        elif isinstance(parent.typ, Mapping):
+            if not adding and name not in container:
+                raise PatchError('Path "%s" does not exist' % _pointer(path))
+        return self._steps(path[:-1] + [name]), container
+
+    def _deserialize(self, node, cstruct, steps):
+        try:
+            return node.deserialize(cstruct)
+        except Invalid as e:
+            if not steps:
+                raise
+            error = Invalid(self.schema)
+            _add_error(error, steps, e)
+            raise error
+
+    def _source(self, path):
+        steps = self._steps(path)
+        node = steps[-1][2] if steps else self.schema
+        return self._get(steps, path), node
+
+    def _add_value(self, path, value, source):
+        # add an appstruct of the ``source`` node, converting it when
+        # ``path`` is described by another node
+        if not path:
+            steps, node = [], self.schema
+        else:
+            steps, container = self._target(path, adding=True)
+            node = steps[-1][2]
+        if node is not source:
+            value = self._deserialize(node, source.serialize(value), steps)
+        if not path:
+            self.root = value
+            self.dirty = set()
+        else:
+            self._insert(steps, container, value)
+
+    def _replace_root(self, cstruct):
+        self.root = self._deserialize(self.schema, cstruct, [])
+        self.dirty = set()
+
+    def _insert(self, steps, container, value):
+        parent, name, _, _ = steps[-1]
+        if value is drop and isinstance(parent.typ, Mapping):
+            if name in container:
+                self._delete(steps)
+        elif isinstance(parent.typ, Sequence):
+            if value is drop:
+                return
+            index = int(name)
+            self._shift(steps, index, 1)
+
+            def update(node, container, name):
+                container.insert(index, value)
+                return container
+
+            self._update(steps, update)
+        else:
+            self._store(steps, value)
+
+    def _store(self, steps, value):
+        def update(node, container, name):
+            return node.typ.set_value(node, container, name, value)
+
+        self._forget(steps)
+        self._update(steps, update)
+
+    def _delete(self, steps):
+        parent, name, _, _ = steps[-1]
+        if isinstance(parent.typ, Sequence):
+            self._shift(steps, int(name), -1)
+            key = int(name)
+        else:
+            self._forget(steps)
+            key = name
+
+        def update(node, container, name):
+            del container[key]
+            return container
+
+        self._update(steps, update)
+
+    def _update(self, steps, update):
+        self.root = self._mutate(self.root, steps, 0, update)
+        names = tuple(step[1] for step in steps)
+        for end in range(len(names)):
+            self.dirty.add(names[:end])
+
+    def _mutate(self, container, steps, index, update):
+        node, name, _, _ = steps[index]
+        if id(container) not in self.owned:
+            container = copy.copy(container)
+            self.owned[id(container)] = container
+        if index == len(steps) - 1:
+            return update(node, container, name)
+        child = node.typ.get_value(node, container, name)
+        new_child = self._mutate(child, steps, index + 1, update)
+        if new_child is not child:
+            container = node.typ.set_value(node, container, name, new_child)
+        return container
+
+    def _forget(self, steps):
+        # the value at ``steps`` was replaced by a validated one: pending
+        # validations inside of it are obsolete
+        names = tuple(step[1] for step in steps)
+        size = len(names)
+        self.dirty = {x for x in self.dirty if x[:size] != names}
+
+    def _shift(self, steps, index, delta):
+        # keep the pending validations inside a sequence in sync with the
+        # positions of its items after an insertion or a removal
+        prefix = tuple(step[1] for step in steps[:-1])
+        size = len(prefix)
+        dirty = set()
+        for names in self.dirty:
+            if len(names) > size and names[:size] == prefix:
+                position = int(names[size])
+                if position == index and delta < 0:
+                    continue
+                if position >= index:
+                    after = size + 1
+                    rest = names[after:]
+                    names = prefix + (str(position + delta),) + rest
+            dirty.add(names)
+        self.dirty = dirty
+
+
+def _pointer(path):
+    return ''.join(
+        '/' + name.replace('~', '~0').replace('/', '~1') for name in path
+    )
+
+
+def _resolve_path(node, names):
+    # a list of (node, name, subnode, pos) steps, one per path segment; a
+    # KeyError is raised if the path names no node of the schema
+    steps = []
+    for name in names:
+        try:
+            subnode, pos = node.typ._path_step(node, name)
+        except (AssertionError, ValueError):
+            # below a leaf, or not the index of an item of a sequence
+            raise KeyError(name)
+        steps.append((node, name, subnode, pos))
+        node = subnode
+    return steps
+
+
+def _get_path(appstruct, steps):
+    for node, name, _, _ in steps:
+        appstruct = node.typ.get_value(node, appstruct, name)
+    return appstruct
+
+
+def _update_path(appstruct, steps, update):
+    # copy-on-write: only the containers along ``steps`` are copied, the
+    # innermost copy is handed to ``update(node, container, name)``
+    containers = [appstruct]
+    for node, name, _, _ in steps[:-1]:
+        containers.append(node.typ.get_value(node, containers[-1], name))
+    node, name, _, _ = steps[-1]
+    result = update(node, copy.copy(containers.pop()), name)
+    for node, name, _, _ in reversed(steps[:-1]):
+        container = copy.copy(containers.pop())
+        result = node.typ.set_value(node, container, name, result)
+    return result
+
+
+def _setter(value):
+    def update(node, container, name):
+        return node.typ.set_value(node, container, name, value)
+
+    return update
+
+
+def _remove(node, container, name):
+    if isinstance(container, tuple):
+        # tuples are fixed-length; Tuple._impl keeps dropped values
+        return node.typ.set_value(node, container, name, drop)
+    if isinstance(node.typ, Map):
+        container.pop(node.typ._key(node, name), None)
+    elif isinstance(node.typ, Positional):
+        del container[int(name)]
+    else:
+        container.pop(name, None)
+    return container
+
+
+def _add_error(error, steps, exc):
+    # attach ``exc`` to the ``error`` tree at the position named by
+    # ``steps``, creating the intermediate exceptions as necessary
+    for _, _, subnode, pos in steps[:-1]:
+        for child in error.children:
+            if child.node is subnode and child.pos == pos:
+                error = child
+                break
+        else:
+            child = Invalid(subnode)
+            error.add(child, pos)
+            error = child
+    error.add(exc, steps[-1][3])
+
+
+def _validate_ancestors(node, appstruct, changed, failed, error):
+    # rerun the validators of the ancestors of the ``changed`` paths,
+    # skipping the ancestors of ``failed`` paths just as container
+    # deserialization would
+    blocked = set()
+    for steps in failed:
+        for end in range(len(steps)):
+            blocked.add(tuple(step[1] for step in steps[:end]))
+    ancestors = {}
+    for steps in changed:
+        for end in range(len(steps)):
+            ancestors[tuple(step[1] for step in steps[:end])] = steps[:end]
+    return _validate_nodes(node, appstruct, ancestors, blocked, error)
+
+
+def _validate_nodes(node, appstruct, targets, blocked, error):
+    # run the validators of the ``targets`` (a dict of name tuples to
+    # steps), deepest first; a failure blocks the validation of the
+    # ancestors of the failing node.  Returns the (possibly new) error.
+    for names in sorted(targets, key=len, reverse=True):
+        if names in blocked:
+            continue
+        steps = targets[names]
+        subnode = steps[-1][2] if steps else node
+        validator = subnode.validator
+        if validator is None:
+            continue
+        if isinstance(validator, deferred):
+            raise UnboundDeferredError(
+                "Schema node {node} has an unbound "
+                "deferred validator".format(node=subnode)
+            )
+        try:
+            validator(subnode, _get_path(appstruct, steps))
+        except Invalid as e:
+            if not steps:
+                return e
+            _add_error(error, steps, e)
+            for end in range(len(steps)):
+                blocked.add(names[:end])
+    return error
@@ -0,0 +1,343 @@
+"""Incremental deserialization of JSON documents read from a stream."""
+
+import codecs
+import json
+import re
+
+from colander import Invalid, Mapping, Sequence, Tuple, _SchemaNode, drop
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# the delimiter after a value and the whitespace around it
+_DELIMITER = re.compile(r'[ \t\n\r]*([,:\]}]?)[ \t\n\r]*')
+# a key without escapes, followed by its delimiter
+_KEY = re.compile(r'"([^"\\\x00-\x1f]*)"[ \t\n\r]*:[ \t\n\r]*')
+_scan = json.JSONDecoder().scan_once
+_scanstring = json.decoder.scanstring
+
+
+class StreamError(ValueError):
+    """Raised by the functions of :mod:`colander.stream` when the stream
+    does not contain a well-formed JSON document."""
+
+
+def deserialize(schema, fp, chunk_size=65536):
+    """Read a JSON document from the file-like object ``fp`` and
+    deserialize it with ``schema``, returning the :term:`appstruct`.
+
+    The result is the same as ``schema.deserialize(json.load(fp))``, but
+    the document is read ``chunk_size`` characters (or bytes, decoded as
+    UTF-8) at a time and the values are deserialized as soon as they have
+    been read: the JSON text of the mappings and sequences of the schema
+    is never held in memory as a whole, nor is the corresponding
+    :term:`cstruct`.  Other nodes, including tuples, and the nodes which
+    have a ``preparer`` or a custom ``deserialize`` method, receive the
+    value parsed by :mod:`json`.
+
+    Errors of the individual values are collected and raised together as
+    a :exc:`colander.Invalid` once the document has been read.  Structural
+    errors (a container of the wrong type, a tuple of the wrong length or
+    an unknown key of a mapping whose ``unknown`` attribute is ``raise``)
+    raise a :exc:`colander.Invalid` immediately, reporting only that error,
+    and a malformed document raises a :exc:`colander.stream.StreamError`;
+    in both cases the rest of the stream is not read.
+    """
+    parser = _Parser(fp, chunk_size)
+    parser.start()
+    try:
+        appstruct = parser.value(schema)
+    except _Abort as e:
+        raise e.error
+    parser.end()
+    return appstruct
+
+
+def iterdeserialize(schema, fp, chunk_size=65536):
+    """Read a JSON array from the file-like object ``fp`` and yield the
+    items deserialized by the child of the sequence node ``schema`` one by
+    one, as soon as each of them has been read; see
+    :func:`colander.stream.deserialize`.
+
+    Items deserialized to :attr:`colander.drop` are skipped.  The first
+    invalid item raises a :exc:`colander.Invalid` rooted at ``schema``.
+    The items are not kept, so the validator of ``schema`` itself is not
+    run.
+    """
+    if _kind(schema) is not Sequence:
+        raise ValueError('schema must be a sequence node')
+    return _iterdeserialize(schema, _Parser(fp, chunk_size))
+
+
+def _iterdeserialize(schema, parser):
+    if parser.start() != '[':
+        try:
+            yield from parser.value(schema)
+        except _Abort as e:
+            raise e.error
+        parser.end()
+        return
+    subnode = schema.children[0]
+    num = 0
+    done = parser.opening(']')
+    while not done:
+        try:
+            appstruct = parser.value(subnode)
+        except Invalid as e:
+            raise _wrap(schema, e, num)
+        except _Abort as e:
+            raise _wrap(schema, e.error, num)
+        if appstruct is not drop:
+            yield appstruct
+        num += 1
+        done = parser.delimiter(']')
+    parser.end()
+
+
+def _kind(node):
+    # the container types whose values are parsed from the stream
+    if (
+        node.preparer is None
+        and type(node).deserialize is _SchemaNode.deserialize
+    ):
+        deserialize = type(node.typ).deserialize
+        for typ in (Mapping, Sequence, Tuple):
+            if deserialize is typ.deserialize:
+                return typ
+    return None
+
+
+def _wrap(node, exc, pos):
+    error = Invalid(node)
+    error.add(exc, pos)
+    return error
+
+
+class _Abort(Exception):
+    # a structural error which stops the parsing
+    def __init__(self, error):
+        self.error = error
+
+
+class _Parsed:
+    # the result of the deserialization of a child
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value=None, error=None):
+        self.value = value
+        self.error = error
+
+
+def _callback(subnode, subval):
+    if type(subval) is _Parsed:
+        if subval.error is not None:
+            raise subval.error
+        return subval.value
+    # absent and preserved values
+    return subnode.deserialize(subval)
+
+
+class _Parser:
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        # the number of characters discarded before ``buf``
+        self.offset = 0
+        self.eof = False
+        self.decoder = None
+        # per node: container type and, for mappings, children by name
+        self.plans = {}
+
+    def more(self):
+        # read the next chunk, return False at the end of the stream
+        chunk = ''
+        while not chunk:
+            if self.eof:
+                return False
+            data = self.fp.read(self.chunk_size)
+            # the end of the stream is an empty read: a short read ending
+            # inside a multibyte character decodes to an empty string
+            self.eof = not data
+            chunk = data
+            if isinstance(data, bytes):
+                if self.decoder is None:
+                    self.decoder = codecs.getincrementaldecoder('utf-8')()
+                try:
+                    chunk = self.decoder.decode(data, self.eof)
+                except UnicodeDecodeError as e:
+                    raise StreamError('Invalid UTF-8 data: %s' % e)
+        start = self.pos
+        self.offset += start
+        self.buf = self.buf[start:] + chunk
+        self.pos = 0
+        return True
+
+    def fail(self, msg, pos=None):
+        if pos is None:
+            pos = self.pos
+        raise StreamError('%s: char %d' % (msg, self.offset + pos))
+
+    def match(self, pattern):
+        # match ``pattern`` at the current position, reading more data
+        # while the match reaches the end of the buffer
+        while True:
+            match = pattern.match(self.buf, self.pos)
+            if match.end() < len(self.buf) or not self.more():
+                self.pos = match.end()
+                return match
+
+    def start(self):
+        # skip whitespace before a value, which must be present
+        self.match(_WHITESPACE)
+        if self.pos == len(self.buf):
+            self.fail('Expecting value')
+        return self.buf[self.pos]
+
+    def end(self):
+        self.match(_WHITESPACE)
+        if self.pos < len(self.buf):
+            self.fail('Extra data')
+
+    def opening(self, close):
+        # consume the opening character of a container, return True if it
+        # is empty
+        self.pos += 1
+        if self.start() == close:
+            self.pos += 1
+            return True
+        return False
+
+    def delimiter(self, close):
+        # consume the delimiter following an item, return True at the end
+        # of the container
+        match = self.match(_DELIMITER)
+        delimiter = match.group(1)
+        if delimiter == ',':
+            return False
+        if delimiter != close:
+            self.fail("Expecting ',' delimiter", match.start(1))
+        return True
+
+    def key(self):
+        match = _KEY.match(self.buf, self.pos)
+        if match is not None and match.end() < len(self.buf):
+            self.pos = match.end()
+            return match.group(1)
+        # escaped or truncated
+        if self.start() != '"':
+            self.fail('Expecting property name enclosed in double quotes')
+        while True:
+            try:
+                key, end = _scanstring(self.buf, self.pos + 1)
+            except json.JSONDecodeError as e:
+                if not self.more():
+                    self.fail(e.msg, e.pos)
+                continue
+            self.pos = end
+            match = self.match(_DELIMITER)
+            if match.group(1) != ':':
+                self.fail("Expecting ':' delimiter", match.start(1))
+            return key
+
+    def raw(self):
+        # parse the value at the current position with json
+        while True:
+            try:
+                value, end = _scan(self.buf, self.pos)
+            except StopIteration as e:
+                # the value may be truncated by the end of the buffer
+                if len(self.buf) - e.value > 10 or not self.more():
+                    self.fail('Expecting value', e.value)
+                continue
+            except json.JSONDecodeError as e:
+                if (
+                    len(self.buf) - e.pos > 10
+                    and not e.msg.startswith('Unterminated string')
+                ) or not self.more():
+                    self.fail(e.msg, e.pos)
+                continue
+            # so may a number, which can end with '.', 'e' or 'e-'
+            if len(self.buf) - end > 2 or not self.more():
+                self.pos = end
+                return value
+
+    def plan(self, node):
+        plan = self.plans.get(id(node))
+        if plan is None:
+            kind = _kind(node)
+            children = None
+            if kind is Mapping:
+                children = {
+                    subnode.name: (num, subnode, _kind(subnode))
+                    for num, subnode in enumerate(node.children)
+                }
+            plan = self.plans[id(node)] = (kind, children)
+        return plan
+
+    def value(self, node):
+        kind, children = self.plan(node)
+        if kind is None:
+            return node.deserialize(self.raw())
+        buf, pos = self.buf, self.pos
+        char = buf[pos] if pos < len(buf) else ''
+        if kind is Mapping and char == '{':
+            return self.mapping(node, children)
+        if kind is Sequence and char == '[':
+            return self.sequence(node)
+        cstruct = self.raw()
+        try:
+            if kind is Tuple:
+                # the elements are parsed as a whole to report a wrong
+                # length like the regular deserialization
+                node.typ._validate(node, cstruct)
+            else:
+                return node.deserialize(cstruct)
+        except Invalid as e:
+            raise _Abort(e)
+        return node.deserialize(cstruct)
+
+    def mapping(self, node, children):
+        typ = node.typ
+        values = {}
+        done = self.opening('}')
+        while not done:
+            key = self.key()
+            child = children.get(key)
+            if child is None:
+                cstruct = self.raw()
+                if typ.unknown == 'raise':
+                    raise _Abort(typ._unsupported(node, {key: cstruct}))
+                if typ.unknown == 'preserve':
+                    values[key] = cstruct
+            else:
+                num, subnode, kind = child
+                try:
+                    if kind is None:
+                        value = subnode.deserialize(self.raw())
+                    else:
+                        value = self.value(subnode)
+                    values[key] = _Parsed(value)
+                except Invalid as e:
+                    values[key] = _Parsed(error=e)
+                except _Abort as e:
+                    raise _Abort(_wrap(node, e.error, num))
+            done = self.delimiter('}')
+        appstruct = typ._impl(node, values, _callback, 'missing')
+        node._run_validator(appstruct)
+        return appstruct
+
+    def sequence(self, node):
+        subnode = node.children[0]
+        values = []
+        done = self.opening(']')
+        while not done:
+            try:
+                values.append(_Parsed(self.value(subnode)))
+            except Invalid as e:
+                values.append(_Parsed(error=e))
+            except _Abort as e:
+                raise _Abort(_wrap(node, e.error, len(values)))
+            done = self.delimiter(']')
+        appstruct = node.typ._impl(node, values, _callback, 'missing', None)
+        node._run_validator(appstruct)
+        return appstruct
@@ -0,0 +1,318 @@
+"""Reading and writing CSV files of flattened appstructs."""
+
+import csv
+import operator
+
+from colander import Mapping, SchemaType, Sequence, Tuple, null
+
+
+def read_csv(schema, fileobj, **fmtparams):
+    """Read the CSV file ``fileobj`` and return an iterator of the
+    :term:`appstruct` deserialized by ``schema`` from each of its rows.
+
+    The first row is a header naming the column of each value with its
+    dotted name path, as returned by :meth:`colander.SchemaNode.flatten`:
+    a row is converted to a :term:`cstruct` like
+    :meth:`colander.SchemaNode.unflatten` would, empty cells being empty
+    strings, then deserialized.  The header is read and routed to the
+    nodes of the schema once, when this function is called; a
+    :exc:`ValueError` is raised if it names a path which does not exist in
+    the schema, the same path twice, the items of a sequence not numbered
+    from ``0`` or only some of the elements of a tuple.
+
+    The rows are read and deserialized as the iterator is consumed; an
+    invalid row raises a :exc:`colander.Invalid`, and a row which does not
+    have as many cells as the header a :exc:`ValueError`.  Empty lines are
+    skipped.  ``fmtparams`` are passed to :func:`csv.reader`, e.g.
+    ``dialect='excel-tab'`` to read a TSV file.
+    """
+    reader = csv.reader(fileobj, **fmtparams)
+    header = next(reader, None)
+    if header is None:
+        return iter(())
+    build = _builder(schema, _relative(schema, header))
+    return _read(schema, reader, build, len(header))
+
+
+def _read(schema, reader, build, width):
+    for row in reader:
+        if len(row) != width:
+            if not row:
+                continue
+            raise ValueError(
+                'Line %d has %d cells instead of %d'
+                % (reader.line_num, len(row), width)
+            )
+        yield schema.deserialize(build(row))
+
+
+def write_csv(schema, rows, fileobj, columns=None, **fmtparams):
+    """Serialize each :term:`appstruct` of the iterable ``rows`` with
+    ``schema`` and write it to the CSV file ``fileobj``, preceded by a
+    header row; this is the reverse of :func:`colander.tabular.read_csv`.
+
+    ``columns`` is the list of the dotted name paths of the columns.  By
+    default, the paths of the flattened :term:`cstruct` of the first row
+    are used, and every sequence of the following rows must then have at
+    most as many items as in the first row; a :exc:`ValueError` is raised
+    otherwise, rather than losing data.  Missing values and
+    :attr:`colander.null` are written as empty cells.  ``fmtparams`` are
+    passed to :func:`csv.writer`.
+    """
+    writer = csv.writer(fileobj, **fmtparams)
+    rows = iter(rows)
+    cstruct = null
+    if columns is None:
+        for appstruct in rows:
+            cstruct = schema.serialize(appstruct)
+            columns = _columns(schema, cstruct, _prefix(schema))
+            break
+        else:
+            return
+    columns = list(columns)
+    extract = _extractor(schema, _relative(schema, columns))
+    writer.writerow(columns)
+    width = len(columns)
+    if cstruct is not null:
+        row = [''] * width
+        extract(cstruct, row)
+        writer.writerow(row)
+    for appstruct in rows:
+        row = [''] * width
+        extract(schema.serialize(appstruct), row)
+        writer.writerow(row)
+
+
+def _prefix(schema):
+    # flattened paths start with the name of the schema, if any
+    return schema.name + '.' if schema.name else ''
+
+
+def _relative(schema, header):
+    # split the paths of the header into their steps below ``schema`` and
+    # pair them with their column index
+    prefix = _prefix(schema)
+    start = len(prefix)
+    columns = []
+    for index, path in enumerate(header):
+        if not path.startswith(prefix):
+            raise ValueError('Unknown column "%s"' % path)
+        columns.append((path[start:].split('.'), index))
+    return columns
+
+
+def _kind(node):
+    unflatten = type(node.typ).unflatten
+    for typ in (SchemaType, Mapping, Sequence, Tuple):
+        if unflatten is typ.unflatten:
+            return typ
+    return None
+
+
+def _group(columns, path):
+    # group ``columns`` by their first step, dropping the columns which
+    # name the container itself
+    groups = {}
+    for names, index in columns:
+        if names[0]:
+            groups.setdefault(names[0], []).append((names[1:] or [''], index))
+    return groups
+
+
+def _child(node, name, path):
+    subnode = node.get(name)
+    if subnode is None:
+        raise ValueError('Unknown column "%s"' % _join(path, name))
+    return subnode
+
+
+def _join(path, name):
+    return path + '.' + name if path else name
+
+
+def _positions(node, groups, path):
+    # the sorted item positions of a sequence
+    count = len(groups)
+    if sorted(groups) != sorted(str(num) for num in range(count)):
+        raise ValueError(
+            'The items of "%s" are not numbered from 0 to %d'
+            % (path or node.name, count - 1)
+        )
+    return [groups[str(num)] for num in range(count)]
+
+
+def _builder(node, columns, path=''):
+    # return a function building the cstruct of ``node`` from a row
+    kind = _kind(node)
+    if kind is SchemaType:
+        if len(columns) > 1:
+            raise ValueError('Duplicate column "%s"' % path)
+        names, index = columns[0]
+        if names != ['']:
+            raise ValueError(
+                'Unknown column "%s"' % _join(path, '.'.join(names))
+            )
+        return operator.itemgetter(index)
+
+    groups = _group(columns, path)
+    if kind is Mapping:
+        builders = []
+        for name, subcolumns in groups.items():
+            subnode = _child(node, name, path)
+            builder = _builder(subnode, subcolumns, _join(path, name))
+            builders.append((name, builder))
+
+        def build(row):
+            return {name: builder(row) for name, builder in builders}
+
+    elif kind is Tuple:
+        for name in groups:
+            _child(node, name, path)
+        if len(groups) != len(node.children):
+            raise ValueError('Missing elements of "%s"' % path)
+        builders = [
+            _builder(subnode, groups[subnode.name], _join(path, subnode.name))
+            for subnode in node.children
+        ]
+
+        def build(row):
+            return tuple([builder(row) for builder in builders])
+
+    elif kind is Sequence:
+        subnode = node.children[0]
+        builders = [
+            _builder(subnode, subcolumns, _join(path, str(num)))
+            for num, subcolumns in enumerate(_positions(node, groups, path))
+        ]
+
+        def build(row):
+            return [builder(row) for builder in builders]
+
+    else:
+        # a custom type: let it unflatten its own part of the row
+        prefix = _prefix(node)
+        paths = {
+            prefix + '.'.join(names) if names != [''] else node.name: index
+            for names, index in columns
+        }
+        typ = node.typ
+        names = sorted(paths)
+
+        def build(row):
+            fstruct = {name: row[index] for name, index in paths.items()}
+            return typ.unflatten(node, names, fstruct)
+
+    return build
+
+
+def _columns(node, cstruct, prefix):
+    # the flattened paths of ``cstruct``
+    kind = _kind(node)
+    if kind is SchemaType:
+        return [prefix[:-1]]
+    if kind is None:
+        return list(node.typ.flatten(node, cstruct, prefix, listitem=True))
+    columns = []
+    if kind is Mapping:
+        for subnode in node.children:
+            subprefix = prefix + subnode.name + '.'
+            subval = cstruct.get(subnode.name, null)
+            columns.extend(_columns(subnode, subval, subprefix))
+    elif kind is Tuple:
+        for num, subnode in enumerate(node.children):
+            subprefix = prefix + subnode.name + '.'
+            subval = null if cstruct is null else cstruct[num]
+            columns.extend(_columns(subnode, subval, subprefix))
+    elif cstruct is not null:
+        subnode = node.children[0]
+        for num, subval in enumerate(cstruct):
+            columns.extend(_columns(subnode, subval, '%s%d.' % (prefix, num)))
+    return columns
+
+
+def _extractor(node, columns, path=''):
+    # return a function storing the cells of the cstruct of ``node`` in a
+    # row
+    kind = _kind(node)
+    if kind is SchemaType:
+        if len(columns) > 1:
+            raise ValueError('Duplicate column "%s"' % path)
+        names, index = columns[0]
+        if names != ['']:
+            raise ValueError(
+                'Unknown column "%s"' % _join(path, '.'.join(names))
+            )
+
+        def extract(cstruct, row):
+            if cstruct is not null:
+                row[index] = cstruct
+
+        return extract
+
+    groups = _group(columns, path)
+    if kind is Mapping:
+        extractors = []
+        for name, subcolumns in groups.items():
+            subnode = _child(node, name, path)
+            extractor = _extractor(subnode, subcolumns, _join(path, name))
+            extractors.append((name, extractor))
+
+        def extract(cstruct, row):
+            for name, extractor in extractors:
+                extractor(cstruct.get(name, null), row)
+
+    elif kind is Tuple:
+        for name in groups:
+            _child(node, name, path)
+        extractors = [
+            (
+                num,
+                _extractor(
+                    subnode, groups[subnode.name], _join(path, subnode.name)
+                ),
+            )
+            for num, subnode in enumerate(node.children)
+            if subnode.name in groups
+        ]
+
+        def extract(cstruct, row):
+            if cstruct is null:
+                return
+            for num, extractor in extractors:
+                extractor(cstruct[num], row)
+
+    elif kind is Sequence:
+        subnode = node.children[0]
+        extractors = [
+            _extractor(subnode, subcolumns, _join(path, str(num)))
+            for num, subcolumns in enumerate(_positions(node, groups, path))
+        ]
+        count = len(extractors)
+
+        def extract(cstruct, row):
+            if cstruct is null:
+                return
+            if len(cstruct) > count:
+                raise ValueError(
+                    '"%s" has %d items, more than its %d columns'
+                    % (path or node.name, len(cstruct), count)
+                )
+            for extractor, subval in zip(extractors, cstruct):
+                extractor(subval, row)
+
+    else:
+        # a custom type: let it flatten its own part of the cstruct
+        paths = [
+            ('.'.join(names) if names != [''] else '', index)
+            for names, index in columns
+        ]
+        typ = node.typ
+
+        def extract(cstruct, row):
+            flat = typ.flatten(node, cstruct, '', listitem=True)
+            for name, index in paths:
+                value = flat.get(name, null)
+                if value is not null:
+                    row[index] = value
+
+    return extract
@@ -3,6 +3,11 @@ import unittest
 import colander
 import tests
 
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
 
 def invalid_exc(func, *arg, **kw):
     from colander import Invalid
@@ -15,6 +20,28 @@ def invalid_exc(func, *arg, **kw):
         raise AssertionError('Invalid not raised')  # pragma: no cover
 
 
+def differential_corpus(pieces, alphabet, size, seed=0):
+    """Return ``size`` strings made of a random choice of each sequence of
+    ``pieces``, half of which get a few random edits with characters of
+    ``alphabet``."""
+    import random
+
+    rnd = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        value = ''.join(rnd.choice(choices) for choices in pieces)
+        for _ in range(i % 2 * rnd.randrange(1, 4)):
+            pos = rnd.randrange(len(value) + 1)
+            end = pos + rnd.randrange(2)
+            value = (
+                value[:pos]
+                + rnd.choice(alphabet) * rnd.randrange(2)
+                + (value[end:])
+            )
+        corpus.append(value)
+    return corpus
+
+
 class TestInvalid(unittest.TestCase):
     def _makeOne(self, node, msg=None, val=None):
         from colander import Invalid
@@ -79,6 +106,16 @@ class TestInvalid(unittest.TestCase):
         paths = list(exc1.paths())
         self.assertEqual(paths, [(exc1, exc2, exc3), (exc1, exc4)])
 
+    def test_paths_deep(self):
+        exc = root = self._makeOne(None, 'root')
+        for _ in range(5000):
+            child = self._makeOne(None)
+            exc.add(child)
+            exc = child
+        paths = list(root.paths())
+        self.assertEqual(len(paths), 1)
+        self.assertEqual(len(paths[0]), 5001)
+
     def test_asdict(self):
         from colander import Positional
 
@@ -100,6 +137,52 @@ class TestInvalid(unittest.TestCase):
             {'node1.node2.3': 'exc1; exc2; exc3', 'node1.node4': 'exc1; exc4'},
         )
 
+    def _makeTree(self):
+        from colander import Positional
+
+        node1 = DummySchemaNode(Positional(), 'node1')
+        node2 = DummySchemaNode(None, 'node2')
+        node3 = DummySchemaNode(None, 'node3')
+        exc1 = self._makeOne(node1, 'exc1')
+        for num in range(3):
+            exc2 = self._makeOne(node2, 'exc2')
+            exc1.add(exc2, num)
+            exc2.add(self._makeOne(node3, 'exc3'))
+        return exc1
+
+    def test_asdict_limit(self):
+        exc = self._makeTree()
+        self.assertEqual(
+            exc.asdict(limit=2),
+            {
+                'node1.0.node3': 'exc1; exc2; exc3',
+                'node1.1.node3': 'exc1; exc2; exc3',
+            },
+        )
+        self.assertEqual(exc.asdict(limit=0), {})
+        self.assertEqual(len(exc.asdict(limit=5)), 3)
+
+    def test_asdict_reflects_changes(self):
+        exc = self._makeTree()
+        self.assertEqual(exc.asdict()['node1.0.node3'], 'exc1; exc2; exc3')
+        exc.msg = 'new'
+        self.assertEqual(exc.asdict()['node1.0.node3'], 'new; exc2; exc3')
+        child = exc.children[1]
+        child.children.append(self._makeOne(DummySchemaNode(None, 'x'), 'y'))
+        self.assertEqual(exc.asdict()['node1.1.x'], 'new; exc2; y')
+        catalog = {'new': 'neu'}
+
+        def translate(msg):
+            return catalog.get(msg, msg)
+
+        self.assertEqual(
+            exc.asdict(translate)['node1.0.node3'], 'neu; exc2; exc3'
+        )
+        catalog['new'] = 'nouveau'
+        self.assertEqual(
+            exc.asdict(translate)['node1.0.node3'], 'nouveau; exc2; exc3'
+        )
+
     def test_asdict_with_all_validator(self):
         # see https://github.com/Pylons/colander/pull/27
         from colander import All, Positional
@@ -244,6 +327,238 @@ class TestInvalid(unittest.TestCase):
         self.assertEqual(exc.messages(), [])
 
 
+class TestErrorCollector(unittest.TestCase):
+    def _makeOne(self):
+        from colander import ErrorCollector
+
+        return ErrorCollector()
+
+    def _makeSchema(self):
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(
+                colander.Int(), validator=colander.Range(0, 10)
+            )
+            name = colander.SchemaNode(
+                colander.String(),
+                validator=colander.All(
+                    colander.Length(max=3), colander.OneOf(['a', 'b'])
+                ),
+            )
+
+        class Items(colander.SequenceSchema):
+            item = Item()
+
+        class Schema(colander.MappingSchema):
+            items = Items(validator=colander.Length(max=3))
+
+        return Schema()
+
+    def _makeCstructs(self):
+        return [
+            {'items': [{'id': '1', 'name': 'a'}]},
+            {'items': [{'id': '11', 'name': 'abcd'}, {'id': 'x'}]},
+            {'items': 'x'},
+            {'items': [{'id': '1', 'name': 'b'}]},
+            {'items': [{'id': '1', 'name': 'a'}] * 4},
+        ]
+
+    def _collect(self, schema, cstructs):
+        collector = self._makeOne()
+        results = [schema.deserialize(c, errors=collector) for c in cstructs]
+        return collector, results
+
+    def _asdicts(self, schema, cstructs, **kw):
+        errors = {}
+        for index, cstruct in enumerate(cstructs):
+            try:
+                schema.deserialize(cstruct)
+            except colander.Invalid as e:
+                errors[index] = e.asdict(**kw)
+        return errors
+
+    def test_deserialize(self):
+        schema = self._makeSchema()
+        collector, results = self._collect(schema, self._makeCstructs())
+        self.assertEqual(results[0], {'items': [{'id': 1, 'name': 'a'}]})
+        self.assertEqual(results[1:3], [colander.drop, colander.drop])
+        self.assertEqual(results[3], {'items': [{'id': 1, 'name': 'b'}]})
+        self.assertIs(results[4], colander.drop)
+        self.assertEqual(collector.records, 5)
+        self.assertEqual(len(collector), 7)
+        self.assertEqual(
+            list(collector)[:3],
+            [
+                (
+                    1,
+                    'items.0.id',
+                    '${val} is greater than maximum value ' '${max}',
+                    {'val': 11, 'max': 10},
+                ),
+                (
+                    1,
+                    'items.0.name',
+                    'Longer than maximum length ${max}',
+                    {'max': 3},
+                ),
+                (
+                    1,
+                    'items.0.name',
+                    '"${val}" is not one of ${choices}',
+                    {'val': 'abcd', 'choices': 'a, b'},
+                ),
+            ],
+        )
+
+    def test_deserialize_only(self):
+        schema = self._makeSchema()
+        collector = self._makeOne()
+        cstruct = {'items': [{'id': 'x'}]}
+        result = schema.deserialize(
+            cstruct, only=['items.*.name'], errors=collector
+        )
+        self.assertIs(result, colander.drop)
+        self.assertEqual(
+            [path for _, path, _, _ in collector], ['items.0.name']
+        )
+
+    def test_asdicts(self):
+        schema = self._makeSchema()
+        cstructs = self._makeCstructs()
+        collector, _ = self._collect(schema, cstructs)
+        self.assertEqual(collector.asdicts(), self._asdicts(schema, cstructs))
+        self.assertEqual(
+            collector.asdicts(separator=None),
+            self._asdicts(schema, cstructs, separator=None),
+        )
+
+    def test_asdicts_translate(self):
+        def translate(msg):
+            return msg.upper()
+
+        schema = self._makeSchema()
+        cstructs = self._makeCstructs()
+        collector, _ = self._collect(schema, cstructs)
+        self.assertEqual(
+            collector.asdicts(translate=translate),
+            self._asdicts(schema, cstructs, translate=translate),
+        )
+
+    def test_messages_rendered_once(self):
+        calls = []
+
+        def translate(msg):
+            calls.append(msg)
+            return msg
+
+        schema = self._makeSchema()
+        collector, _ = self._collect(schema, self._makeCstructs() * 10)
+        messages = collector.messages(translate)
+        self.assertEqual(len(messages), 70)
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(messages[0], '11 is greater than maximum value 10')
+
+    def test_messages_equal_values(self):
+        node = DummySchemaNode(None, 'node')
+        collector = self._makeOne()
+        for val in (1, 1.0, True):
+            msg = colander._(
+                '"${val}" is not one of ${choices}',
+                mapping={'val': val, 'choices': '5'},
+            )
+            collector.add(colander.Invalid(node, msg))
+        self.assertEqual(
+            collector.messages(),
+            [
+                '"1" is not one of 5',
+                '"1.0" is not one of 5',
+                '"True" is not one of 5',
+            ],
+        )
+
+    def test_add_messages_of_ancestors(self):
+        from colander import Positional
+
+        node1 = DummySchemaNode(None, 'node1')
+        node2 = DummySchemaNode(Positional(), 'node2')
+        node3 = DummySchemaNode(None, 'node3')
+        exc1 = colander.Invalid(node1, ['exc1', 'exc1b'])
+        exc2 = colander.Invalid(node2, 'exc2')
+        exc3 = colander.Invalid(node3)
+        exc4 = colander.Invalid(node3, colander._('${a}', mapping={'a': 1}))
+        exc1.add(exc2, 2)
+        exc2.add(exc3, 3)
+        exc1.add(exc4, 4)
+        collector = self._makeOne()
+        collector.add(exc1, index=7)
+        self.assertEqual(collector.records, 8)
+        self.assertEqual(collector.asdicts(), {7: exc1.asdict()})
+        self.assertEqual(
+            collector.messages(),
+            ['exc1', 'exc1b', 'exc2'] + ['exc1', 'exc1b', '1'],
+        )
+        collector = self._makeOne()
+        collector.add(colander.Invalid(node1))
+        self.assertEqual(list(collector), [(0, 'node1', None, None)])
+        self.assertEqual(collector.messages(), [None])
+        self.assertEqual(collector.asdicts(), {0: {'node1': ''}})
+
+    def test_unhashable_mapping(self):
+        node = DummySchemaNode(None, 'node')
+        msg = colander._('${a}', mapping={'a': [1]})
+        collector = self._makeOne()
+        collector.add(colander.Invalid(node, msg))
+        collector.add(colander.Invalid(node, msg))
+        self.assertEqual(collector.messages(), ['[1]', '[1]'])
+
+    def test_domains(self):
+        from translationstring import TranslationString
+
+        node = DummySchemaNode(None, 'node')
+        collector = self._makeOne()
+        for msg in (
+            'msg',
+            TranslationString('msg', domain='other'),
+            TranslationString('msg', default='Message'),
+            TranslationString('msg', context='ctx'),
+        ):
+            collector.add(colander.Invalid(node, msg))
+        self.assertEqual(len(collector.templates), 4)
+        self.assertEqual(
+            collector.messages(), ['msg', 'msg', 'Message', 'msg']
+        )
+
+    def test_pickle(self):
+        import pickle
+
+        schema = self._makeSchema()
+        cstructs = self._makeCstructs()
+        collector, _ = self._collect(schema, cstructs)
+        clone = pickle.loads(pickle.dumps(collector))
+        self.assertEqual(list(clone), list(collector))
+        self.assertEqual(clone.asdicts(), collector.asdicts())
+        clone.add(colander.Invalid(DummySchemaNode(None, 'node'), 'msg'))
+        self.assertEqual(clone.records, 6)
+
+    def test_extend(self):
+        schema = self._makeSchema()
+        cstructs = self._makeCstructs()
+        first, _ = self._collect(schema, cstructs[:2])
+        first.add(colander.Invalid(DummySchemaNode(None, 'node'), 'msg'))
+        second, _ = self._collect(schema, cstructs[2:])
+        second.add(colander.Invalid(DummySchemaNode(None, 'node')))
+        first.extend(second)
+        self.assertEqual(first.records, 7)
+        expected = self._asdicts(schema, cstructs[:2])
+        expected[2] = {'node': 'msg'}
+        for index, errors in self._asdicts(schema, cstructs[2:]).items():
+            expected[index + 3] = errors
+        expected[6] = {'node': ''}
+        self.assertEqual(first.asdicts(), expected)
+        first.extend(second, offset=100)
+        self.assertEqual(first.records, 104)
+        self.assertEqual(len(first.templates), 7)
+
+
 class TestAll(unittest.TestCase):
     def _makeOne(self, validators):
         from colander import All
@@ -412,6 +727,232 @@ class TestFunction(unittest.TestCase):
         self.assertRaises(TypeError, validator, None, None)
 
 
+class TestBatchValidator(unittest.TestCase):
+    def setUp(self):
+        import sqlite3
+
+        self.db = sqlite3.connect(':memory:')
+        self.addCleanup(self.db.close)
+        self.db.execute('CREATE TABLE product (id INTEGER PRIMARY KEY)')
+        self.db.executemany('INSERT INTO product VALUES (?)', [(1,), (2,)])
+        self.queries = []
+
+    def _makeOne(self):
+        from colander import BatchValidator
+
+        queries = self.queries
+        db = self.db
+
+        class ProductExists(BatchValidator):
+            def validate_batch(self, node, values):
+                queries.append(values)
+                params = ', '.join('?' * len(values))
+                rows = db.execute(
+                    f'SELECT id FROM product WHERE id IN ({params})', values
+                )
+                found = {row[0] for row in rows}
+                return {
+                    index: 'Unknown product'
+                    for index, value in enumerate(values)
+                    if value not in found
+                }
+
+        return ProductExists()
+
+    def _makeSchema(self, validator):
+        class Line(colander.MappingSchema):
+            product = colander.SchemaNode(colander.Int(), validator=validator)
+            quantity = colander.SchemaNode(colander.Int())
+
+        class Lines(colander.SequenceSchema):
+            line = Line()
+
+        return Lines()
+
+    def _lines(self, *products):
+        return [{'product': str(p), 'quantity': '1'} for p in products]
+
+    def test_one_query(self):
+        schema = self._makeSchema(self._makeOne())
+        result = schema.deserialize(self._lines(*[1, 2] * 50))
+        self.assertEqual(len(result), 100)
+        self.assertEqual(self.queries, [[1, 2] * 50])
+
+    def test_errors(self):
+        schema = self._makeSchema(self._makeOne())
+        cstruct = self._lines(1, 5, 2, 6)
+        cstruct[2]['quantity'] = 'x'
+        expected = {
+            '1.product': 'Unknown product',
+            '2.quantity': '"x" is not a number',
+            '3.product': 'Unknown product',
+        }
+        e = invalid_exc(schema.deserialize, cstruct)
+        self.assertEqual(e.asdict(), expected)
+        self.assertEqual(self.queries, [[1, 5, 2, 6]])
+        self.assertEqual(schema.try_deserialize(cstruct)[1].asdict(), expected)
+        self.assertEqual(schema.validate(cstruct).asdict(), expected)
+        errors = colander.ErrorCollector()
+        self.assertIs(
+            schema.deserialize(cstruct, errors=errors), colander.drop
+        )
+        self.assertEqual(errors.asdicts(), {0: expected})
+        self.assertEqual(len(self.queries), 4)
+
+    def test_other_errors_only(self):
+        schema = self._makeSchema(self._makeOne())
+        cstruct = self._lines(1, 2)
+        cstruct[0]['quantity'] = 'x'
+        e = invalid_exc(schema.deserialize, cstruct)
+        self.assertEqual(e.asdict(), {'0.quantity': '"x" is not a number'})
+        self.assertIsNone(schema.validate(self._lines(1, 2)))
+        self.assertEqual(len(self.queries), 2)
+
+    def test_nested(self):
+        validator = self._makeOne()
+
+        class Order(colander.MappingSchema):
+            lines = self._makeSchema(validator)
+            extra = colander.SchemaNode(
+                colander.Int(),
+                validator=colander.All(colander.Range(max=3), validator),
+                missing=colander.drop,
+            )
+
+        class Orders(colander.SequenceSchema):
+            order = Order()
+
+        cstruct = [
+            {'lines': self._lines(1, 2)},
+            {'lines': self._lines(2, 7), 'extra': '9'},
+        ]
+        e = invalid_exc(Orders().deserialize, cstruct)
+        self.assertEqual(
+            e.asdict(),
+            {
+                '1.extra': '9 is greater than maximum value 3; '
+                'Unknown product',
+                '1.lines.1.product': 'Unknown product',
+            },
+        )
+        self.assertEqual(self.queries, [[1, 2, 2, 7], [9]])
+
+    def test_outside_sequence(self):
+        validator = self._makeOne()
+        node = colander.SchemaNode(colander.Int(), validator=validator)
+        self.assertEqual(node.deserialize('1'), 1)
+        e = invalid_exc(node.deserialize, '5')
+        self.assertEqual(e.msg, 'Unknown product')
+        schema = self._makeSchema(validator)
+        error = schema.check_appstruct([{'product': 5, 'quantity': 1}] * 2)
+        self.assertEqual(
+            error.asdict(),
+            {'0.product': 'Unknown product', '1.product': 'Unknown product'},
+        )
+        self.assertEqual(self.queries, [[1], [5], [5], [5]])
+
+    def test_iterators(self):
+        expected = {'0.1.product': 'Unknown product'}
+        schema = colander.SchemaNode(
+            colander.Sequence(), self._makeSchema(self._makeOne())
+        )
+        for method in ('deserialize', 'try_deserialize', 'validate'):
+            cstruct = (iter(self._lines(*products)) for products in [(1, 5)])
+            if method == 'deserialize':
+                e = invalid_exc(schema.deserialize, cstruct)
+            elif method == 'try_deserialize':
+                e = schema.try_deserialize(cstruct)[1]
+            else:
+                e = schema.validate(cstruct)
+            self.assertEqual(e.asdict(), expected)
+        node = colander.SchemaNode(
+            colander.Sequence(),
+            colander.SchemaNode(colander.Int(), validator=self._makeOne()),
+        )
+        e = invalid_exc(node.deserialize, iter(['1', '5', '2']))
+        self.assertEqual(e.asdict(), {'1': 'Unknown product'})
+        self.assertEqual(node.deserialize(iter(['1', '2'])), [1, 2])
+        self.assertEqual(node.serialize(iter([1, 2])), ['1', '2'])
+
+    def test_changed_cstruct(self):
+        validator = self._makeOne()
+        prepared = []
+
+        def preparer(value):
+            # null, hence dropped, the second time only
+            prepared.append(value)
+            return value if len(prepared) == 1 else colander.null
+
+        item = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(
+                colander.Int(),
+                name='a',
+                preparer=preparer,
+                validator=validator,
+                missing=colander.drop,
+            ),
+            colander.SchemaNode(colander.Int(), name='b', validator=validator),
+        )
+        schema = colander.SchemaNode(colander.Sequence(), item)
+        self.assertRaises(
+            ValueError, schema.deserialize, [{'a': '1', 'b': '5'}]
+        )
+
+    def test_index_out_of_range(self):
+        from colander import BatchValidator
+
+        class Wrong(BatchValidator):
+            def validate_batch(self, node, values):
+                return {len(values): 'Wrong'}
+
+        node = colander.SchemaNode(
+            colander.Sequence(),
+            colander.SchemaNode(colander.Int(), validator=Wrong()),
+        )
+        with self.assertRaises(ValueError) as cm:
+            node.deserialize(['1', '2'])
+        self.assertEqual(
+            str(cm.exception),
+            'Wrong.validate_batch returned the index 2 for a batch of 2 '
+            'values',
+        )
+
+    def test_changed_values(self):
+        validator = self._makeOne()
+        prepared = []
+
+        def preparer(value):
+            # null, hence dropped, the first time only
+            prepared.append(value)
+            return colander.null if len(prepared) == 1 else value
+
+        item = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(
+                colander.Int(),
+                name='a',
+                preparer=preparer,
+                validator=validator,
+                missing=colander.drop,
+            ),
+            colander.SchemaNode(colander.Int(), name='b', validator=validator),
+        )
+        schema = colander.SchemaNode(colander.Sequence(), item)
+        e = invalid_exc(schema.deserialize, [{'a': '1', 'b': '5'}])
+        self.assertEqual(e.asdict(), {'0.b': 'Unknown product'})
+        self.assertEqual(self.queries, [[5], [1], [5]])
+
+    def test_validate_batch_abstract(self):
+        from colander import BatchValidator
+
+        class Incomplete(BatchValidator):
+            pass
+
+        self.assertRaises(TypeError, BatchValidator)
+        self.assertRaises(TypeError, Incomplete)
+
+
 class TestRange(unittest.TestCase):
     def _makeOne(self, **kw):
         from colander import Range
@@ -516,6 +1057,40 @@ class TestEmail(unittest.TestCase):
         self.assertRaises(Invalid, validator, None, 'me@we-here-.com')
         self.assertRaises(Invalid, validator, None, 'name1,name2@here.info')
 
+    def test_same_language_as_pattern(self):
+        import re
+
+        from colander import EMAIL_RE, Invalid
+
+        pieces = [
+            ['a', 'A.b', "!#$%&'*+/=?^_`{|}~-", '', 'a b', '\u00e9', '.'],
+            ['@'] * 4 + ['', '@@'],
+            ['b', 'b.c', 'B-c.d9', '-b', 'b-', 'b..c', '.b', 'b.', '1.2'],
+            [''] * 6 + ['a' * 63, 'a' * 64, '.x' * 3, '-', '_', '\u00e9'],
+            [''] * 4 + ['\n', '\n\n', ' ', '.'],
+        ]
+        pattern = re.compile(EMAIL_RE)
+        validator = self._makeOne()
+        mismatches = []
+        for value in differential_corpus(pieces, 'a0-.@ \n\u00e9', 10000):
+            try:
+                validator(None, value)
+            except Invalid:
+                valid = False
+            else:
+                valid = True
+            if valid != bool(pattern.match(value)):
+                mismatches.append(value)  # pragma: no cover
+        self.assertEqual(mismatches, [])
+        self.assertIsNone(validator(None, 'me@here.com\n'))
+
+    def test_match_object(self):
+        from colander import EMAIL_RE
+
+        validator = self._makeOne()
+        self.assertEqual(validator.match_object.pattern, EMAIL_RE)
+        self.assertRaises(TypeError, validator, None, None)
+
 
 class TestDataURL(unittest.TestCase):
     def _makeOne(self):
@@ -622,6 +1197,33 @@ class TestLength(unittest.TestCase):
         self.assertEqual(e.msg.interpolate(), 'No more than 1, mate')
 
 
+class TestByteLength(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from colander import ByteLength
+
+        return ByteLength(**kw)
+
+    def test_bytes(self):
+        import array
+
+        validator = self._makeOne(min=1, max=4)
+        self.assertEqual(validator(None, b'a'), None)
+        self.assertEqual(validator(None, array.array('h', [1, 2])), None)
+        e = invalid_exc(validator, None, bytearray())
+        self.assertEqual(e.msg.interpolate(), 'Shorter than minimum length 1')
+        e = invalid_exc(validator, None, memoryview(b'abcde'))
+        self.assertEqual(e.msg.interpolate(), 'Longer than maximum length 4')
+        e = invalid_exc(validator, None, array.array('h', [1, 2, 3]))
+        self.assertEqual(e.msg.interpolate(), 'Longer than maximum length 4')
+
+    def test_base64(self):
+        validator = self._makeOne(min=4, max=4)
+        self.assertEqual(validator(None, 'YWJjZA=='), None)
+        self.assertRaises(colander.Invalid, validator, None, 'YWJj')
+        self.assertRaises(colander.Invalid, validator, None, 'YWJjZGU=')
+        self.assertRaises(colander.Invalid, validator, None, 'YWJjZGVm')
+
+
 class TestOneOf(unittest.TestCase):
     def _makeOne(self, values):
         from colander import OneOf
@@ -819,6 +1421,77 @@ class Test_url_validator(unittest.TestCase):
     def test_trailing_space_raises(self):
         self._assert_failure("http://mysite.com ")
 
+    def test_ignored_case(self):
+        self._assert_success("HTTPS://MYSITE.COM")
+        self._assert_success("http\u017f://LOCALHO\u017fT")
+        self._assert_success("http://mysite.XN--\u212a1")
+        self._assert_failure("http://mysite.xn--\u00e91")
+
+    def test_same_language_as_pattern(self):
+        import re
+
+        from colander import URL_REGEX, Invalid
+
+        pieces = [
+            ['', 'http://', 'HTTPS://', 'ftp://', 'Ftps://', 'file://'],
+            [''] * 6
+            + ['u@', 'u:p@', 'u:@', ':p@', 'u:p:q@', 'u/p@', 'a?b@', '@'],
+            [
+                'example.com',
+                'EXAMPLE.COM.',
+                'localhost',
+                'a',
+                '-a.com',
+                'a-.com',
+                'a..com',
+                '.com',
+                'a.b',
+                'a.c-',
+                'a.xn--p1ai',
+                'a.xn--',
+                'a.xn--a1',
+                'a.co1',
+                '\u00e9.\u00e9\u00e9',
+                'a\u3000b.com',
+                'x.\U0001f600\U0001f600',
+                '1.2.3.4',
+                '255.255.255.255',
+                '256.1.1.1',
+                '01.1.1.1',
+                '1.2.3',
+                '[::1]',
+                '[2001:DB8::]',
+                '[]',
+                '[g]',
+                'a' * 63 + '.com',
+                'a' * 64 + '.com',
+                'a.' + 'b' * 64,
+                'a.xn--' + 'b' * 59,
+                'a.xn--' + 'b' * 60,
+            ],
+            [''] * 4 + [':', ':0', ':80', ':65535', ':123456', ':a'],
+            [''] * 4 + ['/', '/a b', '?q', '#f', '/p\u3000', '/x\n', ' ', '@'],
+        ]
+        alphabet = 'a0-.:/@?#[] \n\u017f\u00a0\u00a1\U00010000'
+        pattern = re.compile(URL_REGEX, re.IGNORECASE)
+        mismatches = []
+        for value in differential_corpus(pieces, alphabet, 30000):
+            try:
+                self._callFUT(value)
+            except Invalid:
+                valid = False
+            else:
+                valid = True
+            if valid != bool(pattern.match(value)):
+                mismatches.append(value)  # pragma: no cover
+        self.assertEqual(mismatches, [])
+
+    def test_match_object(self):
+        from colander import URL_REGEX, url
+
+        self.assertEqual(url.match_object.pattern, URL_REGEX)
+        self.assertRaises(TypeError, self._callFUT, None)
+
 
 class Test_file_uri_validator(unittest.TestCase):
     def _callFUT(self, val):
@@ -947,6 +1620,10 @@ class TestSchemaType(unittest.TestCase):
         typ = self._makeOne()
         self.assertRaises(AssertionError, typ.get_value, None, None, None)
 
+    def test_project(self):
+        typ = self._makeOne()
+        self.assertRaises(KeyError, typ.project, None, {'a': None})
+
     def test_cstruct_children(self):
         typ = self._makeOne()
         self.assertEqual(typ.cstruct_children(None, None), [])
@@ -1036,6 +1713,67 @@ class TestMapping(unittest.TestCase):
         result = typ.deserialize(node, {'a': 1, 'b': 2})
         self.assertEqual(result, {'a': 1, 'b': 2})
 
+    def test_ctor_bad_preserve_copy(self):
+        self.assertRaises(ValueError, self._makeOne, preserve_copy='badarg')
+
+    def test_deserialize_unknown_preserve_copy(self):
+        node = DummySchemaNode(None)
+        node.children = [DummySchemaNode(None, name='a')]
+        cstruct = {'a': 1, 'b': [[1]]}
+        typ = self._makeOne(unknown='preserve', preserve_copy='deep')
+        result = typ.deserialize(node, cstruct)
+        self.assertFalse(result['b'][0] is cstruct['b'][0])
+        typ = self._makeOne(unknown='preserve', preserve_copy='shallow')
+        result = typ.deserialize(node, cstruct)
+        self.assertFalse(result['b'] is cstruct['b'])
+        self.assertTrue(result['b'][0] is cstruct['b'][0])
+        typ = self._makeOne(unknown='preserve', preserve_copy='reference')
+        result = typ.deserialize(node, cstruct)
+        self.assertTrue(result['b'] is cstruct['b'])
+
+    def test_deserialize_zero_copy(self):
+        class Strict(dict):
+            def pop(self, *arg):  # pragma: no cover
+                raise AssertionError('mutated')
+
+            def keys(self):  # pragma: no cover
+                raise AssertionError('unknown keys looked for')
+
+        node = DummySchemaNode(None)
+        node.children = [
+            DummySchemaNode(None, name='a'),
+            DummySchemaNode(None, name='b', default='abc'),
+        ]
+        typ = self._makeOne(zero_copy=True)
+        cstruct = Strict(a=1, c=2)
+        result = typ.deserialize(node, cstruct)
+        self.assertEqual(result, {'a': 1, 'b': colander.null})
+        self.assertEqual(cstruct, {'a': 1, 'c': 2})
+
+    def test_deserialize_zero_copy_unknown(self):
+        node = DummySchemaNode(None)
+        node.children = [DummySchemaNode(None, name='a')]
+        typ = self._makeOne(zero_copy=True, unknown='raise')
+        self.assertEqual(typ.deserialize(node, {'a': 1}), {'a': 1})
+        e = invalid_exc(typ.deserialize, node, {'c': 3, 'a': 1, 'b': 2})
+        self.assertEqual(list(e.fields.items()), [('c', 3), ('b', 2)])
+        typ = self._makeOne(
+            zero_copy=True, unknown='preserve', preserve_copy='reference'
+        )
+        cstruct = {'a': 1, 'b': [2]}
+        result = typ.deserialize(node, cstruct)
+        self.assertEqual(result, {'a': 1, 'b': [2]})
+        self.assertTrue(result['b'] is cstruct['b'])
+
+    def test_deserialize_zero_copy_not_a_mapping(self):
+        node = DummySchemaNode(None)
+        node.children = [DummySchemaNode(None, name='a')]
+        typ = self._makeOne(zero_copy=True)
+        e = invalid_exc(typ.deserialize, node, None)
+        self.assertTrue(
+            e.msg.interpolate().startswith('"None" is not a mapping type')
+        )
+
     def test_deserialize_subnodes_raise(self):
         node = DummySchemaNode(None)
         node.children = [
@@ -1136,6 +1874,16 @@ class TestMapping(unittest.TestCase):
         result = typ.flatten(node, {'a': 1, 'b': 2}, listitem=True)
         self.assertEqual(result, {'appstruct': 2})
 
+    def test_flatten_noname(self):
+        node = DummySchemaNode(None)
+        node.children = [
+            DummySchemaNode(self._makeOne(), name='a'),
+        ]
+        node.children[0].children = [DummySchemaNode(DummyType(), name='b')]
+        typ = self._makeOne()
+        result = typ.flatten(node, {'a': {'b': 1}})
+        self.assertEqual(result, {'a.appstruct': 1})
+
     def test_unflatten(self):
         node = DummySchemaNode(None, name='node')
         int1 = DummyType()
@@ -1152,6 +1900,16 @@ class TestMapping(unittest.TestCase):
         )
         self.assertEqual(result, {'a': 1, 'b': 2})
 
+    def test_unflatten_noname(self):
+        node = DummySchemaNode(None)
+        node.children = [
+            DummySchemaNode(DummyType(), name='a'),
+            DummySchemaNode(DummyType(), name='b'),
+        ]
+        typ = self._makeOne()
+        result = typ.unflatten(node, ['a', 'b'], {'a': 1, 'b': 2})
+        self.assertEqual(result, {'a': 1, 'b': 2})
+
     def test_unflatten_nested(self):
         node = DummySchemaNode(None, name='node')
         inttype = DummyType()
@@ -1213,6 +1971,50 @@ class TestMapping(unittest.TestCase):
         )
         self.assertEqual(typ.get_value(node1, appstruct, 'node2.foo'), 'bar')
 
+    def test_project(self):
+        import colander
+
+        typ = self._makeOne(unknown='raise')
+        node = colander.SchemaNode(
+            typ,
+            colander.SchemaNode(colander.Int(), name='a'),
+            colander.SchemaNode(
+                colander.Mapping(),
+                colander.SchemaNode(colander.Int(), name='c'),
+                colander.SchemaNode(colander.Int(), name='d'),
+                name='b',
+            ),
+        )
+        result = typ.project(node, {'b': {'c': None}})
+        self.assertEqual([x.name for x in result.children], ['b'])
+        self.assertEqual([x.name for x in result['b'].children], ['c'])
+        self.assertTrue(result['b']['c'] is node['b']['c'])
+        self.assertEqual(result.typ.unknown, 'ignore')
+        self.assertEqual(typ.unknown, 'raise')
+        self.assertEqual(len(node.children), 2)
+        self.assertEqual(len(node['b'].children), 2)
+
+    def test_project_whole_subtree(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ,
+            colander.SchemaNode(colander.Int(), name='a'),
+            colander.SchemaNode(colander.Mapping(), name='b'),
+        )
+        result = typ.project(node, {'b': None})
+        self.assertEqual(result.children, [node['b']])
+
+    def test_project_bad_path(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ, colander.SchemaNode(colander.Int(), name='a')
+        )
+        self.assertRaises(KeyError, typ.project, node, {'z': None})
+
     def test_cstruct_children_cstruct_is_null(self):
         from colander import null
 
@@ -1235,38 +2037,299 @@ class TestMapping(unittest.TestCase):
         self.assertEqual(result, ['abc', null])
 
 
-class TestTuple(unittest.TestCase):
-    def _makeOne(self):
-        from colander import Tuple
-
-        return Tuple()
+class TestTagged(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from colander import Tagged
 
-    def test_deserialize_not_iterable(self):
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        e = invalid_exc(typ.deserialize, node, None)
-        self.assertEqual(e.msg.interpolate(), '"None" is not iterable')
-        self.assertEqual(e.node, node)
+        return Tagged(*arg, **kw)
 
-    def test_deserialize_no_subnodes(self):
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        result = typ.deserialize(node, ())
-        self.assertEqual(result, ())
+    def _makeSchema(self, typ=None, name='event'):
+        class Click(colander.MappingSchema):
+            x = colander.SchemaNode(colander.Int())
+            y = colander.SchemaNode(colander.Int(), missing=0)
 
-    def test_deserialize_null(self):
+        class Key(colander.MappingSchema):
+            type = colander.SchemaNode(colander.String())
+            code = colander.SchemaNode(colander.String())
 
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        result = typ.deserialize(node, colander.null)
-        self.assertEqual(result, colander.null)
+        class Event(colander.TaggedSchema):
+            click = Click()
+            key = Key(colander.Mapping(unknown='raise'))
 
-    def test_deserialize_ok(self):
-        node = DummySchemaNode(None)
-        node.children = [DummySchemaNode(None, name='a')]
-        typ = self._makeOne()
-        result = typ.deserialize(node, ('a',))
-        self.assertEqual(result, ('a',))
+        if typ is None:
+            return Event(name=name)
+        return Event(typ, name=name)
+
+    def test_deserialize(self):
+        schema = self._makeSchema()
+        self.assertEqual(
+            schema.deserialize({'type': 'click', 'x': '1'}),
+            {'type': 'click', 'x': 1, 'y': 0},
+        )
+        self.assertEqual(
+            schema.deserialize({'type': 'key', 'code': 'a'}),
+            {'type': 'key', 'code': 'a'},
+        )
+        self.assertIs(
+            schema.typ.deserialize(schema, colander.null), colander.null
+        )
+
+    def test_deserialize_key(self):
+        schema = self._makeSchema(self._makeOne('kind'))
+        self.assertEqual(schema.typ.key, 'kind')
+        self.assertEqual(
+            schema.deserialize({'kind': 'click', 'x': '1', 'y': '2'}),
+            {'kind': 'click', 'x': 1, 'y': 2},
+        )
+
+    def test_deserialize_errors(self):
+        schema = self._makeSchema()
+        e = invalid_exc(schema.deserialize, {'type': 'click', 'x': 'a'})
+        self.assertIs(e.node, schema)
+        self.assertEqual(e.asdict(), {'event.x': '"a" is not a number'})
+        e = invalid_exc(
+            schema.deserialize, {'type': 'key', 'code': 'a', 'x': 1}
+        )
+        self.assertIsInstance(e, colander.UnsupportedFields)
+        self.assertEqual(e.fields, {'x': 1})
+        self.assertIs(e.node, schema)
+        e = invalid_exc(schema.deserialize, {'x': '1'})
+        self.assertEqual(e.asdict(), {'event.type': 'Required'})
+        e = invalid_exc(schema.deserialize, {'type': 'drag'})
+        self.assertEqual(
+            e.asdict(), {'event.type': '"drag" is not one of click, key'}
+        )
+        e = invalid_exc(schema.deserialize, {'type': ['click']})
+        self.assertEqual(
+            e.asdict(),
+            {'event.type': '"[\'click\']" is not one of click, key'},
+        )
+        e = invalid_exc(schema.deserialize, 'click')
+        self.assertTrue(
+            e.msg.interpolate().startswith('"click" is not a mapping type')
+        )
+
+    def test_variants_changed(self):
+        schema = self._makeSchema()
+        schema.deserialize({'type': 'click', 'x': '1'})
+        schema['click'].name = 'press'
+        self.assertEqual(
+            schema.deserialize({'type': 'press', 'x': '1'}),
+            {'type': 'press', 'x': 1, 'y': 0},
+        )
+        self.assertRaises(
+            colander.Invalid, schema.deserialize, {'type': 'click', 'x': '1'}
+        )
+        del schema['press']
+        self.assertRaises(
+            colander.Invalid, schema.deserialize, {'type': 'press', 'x': '1'}
+        )
+        schema.add(colander.SchemaNode(colander.Mapping(), name='scroll'))
+        self.assertEqual(
+            schema.deserialize({'type': 'scroll'}), {'type': 'scroll'}
+        )
+
+    def test_serialize(self):
+        schema = self._makeSchema()
+        self.assertEqual(
+            schema.serialize({'type': 'click', 'x': 1}),
+            {'type': 'click', 'x': '1', 'y': colander.null},
+        )
+        self.assertEqual(
+            schema.serialize({'type': 'key', 'code': 'a'}),
+            {'type': 'key', 'code': 'a'},
+        )
+        self.assertIs(schema.serialize(colander.null), colander.null)
+        e = invalid_exc(schema.serialize, {'type': 'click', 'x': 'a'})
+        self.assertIs(e.node, schema)
+        e = invalid_exc(schema.serialize, {'x': 1})
+        self.assertEqual(e.asdict(), {'event.type': 'Required'})
+
+    def test_serialize_object(self):
+        from colander.objects import Object
+
+        schema = self._makeSchema()
+        schema['click'].typ = Object()
+        click = schema.deserialize({'type': 'click', 'x': '1'})
+        self.assertEqual((click.x, click.y), (1, 0))
+        self.assertFalse(hasattr(click, 'type'))
+        self.assertRaises(colander.Invalid, schema.serialize, click)
+
+        class Click:
+            type = 'click'
+            x = 1
+
+        self.assertEqual(
+            schema.serialize(Click()),
+            {'type': 'click', 'x': '1', 'y': colander.null},
+        )
+        self.assertIsNone(schema.check_appstruct(Click()))
+
+    def test_try_deserialize(self):
+        schema = colander.SchemaNode(
+            colander.Sequence(), self._makeSchema(name='')
+        )
+        cstruct = [
+            {'type': 'click', 'x': 'a'},
+            {'type': 'key', 'code': 'a'},
+            {'type': 'drag'},
+            'x',
+        ]
+        self.assertEqual(
+            schema.try_deserialize(cstruct[1:2]),
+            ([{'type': 'key', 'code': 'a'}], None),
+        )
+        expected = {
+            '0.x': '"a" is not a number',
+            '2.type': '"drag" is not one of click, key',
+            '3': '"x" is not a mapping type: '
+            'Does not implement dict-like functionality.',
+        }
+        self.assertEqual(schema.try_deserialize(cstruct)[1].asdict(), expected)
+        self.assertEqual(schema.validate(cstruct).asdict(), expected)
+        self.assertIsNone(schema.validate(cstruct[1:2]))
+        self.assertEqual(
+            schema.try_deserialize([colander.null])[1].asdict(),
+            {'0': 'Required'},
+        )
+
+    def test_check_appstruct(self):
+        schema = self._makeSchema()
+        self.assertIsNone(schema.check_appstruct({'type': 'click', 'x': 1}))
+        self.assertEqual(
+            schema._check_appstruct({'type': 'click', 'x': 1.5}),
+            ({'type': 'click', 'x': 1, 'y': 0}, None),
+        )
+        self.assertEqual(
+            schema.check_appstruct({'type': 'click', 'x': 'a'}).asdict(),
+            {'event.x': '"a" is not a number'},
+        )
+        self.assertEqual(
+            schema.check_appstruct({'type': 'drag'}).asdict(),
+            {'event.type': '"drag" is not one of click, key'},
+        )
+        self.assertEqual(
+            schema.check_appstruct(colander.null).asdict(),
+            {'event': 'Required'},
+        )
+
+    def test_subclass(self):
+        from colander import Tagged
+
+        class Custom(Tagged):
+            def serialize(self, node, appstruct):
+                return super().serialize(node, appstruct)
+
+            def deserialize(self, node, cstruct):
+                return super().deserialize(node, cstruct)
+
+        schema = self._makeSchema(Custom())
+        self.assertEqual(
+            schema.try_deserialize({'type': 'key', 'code': 'a'}),
+            ({'type': 'key', 'code': 'a'}, None),
+        )
+        self.assertEqual(
+            schema.validate({'type': 'click'}).asdict(),
+            {'event.x': 'Required'},
+        )
+        self.assertIsNone(schema.check_appstruct({'type': 'click', 'x': 1}))
+
+    def test_cstruct_children(self):
+        schema = self._makeSchema()
+        cstruct = {'type': 'key', 'code': 'a'}
+        click = {'x': colander.null, 'y': colander.null}
+        self.assertEqual(schema.cstruct_children(cstruct), [click, cstruct])
+        key = {'type': colander.null, 'code': colander.null}
+        self.assertEqual(schema.cstruct_children(colander.null), [click, key])
+        self.assertEqual(schema.cstruct_children({}), [click, key])
+
+    def test_flatten(self):
+        schema = self._makeSchema()
+        appstruct = {'type': 'click', 'x': 1, 'y': 2}
+        fstruct = {'event.type': 'click', 'event.x': 1, 'event.y': 2}
+        self.assertEqual(schema.flatten(appstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+        appstruct = {'type': 'key', 'code': 'a'}
+        fstruct = {'event.type': 'key', 'event.code': 'a'}
+        self.assertEqual(schema.flatten(appstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+        schema.name = ''
+        self.assertEqual(
+            schema.flatten(appstruct), {'type': 'key', 'code': 'a'}
+        )
+        self.assertEqual(
+            schema.unflatten({'type': 'key', 'code': 'a'}), appstruct
+        )
+
+    def test_flatten_nested(self):
+        schema = colander.SchemaNode(
+            colander.Mapping(),
+            self._makeSchema(),
+            colander.SchemaNode(
+                colander.Sequence(), self._makeSchema(name=''), name='events'
+            ),
+        )
+        appstruct = {
+            'event': {'type': 'key', 'code': 'a'},
+            'events': [{'type': 'click', 'x': 1, 'y': 2}],
+        }
+        fstruct = schema.flatten(appstruct)
+        self.assertEqual(
+            fstruct,
+            {
+                'event.type': 'key',
+                'event.code': 'a',
+                'events.0.type': 'click',
+                'events.0.x': 1,
+                'events.0.y': 2,
+            },
+        )
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+
+    def test_get_set_value(self):
+        schema = self._makeSchema()
+        appstruct = {'type': 'click', 'x': 1, 'y': 2}
+        self.assertEqual(schema.get_value(appstruct, 'x'), 1)
+        self.assertEqual(schema.get_value(appstruct, 'type'), 'click')
+        schema.set_value(appstruct, 'y', 3)
+        self.assertEqual(appstruct, {'type': 'click', 'x': 1, 'y': 3})
+        self.assertRaises(
+            colander.Invalid, schema.get_value, {'type': 'drag'}, 'x'
+        )
+
+
+class TestTuple(unittest.TestCase):
+    def _makeOne(self):
+        from colander import Tuple
+
+        return Tuple()
+
+    def test_deserialize_not_iterable(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, None)
+        self.assertEqual(e.msg.interpolate(), '"None" is not iterable')
+        self.assertEqual(e.node, node)
+
+    def test_deserialize_no_subnodes(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, ())
+        self.assertEqual(result, ())
+
+    def test_deserialize_null(self):
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, colander.null)
+        self.assertEqual(result, colander.null)
+
+    def test_deserialize_ok(self):
+        node = DummySchemaNode(None)
+        node.children = [DummySchemaNode(None, name='a')]
+        typ = self._makeOne()
+        result = typ.deserialize(node, ('a',))
+        self.assertEqual(result, ('a',))
 
     def test_deserialize_toobig(self):
         node = DummySchemaNode(None)
@@ -1455,6 +2518,34 @@ class TestTuple(unittest.TestCase):
         ]
         self.assertRaises(KeyError, typ.get_value, node, (1, 2), 'foobar')
 
+    def test_project(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ,
+            colander.SchemaNode(colander.Int(), name='a'),
+            colander.SchemaNode(
+                colander.Mapping(),
+                colander.SchemaNode(colander.Int(), name='c'),
+                colander.SchemaNode(colander.Int(), name='d'),
+                name='b',
+            ),
+        )
+        result = typ.project(node, {'b': {'d': None}})
+        self.assertEqual([x.name for x in result.children], ['a', 'b'])
+        self.assertTrue(result['a'] is node['a'])
+        self.assertEqual([x.name for x in result['b'].children], ['d'])
+
+    def test_project_bad_path(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ, colander.SchemaNode(colander.Int(), name='a')
+        )
+        self.assertRaises(KeyError, typ.project, node, {'z': None})
+
     def test_cstruct_children_cstruct_is_null(self):
         from colander import null
 
@@ -1757,6 +2848,21 @@ class TestSequence(unittest.TestCase):
         )
         self.assertEqual(result, ['a', 'b'])
 
+    def test_unflatten_nested(self):
+        from colander import Mapping
+
+        node = DummySchemaNode(None, name='node')
+        item = DummySchemaNode(Mapping(), name='foo')
+        item.children = [DummySchemaNode(DummyType(), name='a')]
+        node.children = [item]
+        typ = self._makeOne()
+        result = typ.unflatten(
+            node,
+            ['node.0', 'node.0.a', 'node.1.a'],
+            {'node.0': {}, 'node.0.a': 1, 'node.1.a': 2},
+        )
+        self.assertEqual(result, [{'a': 1}, {'a': 2}])
+
     def test_setvalue(self):
         typ = self._makeOne()
         node1 = DummySchemaNode(typ, name='seq1')
@@ -1777,6 +2883,33 @@ class TestSequence(unittest.TestCase):
         self.assertEqual(typ.get_value(node1, appstruct, '1'), [3, 4])
         self.assertEqual(typ.get_value(node1, appstruct, '1.0'), 3)
 
+    def test_project(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ,
+            colander.SchemaNode(
+                colander.Mapping(),
+                colander.SchemaNode(colander.Int(), name='a'),
+                colander.SchemaNode(colander.Int(), name='b'),
+                name='item',
+            ),
+        )
+        result = typ.project(node, {'*': {'b': None}})
+        self.assertEqual([x.name for x in result['item'].children], ['b'])
+        result = typ.project(node, {'*': None})
+        self.assertTrue(result.children[0] is node.children[0])
+
+    def test_project_not_wildcard(self):
+        import colander
+
+        typ = self._makeOne()
+        node = colander.SchemaNode(
+            typ, colander.SchemaNode(colander.Int(), name='a')
+        )
+        self.assertRaises(KeyError, typ.project, node, {'0': None})
+
     def test_cstruct_children_cstruct_is_null(self):
         from colander import SequenceItems, null
 
@@ -1792,63 +2925,331 @@ class TestSequence(unittest.TestCase):
         self.assertEqual(result, SequenceItems(['a']))
 
 
-class TestString(unittest.TestCase):
-    def _makeOne(self, encoding=None, allow_empty=False):
-        from colander import String
+class TestMap(unittest.TestCase):
+    def _makeOne(self, *arg, **kw):
+        from colander import Map
 
-        return String(encoding, allow_empty)
+        return Map(*arg, **kw)
 
-    def test_alias(self):
-        from colander import Str, String
+    def _makeSchema(self, typ=None, key=None, name='stock'):
+        if key is None:
+            key = colander.SchemaNode(colander.String(), name='sku')
+        value = colander.SchemaNode(
+            colander.Int(), name='quantity', validator=colander.Range(0)
+        )
+        if typ is None:
+            typ = self._makeOne()
+        return colander.SchemaNode(typ, key, value, name=name)
+
+    def _makeIntKeys(self, typ=None):
+        key = colander.SchemaNode(colander.Int(), name='id')
+        value = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(colander.String(), name='name'),
+            name='item',
+        )
+        if typ is None:
+            typ = self._makeOne()
+        return colander.SchemaNode(typ, key, value, name='items')
 
-        self.assertEqual(Str, String)
+    def test_deserialize(self):
+        schema = self._makeSchema()
+        self.assertEqual(
+            schema.deserialize({'a': '1', 'b': '2'}), {'a': 1, 'b': 2}
+        )
+        self.assertEqual(schema.deserialize({}), {})
+        self.assertIs(
+            schema.typ.deserialize(schema, colander.null), colander.null
+        )
+        schema = self._makeIntKeys()
+        self.assertEqual(
+            schema.deserialize({'1': {'name': 'a'}, '02': {'name': 'b'}}),
+            {1: {'name': 'a'}, 2: {'name': 'b'}},
+        )
 
-    def test_deserialize_emptystring(self):
-        from colander import null
+    def test_deserialize_errors(self):
+        schema = self._makeSchema()
+        e = invalid_exc(
+            schema.deserialize, {'a': 'x', 'b': '-1', 'c': '1', 3: '1'}
+        )
+        self.assertEqual(
+            e.asdict(),
+            {
+                'stock.a': '"x" is not a number',
+                'stock.b': '-1 is less than minimum value 0',
+                'stock.3': "3 is not a string: {'sku': ''}",
+            },
+        )
+        schema = self._makeIntKeys()
+        e = invalid_exc(schema.deserialize, {'x': {'name': 'a'}, '1': {}})
+        self.assertEqual(
+            e.asdict(),
+            {'items.x': '"x" is not a number', 'items.1.name': 'Required'},
+        )
+        e = invalid_exc(schema.deserialize, ['x'])
+        self.assertTrue(
+            e.msg.interpolate().startswith('"[\'x\']" is not a mapping type')
+        )
 
-        node = DummySchemaNode(None)
-        typ = self._makeOne(None)
-        result = typ.deserialize(node, '')
-        self.assertEqual(result, null)
-        typ = self._makeOne(None, allow_empty=True)
-        result = typ.deserialize(node, '')
-        self.assertEqual(result, '')
+    def test_plain_keys(self):
+        schema = self._makeSchema()
+        self.assertTrue(schema.typ._plain_keys(schema))
+        schema['sku'].validator = colander.Length(max=1)
+        self.assertFalse(schema.typ._plain_keys(schema))
+        self.assertEqual(
+            invalid_exc(schema.deserialize, {'ab': '1'}).asdict(),
+            {'stock.ab': 'Longer than maximum length 1'},
+        )
+        schema = self._makeSchema(
+            key=colander.SchemaNode(colander.String(encoding='utf-8'))
+        )
+        self.assertFalse(schema.typ._plain_keys(schema))
+        self.assertEqual(schema.serialize({'a': 1}), {b'a': '1'})
 
-    def test_deserialize_uncooperative(self):
-        val = Uncooperative()
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        e = invalid_exc(typ.deserialize, node, val)
-        self.assertTrue(e.msg)
+    def test_drop(self):
+        def no_x(value):
+            return colander.drop if value == 'x' else value
 
-    def test_deserialize_unicode_from_None(self):
-        uni = str(b'\xe3\x81\x82', 'utf-8')
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        result = typ.deserialize(node, uni)
-        self.assertEqual(result, uni)
+        schema = self._makeSchema()
+        schema['sku'].preparer = no_x
+        schema['quantity'].missing = colander.drop
+        cstruct = {'a': colander.null, 'b': colander.drop, 'x': '1', 'c': '1'}
+        self.assertEqual(schema.deserialize(cstruct), {'c': 1})
+        self.assertEqual(schema.try_deserialize(cstruct), ({'c': 1}, None))
+        schema['quantity'] = colander.SchemaNode(
+            colander.String(), preparer=no_x
+        )
+        self.assertEqual(schema.deserialize({'a': 'x', 'b': 'y'}), {'b': 'y'})
 
-    def test_deserialize_nonunicode_from_None(self):
+    def test_size(self):
+        schema = self._makeSchema(self._makeOne(min_len=1, max_len=2))
+        self.assertEqual(schema.deserialize({'a': '1'}), {'a': 1})
+        e = invalid_exc(schema.deserialize, {})
+        self.assertEqual(
+            e.asdict(), {'stock': 'Shorter than minimum length 1'}
+        )
+        cstruct = {'a': 'x', 'b': 'x', 'c': 'x'}
+        e = invalid_exc(schema.deserialize, cstruct)
+        self.assertEqual(e.asdict(), {'stock': 'Longer than maximum length 2'})
+        self.assertEqual(schema.validate(cstruct).asdict(), e.asdict())
+        self.assertRaises(colander.Invalid, schema.serialize, {})
 
-        value = object()
-        node = DummySchemaNode(None)
-        typ = self._makeOne()
-        self.assertRaises(colander.Invalid, typ.deserialize, node, value)
+    def test_serialize(self):
+        schema = self._makeSchema()
+        self.assertEqual(
+            schema.serialize({'a': 1, 'b': 2}), {'a': '1', 'b': '2'}
+        )
+        self.assertIs(schema.serialize(colander.null), colander.null)
+        schema = self._makeIntKeys()
+        self.assertEqual(
+            schema.serialize({1: {'name': 'a'}}), {'1': {'name': 'a'}}
+        )
+        schema['item'].default = colander.drop
+        self.assertEqual(schema.serialize({1: colander.null}), {})
+        e = invalid_exc(schema.serialize, {'x': {}})
+        self.assertEqual(e.asdict(), {'items.x': '"x" is not a number'})
 
-    def test_deserialize_from_utf8(self):
-        uni = str(b'\xe3\x81\x82', 'utf-8')
-        utf8 = uni.encode('utf-8')
-        node = DummySchemaNode(None)
-        typ = self._makeOne('utf-8')
-        result = typ.deserialize(node, utf8)
-        self.assertEqual(result, uni)
+    def test_try_deserialize(self):
+        schema = self._makeIntKeys()
+        self.assertEqual(
+            schema.try_deserialize({'1': {'name': 'a'}}),
+            ({1: {'name': 'a'}}, None),
+        )
+        cstruct = {'1': {}, 'x': {'name': 'a'}, '2': {'name': 'b'}}
+        expected = {
+            'items.1.name': 'Required',
+            'items.x': '"x" is not a number',
+        }
+        self.assertEqual(schema.try_deserialize(cstruct)[1].asdict(), expected)
+        self.assertEqual(schema.validate(cstruct).asdict(), expected)
+        self.assertIsNone(schema.validate({'1': {'name': 'a'}}))
+        self.assertEqual(
+            schema.try_deserialize('x')[1].asdict(),
+            {
+                'items': '"x" is not a mapping type: '
+                'Does not implement dict-like functionality.'
+            },
+        )
 
-    def test_deserialize_from_utf16(self):
-        uni = str(b'\xe3\x81\x82', 'utf-8')
-        utf16 = uni.encode('utf-16')
-        node = DummySchemaNode(None)
-        typ = self._makeOne('utf-16')
-        result = typ.deserialize(node, utf16)
+    def test_check_appstruct(self):
+        schema = self._makeIntKeys()
+        self.assertIsNone(schema.check_appstruct({1: {'name': 'a'}}))
+        self.assertEqual(
+            schema._check_appstruct({1.5: {'name': 'a'}}),
+            ({1: {'name': 'a'}}, None),
+        )
+        self.assertEqual(
+            schema.check_appstruct({'x': {'name': 'a'}, 2: {}}).asdict(),
+            {'items.x': '"x" is not a number', 'items.2.name': 'Required'},
+        )
+        self.assertEqual(
+            schema.check_appstruct(colander.null).asdict(),
+            {'items': 'Required'},
+        )
+        schema['item'].default = colander.drop
+        self.assertEqual(
+            schema._check_appstruct({1: colander.null}), ({}, None)
+        )
+
+    def test_subclass(self):
+        from colander import Map
+
+        class Custom(Map):
+            def serialize(self, node, appstruct):
+                return super().serialize(node, appstruct)
+
+            def deserialize(self, node, cstruct):
+                return super().deserialize(node, cstruct)
+
+        schema = self._makeSchema(Custom())
+        self.assertEqual(schema.try_deserialize({'a': '1'}), ({'a': 1}, None))
+        self.assertEqual(
+            schema.validate({'a': 'x'}).asdict(),
+            {'stock.a': '"x" is not a number'},
+        )
+        self.assertIsNone(schema.check_appstruct({'a': 1}))
+
+    def test_flatten(self):
+        schema = self._makeSchema()
+        appstruct = {'a': 1, 'b': 2}
+        fstruct = {'stock.a': 1, 'stock.b': 2}
+        self.assertEqual(schema.flatten(appstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+        schema = self._makeIntKeys()
+        appstruct = {1: {'name': 'a'}, 2: {'name': 'b'}}
+        fstruct = {'items.1.name': 'a', 'items.2.name': 'b'}
+        self.assertEqual(schema.flatten(appstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+        schema.name = ''
+        schema['item'].name = ''
+        self.assertEqual(
+            schema.flatten(appstruct), {'1.name': 'a', '2.name': 'b'}
+        )
+        self.assertEqual(
+            schema.unflatten({'1.name': 'a', '2.name': 'b'}), appstruct
+        )
+
+    def test_flatten_nested(self):
+        schema = colander.SchemaNode(
+            colander.Sequence(), self._makeSchema(name=''), name='stocks'
+        )
+        appstruct = [{'a': 1}, {'b': 2, 'c': 3}]
+        fstruct = {'stocks.0.a': 1, 'stocks.1.b': 2, 'stocks.1.c': 3}
+        self.assertEqual(schema.flatten(appstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), appstruct)
+
+    def test_get_set_value(self):
+        schema = self._makeIntKeys()
+        appstruct = {1: {'name': 'a'}, 2: {'name': 'b'}}
+        self.assertEqual(schema.get_value(appstruct, '1.name'), 'a')
+        self.assertEqual(schema.get_value(appstruct, '2'), {'name': 'b'})
+        schema.set_value(appstruct, '2.name', 'c')
+        schema.set_value(appstruct, '3', {'name': 'd'})
+        self.assertEqual(
+            appstruct,
+            {1: {'name': 'a'}, 2: {'name': 'c'}, 3: {'name': 'd'}},
+        )
+        schema = self._makeSchema()
+        self.assertEqual(schema.get_value({'1': 1}, '1'), 1)
+
+    def test_deserialize_patch(self):
+        schema = self._makeIntKeys()
+        appstruct = {1: {'name': 'a'}, 2: {'name': 'b'}}
+        self.assertEqual(
+            schema.deserialize_patch(appstruct, {'2.name': 'c'}),
+            ({1: {'name': 'a'}, 2: {'name': 'c'}}, None),
+        )
+        schema['item'].missing = colander.drop
+        self.assertEqual(
+            schema.deserialize_patch(appstruct, {'2': colander.null}),
+            ({1: {'name': 'a'}}, None),
+        )
+        result, error = schema.deserialize_patch(appstruct, {'1.name': ''})
+        self.assertEqual(error.asdict(), {'items.1.name': 'Required'})
+
+
+class TestMapSchema(unittest.TestCase):
+    def test_it(self):
+        class Stock(colander.MapSchema):
+            sku = colander.SchemaNode(colander.String())
+            quantity = colander.SchemaNode(colander.Int())
+
+        schema = Stock()
+        self.assertIsInstance(schema.typ, colander.Map)
+        self.assertEqual(schema.deserialize({'a': '1'}), {'a': 1})
+        cloned = schema.clone()
+        self.assertEqual([node.name for node in cloned], ['sku', 'quantity'])
+
+    def test_imperative(self):
+        schema = colander.MapSchema(
+            colander.SchemaNode(colander.String(), name='key'),
+            colander.SchemaNode(colander.Int(), name='value'),
+        )
+        self.assertEqual(schema.clone().deserialize({'a': '1'}), {'a': 1})
+        self.assertRaises(
+            colander.Invalid,
+            colander.MapSchema,
+            colander.SchemaNode(colander.String()),
+        )
+
+
+class TestString(unittest.TestCase):
+    def _makeOne(self, encoding=None, allow_empty=False):
+        from colander import String
+
+        return String(encoding, allow_empty)
+
+    def test_alias(self):
+        from colander import Str, String
+
+        self.assertEqual(Str, String)
+
+    def test_deserialize_emptystring(self):
+        from colander import null
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne(None)
+        result = typ.deserialize(node, '')
+        self.assertEqual(result, null)
+        typ = self._makeOne(None, allow_empty=True)
+        result = typ.deserialize(node, '')
+        self.assertEqual(result, '')
+
+    def test_deserialize_uncooperative(self):
+        val = Uncooperative()
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, val)
+        self.assertTrue(e.msg)
+
+    def test_deserialize_unicode_from_None(self):
+        uni = str(b'\xe3\x81\x82', 'utf-8')
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, uni)
+        self.assertEqual(result, uni)
+
+    def test_deserialize_nonunicode_from_None(self):
+
+        value = object()
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        self.assertRaises(colander.Invalid, typ.deserialize, node, value)
+
+    def test_deserialize_from_utf8(self):
+        uni = str(b'\xe3\x81\x82', 'utf-8')
+        utf8 = uni.encode('utf-8')
+        node = DummySchemaNode(None)
+        typ = self._makeOne('utf-8')
+        result = typ.deserialize(node, utf8)
+        self.assertEqual(result, uni)
+
+    def test_deserialize_from_utf16(self):
+        uni = str(b'\xe3\x81\x82', 'utf-8')
+        utf16 = uni.encode('utf-16')
+        node = DummySchemaNode(None)
+        typ = self._makeOne('utf-16')
+        result = typ.deserialize(node, utf16)
         self.assertEqual(result, uni)
 
     def test_deserialize_from_nonstring_obj(self):
@@ -1925,6 +3326,119 @@ class TestString(unittest.TestCase):
         self.assertEqual(result, utf8)
 
 
+class TestBytes(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from colander import Bytes
+
+        return Bytes(**kw)
+
+    def test_deserialize_bytes(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        for value in (b'abc', bytearray(b'abc'), memoryview(b'abc'), b''):
+            self.assertIs(typ.deserialize(node, value), value)
+        self.assertIs(typ.deserialize(node, colander.null), colander.null)
+
+    def test_deserialize_base64(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, 'aGVsbG8=')
+        self.assertEqual(result, b'hello')
+        self.assertIs(type(result), bytearray)
+        self.assertEqual(typ.deserialize(node, 'aGk='), b'hi')
+        self.assertEqual(typ.deserialize(node, 'aGV5'), b'hey')
+        self.assertIs(typ.deserialize(node, ''), colander.null)
+
+    def test_deserialize_chunks(self):
+        import base64
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        typ.chunk_size = 10
+        for size in range(20):
+            data = bytes(range(256 - size, 256))
+            text = base64.b64encode(data).decode('ascii')
+            if text:
+                self.assertEqual(typ.deserialize(node, text), data)
+        self.assertRaises(colander.Invalid, typ.deserialize, node, 'YQ==YWJj')
+
+    def test_deserialize_invalid_base64(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        for text in (
+            'aGVsbG8',
+            'aGV!bG8=',
+            'aGVs\nbG8=',
+            'a===',
+            '=aGk',
+            'éGVs',
+        ):
+            e = invalid_exc(typ.deserialize, node, text)
+            self.assertEqual(
+                e.msg.interpolate(), 'Invalid Base64 encoded data'
+            )
+
+    def test_deserialize_not_bytes(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, 1)
+        self.assertEqual(e.msg.interpolate(), '"1" is not a bytes-like object')
+
+    def test_deserialize_size(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(min_len=2, max_len=3)
+        self.assertEqual(typ.deserialize(node, 'aGV5'), b'hey')
+        e = invalid_exc(typ.deserialize, node, 'aA==')
+        self.assertEqual(e.msg.interpolate(), 'Shorter than minimum length 2')
+        # checked before the text is decoded
+        e = invalid_exc(typ.deserialize, node, '!' * 8)
+        self.assertEqual(e.msg.interpolate(), 'Longer than maximum length 3')
+        e = invalid_exc(typ.deserialize, node, b'abcd')
+        self.assertEqual(e.msg.interpolate(), 'Longer than maximum length 3')
+
+    def test_serialize(self):
+        import array
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        self.assertEqual(typ.serialize(node, b'hello'), 'aGVsbG8=')
+        self.assertEqual(typ.serialize(node, bytearray(b'hi')), 'aGk=')
+        self.assertEqual(typ.serialize(node, memoryview(b'hey')), 'aGV5')
+        self.assertEqual(
+            typ.serialize(node, memoryview(b'abcdef')[::2]), 'YWNl'
+        )
+        self.assertEqual(
+            typ.serialize(node, array.array('B', [104, 105])), 'aGk='
+        )
+        self.assertEqual(typ.serialize(node, b''), '')
+        self.assertIs(typ.serialize(node, colander.null), colander.null)
+        e = invalid_exc(typ.serialize, node, 'hello')
+        self.assertEqual(
+            e.msg.interpolate(), '"hello" is not a bytes-like object'
+        )
+
+    def test_round_trip(self):
+        node = colander.SchemaNode(self._makeOne())
+        data = bytes(range(256))
+        self.assertEqual(node.deserialize(node.serialize(data)), data)
+        self.assertEqual(node.serialize_json(b'hi'), '"aGk="')
+
+    def test_check_appstruct(self):
+        node = colander.SchemaNode(self._makeOne(max_len=3))
+        self.assertIsNone(node.check_appstruct(b'abc'))
+        self.assertEqual(
+            node.check_appstruct(b'abcd').asdict(),
+            {'': 'Longer than maximum length 3'},
+        )
+        self.assertEqual(
+            node.check_appstruct('abc').asdict(),
+            {'': '"abc" is not a bytes-like object'},
+        )
+        self.assertEqual(
+            node.check_appstruct(colander.null).asdict(), {'': 'Required'}
+        )
+
+
 class TestInteger(unittest.TestCase):
     def _makeOne(self, strict=False):
         from colander import Integer
@@ -2221,6 +3735,191 @@ class TestMoney(unittest.TestCase):
         self.assertEqual(result, decimal.Decimal('1.01'))
 
 
+class TestFloatArray(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from colander import FloatArray
+
+        return FloatArray(**kw)
+
+    def test_serialize_null(self):
+        val = colander.null
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.serialize(node, val)
+        self.assertEqual(result, colander.null)
+
+    def test_serialize_array(self):
+        import array
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.serialize(node, array.array('d', [1.5, 2]))
+        self.assertEqual(result, [1.5, 2.0])
+
+    def test_serialize_list(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.serialize(node, [1, '2.5'])
+        self.assertEqual(result, [1.0, 2.5])
+
+    def test_serialize_fails(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.serialize, node, [1, 'abc'])
+        self.assertTrue(e.msg)
+
+    def test_deserialize_null(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, colander.null)
+        self.assertEqual(result, colander.null)
+
+    def test_deserialize(self):
+        import array
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, ['1', 2.5, 3])
+        self.assertEqual(result, array.array('d', [1.0, 2.5, 3.0]))
+
+    def test_deserialize_iterator(self):
+        import array
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, iter(['1', '2']))
+        self.assertEqual(result, array.array('d', [1.0, 2.0]))
+
+    def test_deserialize_iterator_fails(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, iter(['1', 'x']))
+        self.assertEqual(e.msg.mapping, {'val': 'x'})
+
+    def test_deserialize_retried(self):
+        class Flaky:
+            calls = 0
+
+            def __float__(self):
+                self.calls += 1
+                if self.calls == 1:
+                    raise ValueError
+                return 1.0
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, [Flaky()])
+        self.assertEqual(result.tolist(), [1.0])
+
+    def test_deserialize_typecode(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(typecode='f')
+        result = typ.deserialize(node, [1])
+        self.assertEqual(result.typecode, 'f')
+
+    def test_deserialize_not_iterable(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        for value in (1, 'abc', b'abc', {'a': 1}):
+            e = invalid_exc(typ.deserialize, node, value)
+            self.assertEqual(e.msg.default, '"${val}" is not iterable')
+
+    def test_deserialize_not_a_number(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, [1, 'abc', None])
+        self.assertEqual(e.msg.default, '"${val}" is not a number')
+        self.assertEqual(e.msg.mapping, {'val': 'abc'})
+
+    def test_deserialize_min_len(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(min_len=2)
+        self.assertEqual(len(typ.deserialize(node, [1, 2])), 2)
+        e = invalid_exc(typ.deserialize, node, [1])
+        self.assertEqual(e.msg.mapping, {'min': 2})
+
+    def test_deserialize_max_len(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(max_len=1)
+        self.assertEqual(len(typ.deserialize(node, [])), 0)
+        e = invalid_exc(typ.deserialize, node, [1, 2])
+        self.assertEqual(e.msg.mapping, {'max': 1})
+
+    def test_deserialize_min(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(min=0)
+        self.assertEqual(len(typ.deserialize(node, [])), 0)
+        self.assertEqual(len(typ.deserialize(node, [0, 1])), 2)
+        e = invalid_exc(typ.deserialize, node, [1, -1, -2])
+        self.assertEqual(e.msg.mapping, {'val': -1.0, 'min': 0})
+
+    def test_deserialize_min_leading_nan(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(min=0)
+        self.assertEqual(len(typ.deserialize(node, ['nan', 1])), 2)
+        e = invalid_exc(typ.deserialize, node, ['nan', -1])
+        self.assertEqual(e.msg.mapping, {'val': -1.0, 'min': 0})
+
+    def test_deserialize_max(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(max=10)
+        self.assertEqual(len(typ.deserialize(node, [10, 1])), 2)
+        e = invalid_exc(typ.deserialize, node, [1, 11, 12])
+        self.assertEqual(e.msg.mapping, {'val': 11.0, 'max': 10})
+
+    def test_deserialize_max_leading_nan(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(max=10)
+        self.assertEqual(len(typ.deserialize(node, ['nan', 1])), 2)
+        e = invalid_exc(typ.deserialize, node, ['nan', 11])
+        self.assertEqual(e.msg.mapping, {'val': 11.0, 'max': 10})
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_deserialize_numpy(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(use_numpy=True)
+        result = typ.deserialize(node, ['1', 2])
+        self.assertIsInstance(result, numpy.ndarray)
+        self.assertEqual(result.dtype, numpy.float64)
+        self.assertEqual(result.tolist(), [1.0, 2.0])
+        self.assertEqual(typ.serialize(node, result), [1.0, 2.0])
+
+
+class TestIntArray(unittest.TestCase):
+    def _makeOne(self, **kw):
+        from colander import IntArray
+
+        return IntArray(**kw)
+
+    def test_deserialize(self):
+        import array
+
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        result = typ.deserialize(node, ['1', 2])
+        self.assertEqual(result, array.array('q', [1, 2]))
+
+    def test_deserialize_not_a_number(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne()
+        e = invalid_exc(typ.deserialize, node, ['1.5'])
+        self.assertEqual(e.msg.mapping, {'val': '1.5'})
+
+    def test_deserialize_overflow(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(typecode='b')
+        e = invalid_exc(typ.deserialize, node, [1, 128])
+        self.assertEqual(e.msg.mapping, {'val': 128, 'typecode': 'b'})
+
+    @unittest.skipIf(numpy is None, 'numpy is not installed')
+    def test_deserialize_numpy(self):
+        node = DummySchemaNode(None)
+        typ = self._makeOne(use_numpy=True, min=0)
+        result = typ.deserialize(node, [1, 2])
+        self.assertEqual(result.dtype, numpy.int64)
+        self.assertEqual(typ.serialize(node, result), [1, 2])
+
+
 class TestBoolean(unittest.TestCase):
     def _makeOne(self):
         from colander import Boolean
@@ -3479,197 +5178,1638 @@ class TestSchemaNode(unittest.TestCase):
         node.add(another)
         self.assertEqual(node['another'], another)
 
-    def test___getitem__failure(self):
-        node = self._makeOne(None)
-        self.assertRaises(KeyError, node.__getitem__, 'another')
+    def test___getitem__failure(self):
+        node = self._makeOne(None)
+        self.assertRaises(KeyError, node.__getitem__, 'another')
+
+    def test___delitem__success(self):
+        node = self._makeOne(None)
+        another = self._makeOne(None, name='another')
+        node.add(another)
+        del node['another']
+        self.assertEqual(node.children, [])
+
+    def test___delitem__failure(self):
+        node = self._makeOne(None)
+        self.assertRaises(KeyError, node.__delitem__, 'another')
+
+    def test___setitem__override(self):
+        node = self._makeOne(None)
+        another = self._makeOne(None, name='another')
+        node.add(another)
+        andanother = self._makeOne(None, name='andanother')
+        node['another'] = andanother
+        self.assertEqual(node['another'], andanother)
+        self.assertEqual(andanother.name, 'another')
+
+    def test___setitem__no_override(self):
+        another = self._makeOne(None, name='another')
+        node = self._makeOne(None)
+        node['another'] = another
+        self.assertEqual(node['another'], another)
+        self.assertEqual(node.children[0], another)
+
+    def test___iter__(self):
+        node = self._makeOne(None)
+        node.children = ['a', 'b', 'c']
+        it = node.__iter__()
+        self.assertEqual(list(it), ['a', 'b', 'c'])
+
+    def test___contains__(self):
+        node = self._makeOne(None)
+        another = self._makeOne(None, name='another')
+        node.add(another)
+        self.assertEqual('another' in node, True)
+        self.assertEqual('b' in node, False)
+
+    def test_clone(self):
+        inner_typ = DummyType()
+        outer_typ = DummyType()
+        outer_node = self._makeOne(outer_typ, name='outer')
+        inner_node = self._makeOne(inner_typ, name='inner')
+        outer_node.foo = 1
+        inner_node.foo = 2
+        outer_node.children = [inner_node]
+        outer_clone = outer_node.clone()
+        self.assertFalse(outer_clone is outer_node)
+        self.assertEqual(outer_clone.typ, outer_typ)
+        self.assertEqual(outer_clone.name, 'outer')
+        self.assertEqual(outer_node.foo, 1)
+        self.assertEqual(len(outer_clone.children), 1)
+        inner_clone = outer_clone.children[0]
+        self.assertFalse(inner_clone is inner_node)
+        self.assertEqual(inner_clone.typ, inner_typ)
+        self.assertEqual(inner_clone.name, 'inner')
+        self.assertEqual(inner_clone.foo, 2)
+
+    def test_clone_with_modified_schema_instance(self):
+        class Schema(colander.MappingSchema):
+            n1 = colander.SchemaNode(colander.String())
+            n2 = colander.SchemaNode(colander.String())
+
+        def compare_children(schema, cloned):
+            # children of the clone must match the cloned node's children and
+            # have to be clones themselves.
+            self.assertEqual(len(schema.children), len(cloned.children))
+            for child, child_clone in zip(schema.children, cloned.children):
+                self.assertIsNot(child, child_clone)
+                for name in child.__dict__.keys():
+                    self.assertEqual(
+                        getattr(child, name), getattr(child_clone, name)
+                    )
+
+        # add a child node before cloning
+        schema = Schema()
+        schema.add(colander.SchemaNode(colander.String(), name='n3'))
+        compare_children(schema, schema.clone())
+        # remove a child node before cloning
+        schema = Schema()
+        del schema['n1']
+        compare_children(schema, schema.clone())
+        # reorder children before cloning
+        schema = Schema()
+        schema.children = list(reversed(schema.children))
+        compare_children(schema, schema.clone())
+
+    def test_clone_mapping_references(self):
+        class Schema(colander.MappingSchema):
+            n1 = colander.SchemaNode(colander.Mapping(unknown='preserve'))
+
+        foo = {"n1": {"bar": {"baz": "qux"}}}
+        bar = Schema().serialize(foo)
+        bar["n1"]["bar"]["baz"] = "foobar"
+        self.assertEqual(foo["n1"]["bar"]["baz"], "qux")
+
+    def test_bind(self):
+        from colander import deferred
+
+        inner_typ = DummyType()
+        outer_typ = DummyType()
+
+        def dv(node, kw):
+            self.assertTrue(node.name in ['outer', 'inner'])
+            self.assertTrue('a' in kw)
+            return '123'
+
+        dv = deferred(dv)
+        outer_node = self._makeOne(outer_typ, name='outer', missing=dv)
+        inner_node = self._makeOne(
+            inner_typ, name='inner', validator=dv, missing=dv
+        )
+        outer_node.children = [inner_node]
+        outer_clone = outer_node.bind(a=1)
+        self.assertFalse(outer_clone is outer_node)
+        self.assertEqual(outer_clone.missing, '123')
+        inner_clone = outer_clone.children[0]
+        self.assertFalse(inner_clone is inner_node)
+        self.assertEqual(inner_clone.missing, '123')
+        self.assertEqual(inner_clone.validator, '123')
+
+    def test_bind_with_after_bind(self):
+        from colander import deferred
+
+        inner_typ = DummyType()
+        outer_typ = DummyType()
+
+        def dv(node, kw):
+            self.assertTrue(node.name in ['outer', 'inner'])
+            self.assertTrue('a' in kw)
+            return '123'
+
+        dv = deferred(dv)
+
+        def remove_inner(node, kw):
+            self.assertEqual(kw, {'a': 1})
+            del node['inner']
+
+        outer_node = self._makeOne(
+            outer_typ, name='outer', missing=dv, after_bind=remove_inner
+        )
+        inner_node = self._makeOne(
+            inner_typ, name='inner', validator=dv, missing=dv
+        )
+        outer_node.children = [inner_node]
+        outer_clone = outer_node.bind(a=1)
+        self.assertFalse(outer_clone is outer_node)
+        self.assertEqual(outer_clone.missing, '123')
+        self.assertEqual(len(outer_clone.children), 0)
+        self.assertEqual(len(outer_node.children), 1)
+
+    def test_declarative_name_reassignment(self):
+        # see https://github.com/Pylons/colander/issues/39
+
+        class FnordSchema(colander.Schema):
+            fnord = colander.SchemaNode(
+                colander.Sequence(),
+                colander.SchemaNode(colander.Integer(), name=''),
+                name="fnord[]",
+            )
+
+        schema = FnordSchema()
+        self.assertEqual(schema['fnord[]'].name, 'fnord[]')
+
+    def test_cstruct_children(self):
+        typ = DummyType()
+        typ.cstruct_children = lambda *arg: ['foo']
+        node = self._makeOne(typ)
+        self.assertEqual(node.cstruct_children(None), ['foo'])
+
+    def test_cstruct_children_warning(self):
+        import warnings
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            typ = None
+            node = self._makeOne(typ)
+            self.assertEqual(node.cstruct_children(None), [])
+            self.assertEqual(len(w), 1)
+
+    def test_raise_invalid(self):
+
+        typ = DummyType()
+        node = self._makeOne(typ)
+        self.assertRaises(colander.Invalid, node.raise_invalid, 'Wrong')
+
+
+class TestDeserializePatch(unittest.TestCase):
+    def _makeSchema(self, items_validator=None, validator=None):
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(colander.Int())
+            qty = colander.SchemaNode(
+                colander.Int(),
+                missing=colander.drop,
+                validator=colander.Range(0, 5),
+            )
+
+        class Items(colander.SequenceSchema):
+            item = Item()
+
+        class Pair(colander.TupleSchema):
+            x = colander.SchemaNode(colander.Int())
+            y = colander.SchemaNode(colander.Int(), missing=colander.drop)
+
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            items = Items(validator=items_validator)
+            pair = Pair()
+
+        return Schema(validator=validator)
+
+    def _makeAppstruct(self):
+        return {
+            'name': 'fred',
+            'items': [{'id': 1}, {'id': 2, 'qty': 3}],
+            'pair': (1, 2),
+        }
+
+    def test_success(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        result, error = schema.deserialize_patch(
+            appstruct, {'name': 'bob', 'items.1.qty': '4', 'pair.y': '9'}
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(
+            result,
+            {
+                'name': 'bob',
+                'items': [{'id': 1}, {'id': 2, 'qty': 4}],
+                'pair': (1, 9),
+            },
+        )
+        self.assertEqual(appstruct, self._makeAppstruct())
+        self.assertTrue(result['items'][0] is appstruct['items'][0])
+
+    def test_replace_subtree(self):
+        schema = self._makeSchema()
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'items.0': {'id': '7', 'qty': '1'}}
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(result['items'][0], {'id': 7, 'qty': 1})
+
+    def test_drop(self):
+        schema = self._makeSchema()
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'items.1.qty': colander.null}
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(result['items'], [{'id': 1}, {'id': 2}])
+
+    def test_drop_tuple_element(self):
+        schema = self._makeSchema()
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'pair.y': colander.null}
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(result['pair'], (1, colander.drop))
+
+    def test_drop_sequence_item(self):
+        schema = self._makeSchema()
+        schema['items'].children[0].missing = colander.drop
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'items.0': colander.null}
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(result['items'], [{'id': 2, 'qty': 3}])
+
+    def test_drop_several_sequence_items(self):
+        schema = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(
+                colander.Sequence(),
+                colander.SchemaNode(colander.Int(), missing=colander.drop),
+                name='xs',
+            ),
+        )
+        appstruct = {'xs': list(range(6))}
+        for delta, expected in (
+            ({'xs.2': colander.null, 'xs.3': colander.null}, [0, 1, 4, 5]),
+            ({'xs.2': colander.null, 'xs.3': '9'}, [0, 1, 9, 4, 5]),
+            ({'xs.5': colander.null, 'xs.0': '9'}, [9, 1, 2, 3, 4]),
+        ):
+            result, error = schema.deserialize_patch(appstruct, delta)
+            self.assertEqual(error, None)
+            self.assertEqual(result['xs'], expected)
+        self.assertEqual(appstruct['xs'], list(range(6)))
+        self.assertRaises(
+            KeyError,
+            schema.deserialize_patch,
+            appstruct,
+            {'xs.0': colander.null, 'xs.6': colander.null},
+        )
+
+    def test_drop_sequence_item_validators(self):
+        values = []
+
+        def validator(node, value):
+            values.append(value)
+            if value.get('qty') == 4:
+                raise colander.Invalid(node, 'Four')
+
+        schema = self._makeSchema()
+        item = schema['items'].children[0]
+        item.missing = colander.drop
+        item.validator = validator
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(),
+            {'items.0': colander.null, 'items.1.qty': '4'},
+        )
+        self.assertEqual(result['items'], [{'id': 2, 'qty': 4}])
+        self.assertEqual(values, [{'id': 2, 'qty': 4}])
+        self.assertEqual(error.asdict(), {'items.0': 'Four'})
+        del values[:]
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(),
+            {'items.0': colander.null, 'items.0.qty': '1'},
+        )
+        self.assertEqual(error, None)
+        self.assertEqual(result['items'], [{'id': 2, 'qty': 3}])
+        self.assertEqual(values, [])
+
+    def test_invalid(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        result, error = schema.deserialize_patch(
+            appstruct,
+            {'items.1.qty': '9', 'items.0.id': 'x', 'name': 'bob'},
+        )
+        self.assertEqual(
+            error.asdict(),
+            {
+                'items.0.id': '"x" is not a number',
+                'items.1.qty': '9 is greater than maximum value 5',
+            },
+        )
+        self.assertEqual(result['items'], appstruct['items'])
+        self.assertEqual(result['name'], 'bob')
+        items_error = error.children[0]
+        self.assertTrue(items_error.node is schema['items'])
+        self.assertEqual(items_error.pos, 1)
+        self.assertEqual(len(items_error.children), 2)
+
+    def test_ancestor_validator(self):
+        def validator(node, value):
+            if value[0]['id'] == value[1]['id']:
+                raise colander.Invalid(node, 'Duplicate')
+
+        schema = self._makeSchema(items_validator=validator)
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'items.0.id': '2', 'name': 'bob'}
+        )
+        self.assertEqual(error.asdict(), {'items': 'Duplicate'})
+        self.assertEqual(result['items'][0], {'id': 2})
+
+    def test_ancestor_validator_skipped_on_failure(self):
+        validator = DummyValidator('Wrong')
+        schema = self._makeSchema(items_validator=validator)
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'items.0.id': 'x'}
+        )
+        self.assertEqual(error.asdict(), {'items.0.id': '"x" is not a number'})
+
+    def test_root_validator(self):
+        schema = self._makeSchema(validator=DummyValidatorWithMsgNone())
+        result, error = schema.deserialize_patch(
+            self._makeAppstruct(), {'name': 'bob'}
+        )
+        self.assertTrue(error.node is schema)
+        self.assertEqual(error.children, [])
+        self.assertEqual(result['name'], 'bob')
+
+    def test_unbound_deferred_validator(self):
+        from colander import UnboundDeferredError, deferred
+
+        schema = self._makeSchema(validator=deferred(lambda node, kw: None))
+        self.assertRaises(
+            UnboundDeferredError,
+            schema.deserialize_patch,
+            self._makeAppstruct(),
+            {'name': 'bob'},
+        )
+
+    def test_bad_path(self):
+        schema = self._makeSchema()
+        self.assertRaises(
+            KeyError,
+            schema.deserialize_patch,
+            self._makeAppstruct(),
+            {'nope': 'bob'},
+        )
+        for delta in (
+            {'name.first': 'bob'},
+            {'items.x.id': '1'},
+            {'items.2.id': '1'},
+            {'items.5.qty': '1'},
+            {'items.2': {'id': '1'}},
+        ):
+            self.assertRaises(
+                KeyError,
+                schema.deserialize_patch,
+                self._makeAppstruct(),
+                delta,
+            )
+
+
+class TestTryDeserialize(unittest.TestCase):
+    def _makeSchema(self, unknown='ignore', zero_copy=False):
+        class Custom(colander.SchemaNode):
+            schema_type = colander.Int
+
+            def deserialize(self, cstruct=colander.null):
+                if cstruct == 'custom':
+                    raise colander.Invalid(self, 'custom')
+                return super().deserialize(cstruct)
+
+        class Tags(colander.Mapping):
+            def deserialize(self, node, cstruct):
+                return super().deserialize(node, cstruct)
+
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(colander.Int())
+            qty = colander.SchemaNode(
+                colander.Float(),
+                missing=colander.drop,
+                validator=colander.All(
+                    colander.Range(0, 5), colander.Range(1, 6)
+                ),
+            )
+            name = colander.SchemaNode(
+                colander.String(),
+                missing=colander.drop,
+                validator=colander.Any(
+                    colander.Email(), colander.Regex('^x'), colander.Length(3)
+                ),
+            )
+            kind = colander.SchemaNode(
+                colander.String(),
+                missing='a',
+                validator=colander.OneOf(['a', 'b']),
+            )
+            flag = colander.SchemaNode(
+                colander.Boolean(true_choices=['yes']), missing=False
+            )
+            tags = colander.SchemaNode(
+                Tags(),
+                colander.SchemaNode(colander.Int(), name='x'),
+                missing=colander.drop,
+            )
+
+        class Items(colander.SequenceSchema):
+            item = Item()
+
+        class Pair(colander.TupleSchema):
+            x = colander.SchemaNode(
+                colander.Int(), validator=colander.NoneOf([0])
+            )
+            y = Custom(missing=None)
+
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(
+                colander.String(),
+                preparer=[str.strip, lambda value: value or colander.null],
+                validator=colander.Function(lambda value: value != 'x'),
+            )
+            items = Items(validator=colander.Length(max=3))
+            pair = Pair(missing=colander.drop)
+            url = colander.SchemaNode(
+                colander.String(),
+                missing=colander.drop,
+                validator=colander.url,
+            )
+            data = colander.SchemaNode(
+                colander.String(),
+                missing=colander.drop,
+                validator=colander.DataURL(),
+            )
+            choices = colander.SchemaNode(
+                colander.Set(),
+                missing=colander.drop,
+                validator=colander.ContainsOnly([1, 2]),
+            )
+            size = colander.SchemaNode(
+                colander.Int(), preparer=lambda value: value, missing=0
+            )
+            card = colander.SchemaNode(
+                colander.String(),
+                missing=colander.drop,
+                validator=colander.luhnok,
+            )
+
+        return Schema(colander.Mapping(unknown, zero_copy))
+
+    def _assertSame(self, schema, cstruct):
+        try:
+            expected = schema.deserialize(cstruct)
+        except colander.Invalid as e:
+            appstruct, error = schema.try_deserialize(cstruct)
+            self.assertIs(appstruct, colander.null)
+            self._assertSameError(error, e)
+            return error
+        self.assertEqual(schema.try_deserialize(cstruct), (expected, None))
+
+    def _assertSameError(self, error, expected):
+        self.assertIs(type(error), type(expected))
+        self.assertIs(error.node, expected.node)
+        self.assertEqual(error.pos, expected.pos)
+        self.assertEqual(error.msg, expected.msg)
+        self.assertEqual(error.messages(), expected.messages())
+        self.assertEqual(len(error.children), len(expected.children))
+        for child, expected_child in zip(error.children, expected.children):
+            self._assertSameError(child, expected_child)
+
+    def _makeCstruct(self, **kw):
+        cstruct = {
+            'name': ' fred ',
+            'items': [
+                {'id': '1', 'qty': '2', 'name': 'x@example.com'},
+                {'id': '2', 'kind': 'b', 'flag': 'yes', 'tags': {'x': '1'}},
+            ],
+            'pair': ('1', '2'),
+            'card': '79927398713',
+            'url': 'http://example.com',
+            'data': 'data:text/plain;base64,YQ==',
+            'choices': [1],
+            'extra': 'x',
+        }
+        cstruct.update(kw)
+        return cstruct
+
+    def test_valid(self):
+        schema = self._makeSchema()
+        self.assertIsNone(self._assertSame(schema, self._makeCstruct()))
+        self._assertSame(schema, self._makeCstruct(pair=['1', None]))
+        schema = self._makeSchema('preserve')
+        self._assertSame(schema, self._makeCstruct())
+        schema = self._makeSchema('preserve', zero_copy=True)
+        self._assertSame(schema, self._makeCstruct())
+
+    def test_invalid(self):
+        schema = self._makeSchema()
+        items = [
+            {'id': 'x', 'qty': '0', 'name': 'ab'},
+            {'id': '1', 'qty': '9', 'name': 'yyyy'},
+            {'kind': 'c', 'flag': 'no', 'tags': {'x': 'y'}},
+            {'id': '1', 'name': ''},
+            colander.null,
+            colander.drop,
+        ]
+        for cstruct in (
+            self._makeCstruct(items=items),
+            self._makeCstruct(name='x', pair=('0', '1'), card='1234'),
+            self._makeCstruct(name='  ', pair=('1', 'custom')),
+            self._makeCstruct(url='x', data='data:foo/bar;base64,x'),
+            self._makeCstruct(data='nope', choices=[3], size='x'),
+            self._makeCstruct(items=[{'id': 1}] * 4),
+            self._makeCstruct(items=[{'id': 1, 'tags': 'x'}] * 4),
+        ):
+            self.assertIsNotNone(self._assertSame(schema, cstruct))
+
+    def test_invalid_containers(self):
+        for schema in (
+            self._makeSchema(),
+            self._makeSchema(zero_copy=True),
+        ):
+            for cstruct in (
+                'x',
+                self._makeCstruct(items='x'),
+                self._makeCstruct(items=['x']),
+                self._makeCstruct(pair=[1]),
+                self._makeCstruct(pair=1),
+                self._makeCstruct(items=[{'id': '1', 'tags': 1}]),
+            ):
+                self.assertIsNotNone(self._assertSame(schema, cstruct))
+        self._assertSame(self._makeSchema(), colander.null)
+
+    def test_unknown_raise(self):
+        for zero_copy in (False, True):
+            schema = self._makeSchema('raise', zero_copy)
+            self._assertSame(schema, self._makeCstruct(name='x'))
+            cstruct = self._makeCstruct()
+            del cstruct['extra']
+            self._assertSame(schema, cstruct)
+
+    def test_drop(self):
+        schema = colander.SchemaNode(
+            colander.Sequence(),
+            colander.SchemaNode(colander.String(), missing=colander.drop),
+        )
+        self._assertSame(schema, ['a', '', colander.null, 'b'])
+        schema = colander.SchemaNode(
+            colander.Sequence(),
+            colander.SchemaNode(colander.String()),
+        )
+        self._assertSame(schema, ['a', colander.drop, 'b'])
+
+    def test_validators_not_raising(self):
+        from unittest import mock
+
+        def fail(self, node, value):  # pragma: no cover
+            raise AssertionError('not called')
+
+        node = colander.SchemaNode(
+            colander.Int(), validator=colander.All(colander.Range(0, 1))
+        )
+        with mock.patch.object(colander._Validator, '__call__', fail):
+            result = node.try_deserialize('2')
+        self.assertEqual(
+            result[1].asdict(), {'': '2 is greater than maximum value 1'}
+        )
+
+    def test_custom_validator(self):
+        class Range(colander.Range):
+            def __call__(self, node, value):
+                raise colander.Invalid(node, 'custom')
+
+        node = colander.SchemaNode(colander.Int(), validator=Range(0, 1))
+        self.assertEqual(node.try_deserialize('1')[1].messages(), ['custom'])
+        self.assertIsNotNone(self._assertSame(node, '1'))
+
+    def test_custom_types(self):
+        class Int(colander.Int):
+            def deserialize(self, node, cstruct):
+                return 1
+
+        class Bool(colander.Bool):
+            def deserialize(self, node, cstruct):
+                return True
+
+        class Tuple(colander.Tuple):
+            def deserialize(self, node, cstruct):
+                return 'tuple'
+
+        class Sequence(colander.Sequence):
+            def _impl(self, *arg):
+                return 'sequence'
+
+        class Mapping(colander.Mapping):
+            def deserialize(self, node, cstruct):
+                return 'mapping'
+
+        node = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(Int(), name='a'),
+            colander.SchemaNode(Bool(), name='b'),
+            colander.SchemaNode(Tuple(), name='c'),
+            colander.SchemaNode(
+                Sequence(), colander.SchemaNode(Int()), name='d'
+            ),
+            colander.SchemaNode(Mapping(), name='e'),
+            colander.SchemaNode(
+                colander.Int(), name='f', missing=colander.drop
+            ),
+        )
+        cstruct = {'a': 'x', 'b': 'x', 'c': 'x', 'd': 'x', 'e': 'x'}
+        self._assertSame(node, cstruct)
+        self.assertEqual(
+            node.try_deserialize(cstruct)[0],
+            {'a': 1, 'b': True, 'c': 'tuple', 'd': 'sequence', 'e': 'mapping'},
+        )
+
+    def test_boolean(self):
+        node = colander.SchemaNode(colander.Boolean())
+        for cstruct in ('false', 'x', colander.null, object()):
+            self._assertSame(node, cstruct)
+
+        class Unprintable:
+            def __str__(self):
+                raise ValueError
+
+        self._assertSame(node, Unprintable())
+
+    def test_missing(self):
+        node = colander.SchemaNode(colander.Int())
+        self._assertSame(node, colander.null)
+        node = colander.SchemaNode(
+            colander.Int(), missing=colander.deferred(lambda node, kw: 1)
+        )
+        self._assertSame(node, colander.null)
+
+    def test_unbound_deferred_validator(self):
+        node = colander.SchemaNode(
+            colander.Int(),
+            validator=colander.deferred(lambda node, kw: None),
+        )
+        self.assertRaises(
+            colander.UnboundDeferredError, node.try_deserialize, '1'
+        )
+
+
+class TestValidate(TestTryDeserialize):
+    # every cstruct of TestTryDeserialize is also checked by validate
+
+    def _assertSame(self, schema, cstruct):
+        expected = super()._assertSame(schema, cstruct)
+        error = schema.validate(cstruct)
+        if expected is None:
+            self.assertIsNone(error)
+        else:
+            self._assertSameError(error, expected)
+        return expected
+
+    def test_mapping_read_in_place(self):
+        class Items(dict):
+            def copy(self):  # pragma: no cover
+                raise AssertionError('copied')
+
+            def __iter__(self):  # pragma: no cover
+                raise AssertionError('copied')
+
+        schema = self._makeSchema()
+        cstruct = Items(self._makeCstruct())
+        self.assertIsNone(schema.validate(cstruct))
+
+    def test_mapping_like(self):
+        class Items:
+            def __init__(self, items):
+                self._items = items
+
+            def items(self):  # pragma: no cover
+                return self._items.items()
+
+            def keys(self):
+                return self._items.keys()
+
+            def __getitem__(self, name):
+                return self._items[name]
+
+        schema = self._makeSchema()
+        self.assertIsNone(schema.validate(Items(self._makeCstruct())))
+        self._assertSame(schema, Items(self._makeCstruct()))
+        self._assertSame(schema, self._makeCstruct(items=[Items({})]))
+
+    def test_sequence_iterator(self):
+        schema = colander.SchemaNode(
+            colander.Sequence(),
+            colander.SchemaNode(colander.Int()),
+        )
+        self.assertIsNone(schema.validate(iter(['1', '2'])))
+        error = schema.validate(iter(['1', 'x']))
+        self.assertEqual(error.asdict(), {'1': '"x" is not a number'})
+        self._assertSame(schema, '1')
+        schema.typ.accept_scalar = True
+        self._assertSame(schema, '1')
+        self._assertSame(schema, 'x')
+
+    def test_unknown_raise_skips_children(self):
+        schema = self._makeSchema('raise')
+        cstruct = self._makeCstruct(items='x')
+        error = schema.validate(cstruct)
+        self.assertEqual(list(error.asdict()), [''])
+
+
+class TestCheckAppstruct(TestTryDeserialize):
+    # the appstruct of every valid cstruct of TestTryDeserialize, and every
+    # cstruct taken as an appstruct, are checked like their round trip
+
+    def _assertSame(self, schema, cstruct):
+        expected = super()._assertSame(schema, cstruct)
+        if expected is None:
+            self._assertSameAsRoundTrip(schema, schema.deserialize(cstruct))
+        self._assertSameAsRoundTrip(schema, cstruct)
+        return expected
+
+    def _assertSameAsRoundTrip(self, schema, appstruct):
+        try:
+            cstruct = schema.serialize(appstruct)
+        except colander.Invalid as e:
+            # the errors of deserialize are reported as well
+            error = schema.check_appstruct(appstruct).asdict()
+            self.assertEqual(error, {**error, **e.asdict()})
+            return
+        try:
+            expected = schema.deserialize(cstruct)
+        except colander.Invalid as e:
+            self._assertSameError(schema.check_appstruct(appstruct), e)
+        except TypeError:
+            # the preparer of the name does not accept null
+            self.assertRaises(TypeError, schema.check_appstruct, appstruct)
+        else:
+            self.assertIsNone(schema.check_appstruct(appstruct))
+            self.assertEqual(
+                schema._check_appstruct(appstruct), (expected, None)
+            )
+
+    def _checked(self, node, appstruct):
+        appstruct, error = node._check_appstruct(appstruct)
+        self.assertIsNone(error)
+        return appstruct
+
+    def test_leaves(self):
+        import datetime
+        import decimal
+        import enum
+
+        class Color(enum.Enum):
+            red = 1
+
+        for typ in (
+            colander.String(),
+            colander.String(allow_empty=True),
+            colander.String(encoding='ascii'),
+            colander.Int(),
+            colander.Int(strict=True),
+            colander.Float(),
+            colander.Money(),
+            colander.Boolean(),
+            colander.Boolean(true_choices=['true']),
+            colander.DateTime(),
+            colander.DateTime(default_tzinfo=None),
+            colander.Date(),
+            colander.Time(),
+            colander.Enum(Color),
+            colander.Set(),
+        ):
+            node = colander.SchemaNode(typ, missing=None)
+            for appstruct in (
+                colander.null,
+                None,
+                '',
+                'abc',
+                '\xe9',
+                0,
+                5.5,
+                True,
+                decimal.Decimal('1.234'),
+                datetime.datetime(2020, 1, 2, 3, 4, 5, 6),
+                datetime.datetime(2020, 1, 2, tzinfo=colander.iso8601.UTC),
+                datetime.date(2020, 1, 2),
+                datetime.time(3, 4, 5),
+                Color.red,
+                [1],
+            ):
+                self._assertSameAsRoundTrip(node, appstruct)
+
+    def test_values_not_converted(self):
+        import datetime
+        import decimal
+
+        zone = datetime.timezone(datetime.timedelta(hours=1))
+        value = datetime.datetime(2020, 1, 2, 3, 4, 5, 6, tzinfo=zone)
+        node = colander.SchemaNode(colander.DateTime())
+        self.assertIs(self._checked(node, value), value)
+        node = colander.SchemaNode(colander.DateTime(format='%Y-%m-%d'))
+        self.assertIs(self._checked(node, value), value)
+        value = datetime.time(3, 4, 5, tzinfo=zone)
+        node = colander.SchemaNode(colander.Time())
+        self.assertIs(self._checked(node, value), value)
+        self.assertRaises(
+            colander.Invalid, node.deserialize, node.serialize(value)
+        )
+        node = colander.SchemaNode(colander.Money())
+        self.assertEqual(
+            self._checked(node, decimal.Decimal('1.234')),
+            decimal.Decimal('1.24'),
+        )
+
+    def test_defaults(self):
+        schema = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(
+                colander.String(),
+                name='a',
+                default='c',
+                validator=colander.OneOf(['a', 'b']),
+            ),
+            colander.SchemaNode(
+                colander.Int(), name='b', default=colander.drop
+            ),
+            colander.SchemaNode(
+                colander.Int(),
+                name='c',
+                default=colander.drop,
+                missing=colander.drop,
+            ),
+            colander.SchemaNode(
+                colander.Int(),
+                name='d',
+                default=colander.deferred(lambda node, kw: 1),
+                missing=2,
+            ),
+            colander.SchemaNode(
+                colander.Sequence(),
+                colander.SchemaNode(colander.Int(), default=colander.drop),
+                name='e',
+            ),
+            colander.SchemaNode(
+                colander.Tuple(),
+                colander.SchemaNode(colander.Int()),
+                name='f',
+                missing=None,
+            ),
+        )
+        for appstruct in (
+            {'e': [1, colander.null, colander.drop]},
+            {'a': 'a', 'b': 1, 'e': []},
+            {'a': 'a', 'b': colander.drop, 'c': colander.null, 'e': ()},
+            colander.null,
+            'x',
+        ):
+            self._assertSameAsRoundTrip(schema, appstruct)
+        self.assertEqual(
+            schema.check_appstruct({'e': []}).asdict(),
+            {'a': '"c" is not one of a, b', 'b': 'Required'},
+        )
+        self.assertEqual(
+            self._checked(schema, {'a': 'a', 'b': 1, 'e': [1]}),
+            {'a': 'a', 'b': 1, 'd': 2, 'e': [1], 'f': None},
+        )
+
+    def test_custom_leaves(self):
+        import datetime
+        import enum
+
+        class Color(enum.Enum):
+            red = 1
+
+        def serialize(self, node, appstruct):
+            return 'x'
+
+        for cls, args, appstruct in (
+            (colander.DateTime, (), datetime.date(2020, 1, 2)),
+            (colander.Date, (), datetime.date(2020, 1, 2)),
+            (colander.Time, (), datetime.time(1, 2)),
+            (colander.Enum, (Color,), Color.red),
+        ):
+            typ = type('Custom', (cls,), {'serialize': serialize})(*args)
+            node = colander.SchemaNode(typ)
+            self.assertIsNotNone(node.check_appstruct(appstruct))
+            self._assertSameAsRoundTrip(node, appstruct)
+
+    def test_custom_node(self):
+        class Node(colander.SchemaNode):
+            schema_type = colander.Int
+
+            def serialize(self, appstruct=colander.null):
+                return 'x'
+
+        node = Node()
+        self.assertEqual(
+            node.check_appstruct(1).asdict(), {'': '"x" is not a number'}
+        )
+
+
+class TestSerializeJSON(unittest.TestCase):
+    def _makeSchema(self, unknown='ignore'):
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(colander.Int())
+            price = colander.SchemaNode(colander.Float())
+            qty = colander.SchemaNode(colander.Int(), default=colander.drop)
+
+        class Items(colander.SequenceSchema):
+            item = Item()
+
+        class Tags(colander.SequenceSchema):
+            tag = colander.SchemaNode(colander.String(), default=colander.drop)
+
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            note = colander.SchemaNode(colander.String(), default='n/a')
+            active = colander.SchemaNode(colander.Boolean())
+            items = Items()
+            tags = Tags(default=())
+            pair = colander.SchemaNode(
+                colander.Tuple(),
+                colander.SchemaNode(colander.Int(), name='x'),
+                colander.SchemaNode(colander.Decimal(), name='y'),
+                default=colander.drop,
+            )
+
+        return Schema(colander.Mapping(unknown=unknown))
+
+    def _makeAppstruct(self):
+        return {
+            'name': 'Fr\xe9d "the" <one>',
+            'active': True,
+            'items': [
+                {'id': 1, 'price': 1.5, 'qty': 2},
+                {'id': True, 'price': 2, 'qty': colander.drop},
+                {'id': '3', 'price': float('nan')},
+            ],
+            'tags': ['a', colander.null, 'b', colander.drop],
+            'pair': (1, '2.50'),
+        }
+
+    def _assertSame(self, schema, appstruct, **kw):
+        import io
+        import json
+
+        expected = json.dumps(schema.serialize(appstruct))
+        self.assertEqual(schema.serialize_json(appstruct), expected)
+        fp = io.StringIO()
+        self.assertEqual(schema.serialize_json(appstruct, fp, **kw), None)
+        self.assertEqual(fp.getvalue(), expected)
+
+    def _assertSameError(self, schema, appstruct):
+        e = invalid_exc(schema.serialize, appstruct)
+        e2 = invalid_exc(schema.serialize_json, appstruct)
+        self.assertEqual(e2.asdict(), e.asdict())
+
+    def test_serialize(self):
+        schema = self._makeSchema()
+        self._assertSame(schema, self._makeAppstruct())
+
+    def test_serialize_drop_defaults(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        del appstruct['pair']
+        del appstruct['tags']
+        self._assertSame(schema, appstruct)
+
+    def test_serialize_chunks(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['items'] = appstruct['items'] * 10
+
+        class Writer:
+            def __init__(self):
+                self.chunks = []
+
+            def write(self, text):
+                self.chunks.append(text)
+
+        fp = Writer()
+        schema.serialize_json(appstruct, fp, chunk_size=4)
+        self.assertEqual(len(fp.chunks), 9)
+        self.assertEqual(''.join(fp.chunks), schema.serialize_json(appstruct))
+        self._assertSame(schema, appstruct, chunk_size=1)
+
+    def test_serialize_mapping_types(self):
+        import collections
+        import types
+
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['items'][0] = collections.OrderedDict(appstruct['items'][0])
+        self._assertSame(schema, appstruct)
+        appstruct['items'][0] = 'abc'
+        self._assertSameError(schema, appstruct)
+        del appstruct['items'][0]
+        schema['items']['item'].typ.zero_copy = True
+        appstruct['items'][1] = types.MappingProxyType(appstruct['items'][1])
+        self._assertSame(schema, appstruct)
+
+    def test_serialize_null_leaf(self):
+        import json
+
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        del appstruct['name']
+        self.assertRaises(TypeError, json.dumps, schema.serialize(appstruct))
+        self.assertRaises(TypeError, schema.serialize_json, appstruct)
+
+    def test_serialize_null_containers(self):
+        schema = self._makeSchema()
+        self.assertRaises(TypeError, schema['items'].serialize_json)
+        self._assertSameError(schema['pair'], colander.null)
+        self.assertRaises(TypeError, schema['pair']['x'].serialize_json)
+        node = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(colander.String(), name='a', default='x'),
+        )
+        self._assertSame(node, colander.null)
+
+    def test_serialize_deferred_default(self):
+        schema = self._makeSchema()
+        schema['note'].default = colander.deferred(lambda node, kw: 'x')
+        appstruct = self._makeAppstruct()
+        self.assertRaises(TypeError, schema.serialize_json, appstruct)
+        schema = schema.bind()
+        self._assertSame(schema, appstruct)
+
+    def test_serialize_accept_scalar(self):
+        schema = self._makeSchema()
+        schema['tags'].typ.accept_scalar = True
+        appstruct = self._makeAppstruct()
+        appstruct['tags'] = 'x'
+        self._assertSame(schema, appstruct)
+
+    def test_serialize_preserve(self):
+        schema = self._makeSchema(unknown='preserve')
+        appstruct = self._makeAppstruct()
+        appstruct['extra'] = {'a': [1, None]}
+        appstruct[1] = 'one'
+        self._assertSame(schema, appstruct)
+        node = colander.SchemaNode(
+            colander.Mapping(unknown='preserve'),
+            colander.SchemaNode(
+                colander.Int(), name='a', default=colander.drop
+            ),
+        )
+        self._assertSame(node, {'b': 1})
+
+    def test_serialize_raise(self):
+        schema = self._makeSchema(unknown='raise')
+        appstruct = self._makeAppstruct()
+        self._assertSame(schema, appstruct)
+        appstruct['extra'] = 1
+        self._assertSameError(schema, appstruct)
+
+    def test_serialize_invalid(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['items'][0]['price'] = 'abc'
+        appstruct['items'][2] = 'abc'
+        appstruct['pair'] = ('x', 'y')
+        self._assertSameError(schema, appstruct)
+        appstruct['pair'] = (1,)
+        self._assertSameError(schema, appstruct)
+
+    def test_serialize_custom_node(self):
+        class Upper(colander.SchemaNode):
+            schema_type = colander.String
+
+            def serialize(self, appstruct=colander.null):
+                if appstruct == 'drop':
+                    return colander.drop
+                return appstruct.upper()
+
+        class Tags(colander.SequenceSchema):
+            tag = Upper()
+
+        class Schema(colander.MappingSchema):
+            name = Upper()
+            tags = Tags()
+
+        schema = Schema()
+        self._assertSame(schema, {'name': 'a', 'tags': ['b', 'drop', 'c']})
+        self._assertSame(schema, {'name': 'drop', 'tags': []})
+        self.assertRaises(TypeError, schema['name'].serialize_json, 'drop')
+
+
+class TestFlattenPlan(unittest.TestCase):
+    def _makeSchema(self, name='schema'):
+        class Pair(colander.TupleSchema):
+            a = colander.SchemaNode(colander.Int())
+            b = colander.SchemaNode(DummyType())
+
+        class Item(colander.MappingSchema):
+            x = colander.SchemaNode(colander.String())
+            pairs = colander.SequenceSchema(Pair(name='pair'), name='pairs')
+
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            custom = colander.SchemaNode(DummyType())
+            items = colander.SequenceSchema(Item(name='item'), name='items')
+            tags = colander.SequenceSchema(
+                colander.SchemaNode(colander.String()), name='tags'
+            )
+            customs = colander.SequenceSchema(
+                colander.SchemaNode(DummyType()), name='customs'
+            )
+            pair = Pair()
+
+        schema = Schema(name=name)
+        schema.add(colander.SchemaNode(colander.String(), name=''))
+        return schema
 
-    def test___delitem__success(self):
-        node = self._makeOne(None)
-        another = self._makeOne(None, name='another')
-        node.add(another)
-        del node['another']
-        self.assertEqual(node.children, [])
+    def _makeAppstruct(self):
+        return {
+            'name': 'n',
+            'custom': 'c',
+            'items': [
+                {'x': 'a', 'pairs': [(1, 'p'), (2, 'q')]},
+                {'x': 'b', 'pairs': []},
+            ],
+            'tags': ['t1', 't2'],
+            'customs': ['c1'],
+            'pair': (3, 'r'),
+            '': 'blank',
+        }
 
-    def test___delitem__failure(self):
-        node = self._makeOne(None)
-        self.assertRaises(KeyError, node.__delitem__, 'another')
+    def test_flatten_same_as_types(self):
+        for name in ('schema', ''):
+            schema = self._makeSchema(name)
+            appstruct = self._makeAppstruct()
+            expected = schema.typ.flatten(schema, appstruct)
+            result = schema.flatten(appstruct)
+            self.assertEqual(list(result.items()), list(expected.items()))
 
-    def test___setitem__override(self):
-        node = self._makeOne(None)
-        another = self._makeOne(None, name='another')
-        node.add(another)
-        andanother = self._makeOne(None, name='andanother')
-        node['another'] = andanother
-        self.assertEqual(node['another'], andanother)
-        self.assertEqual(andanother.name, 'another')
+    def test_unflatten_same_as_types(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        del appstruct['custom']
+        del schema['custom']
+        fstruct = {
+            key.replace('appstruct', 'b'): value
+            for key, value in schema.flatten(appstruct).items()
+        }
+        fstruct['schema'] = {}
+        fstruct['schema.items.1.pairs'] = []
+        expected = schema.typ.unflatten(schema, sorted(fstruct), fstruct)
+        self.assertEqual(schema.unflatten(fstruct), expected)
+        self.assertEqual(schema.unflatten(fstruct)['items'][1]['pairs'], [])
 
-    def test___setitem__no_override(self):
-        another = self._makeOne(None, name='another')
-        node = self._makeOne(None)
-        node['another'] = another
-        self.assertEqual(node['another'], another)
-        self.assertEqual(node.children[0], another)
+    def test_unflatten_errors(self):
+        schema = self._makeSchema()
+        for fstruct, exc in (
+            ({'other.name': 'n'}, AssertionError),
+            ({'schema.nope': 'n'}, KeyError),
+            ({'schema.name.x': 'n'}, AssertionError),
+            ({'schema.tags.1': 't'}, KeyError),
+            ({'schema.pair.a': 1}, KeyError),
+        ):
+            self.assertRaises(exc, schema.unflatten, fstruct)
+
+    def test_plan_is_reused(self):
+        from colander import _flat_plan
 
-    def test___iter__(self):
-        node = self._makeOne(None)
-        node.children = ['a', 'b', 'c']
-        it = node.__iter__()
-        self.assertEqual(list(it), ['a', 'b', 'c'])
+        schema = self._makeSchema()
+        plan = _flat_plan(schema)
+        schema.flatten(self._makeAppstruct())
+        self.assertIs(_flat_plan(schema), plan)
+        self.assertIs(_flat_plan(schema['name']), None)
+        self.assertIs(_flat_plan(schema['custom']), None)
 
-    def test___contains__(self):
-        node = self._makeOne(None)
-        another = self._makeOne(None, name='another')
-        node.add(another)
-        self.assertEqual('another' in node, True)
-        self.assertEqual('b' in node, False)
+    def test_schema_changes(self):
+        schema = self._makeSchema()
+        appstruct = {'name': 'n', 'pair': (1, 'p')}
+        schema.children[:] = [schema['name'], schema['pair']]
+        self.assertEqual(
+            schema.flatten(appstruct),
+            {
+                'schema.name': 'n',
+                'schema.pair.a': 1,
+                'schema.pair.appstruct': 'p',
+            },
+        )
+        schema['pair'].add(colander.SchemaNode(colander.Int(), name='c'))
+        schema['name'].name = 'title'
+        appstruct = {'title': 'n', 'pair': (1, 'p', 2)}
+        flat = schema.flatten(appstruct)
+        self.assertEqual(
+            flat,
+            {
+                'schema.title': 'n',
+                'schema.pair.a': 1,
+                'schema.pair.appstruct': 'p',
+                'schema.pair.c': 2,
+            },
+        )
+        schema['pair'].typ = colander.Mapping()
+        self.assertEqual(
+            schema.unflatten({'schema.pair.c': 2}), {'pair': {'c': 2}}
+        )
 
     def test_clone(self):
-        inner_typ = DummyType()
-        outer_typ = DummyType()
-        outer_node = self._makeOne(outer_typ, name='outer')
-        inner_node = self._makeOne(inner_typ, name='inner')
-        outer_node.foo = 1
-        inner_node.foo = 2
-        outer_node.children = [inner_node]
-        outer_clone = outer_node.clone()
-        self.assertFalse(outer_clone is outer_node)
-        self.assertEqual(outer_clone.typ, outer_typ)
-        self.assertEqual(outer_clone.name, 'outer')
-        self.assertEqual(outer_node.foo, 1)
-        self.assertEqual(len(outer_clone.children), 1)
-        inner_clone = outer_clone.children[0]
-        self.assertFalse(inner_clone is inner_node)
-        self.assertEqual(inner_clone.typ, inner_typ)
-        self.assertEqual(inner_clone.name, 'inner')
-        self.assertEqual(inner_clone.foo, 2)
+        schema = self._makeSchema()
+        schema.flatten(self._makeAppstruct())
+        clone = schema.clone()
+        clone.name = 'clone'
+        clone['name'].name = 'title'
+        self.assertEqual(clone.unflatten({'clone.title': 'n'}), {'title': 'n'})
+        self.assertEqual(schema.unflatten({'schema.name': 'n'}), {'name': 'n'})
 
-    def test_clone_with_modified_schema_instance(self):
-        class Schema(colander.MappingSchema):
-            n1 = colander.SchemaNode(colander.String())
-            n2 = colander.SchemaNode(colander.String())
+    def test_schema_is_collected(self):
+        import gc
+        import weakref
 
-        def compare_children(schema, cloned):
-            # children of the clone must match the cloned node's children and
-            # have to be clones themselves.
-            self.assertEqual(len(schema.children), len(cloned.children))
-            for child, child_clone in zip(schema.children, cloned.children):
-                self.assertIsNot(child, child_clone)
-                for name in child.__dict__.keys():
-                    self.assertEqual(
-                        getattr(child, name), getattr(child_clone, name)
-                    )
+        schema = self._makeSchema()
+        schema.flatten(self._makeAppstruct())
+        schema.unflatten({'schema.name': 'n'})
+        bound = schema.bind()
+        bound.flatten(self._makeAppstruct())
+        refs = [weakref.ref(schema), weakref.ref(bound)]
+        del schema, bound
+        gc.collect()
+        self.assertEqual([ref() for ref in refs], [None, None])
+
+    def test_leaf(self):
+        node = colander.SchemaNode(colander.String(), name='leaf')
+        self.assertEqual(node.flatten('a'), {'leaf': 'a'})
+        self.assertEqual(node.unflatten({'leaf': 'a'}), 'a')
+
+
+class TestAccessor(unittest.TestCase):
+    def _makeSchema(self):
+        class Pair(colander.TupleSchema):
+            a = colander.SchemaNode(colander.Int())
+            b = colander.SchemaNode(colander.Int())
 
-        # add a child node before cloning
-        schema = Schema()
-        schema.add(colander.SchemaNode(colander.String(), name='n3'))
-        compare_children(schema, schema.clone())
-        # remove a child node before cloning
-        schema = Schema()
-        del schema['n1']
-        compare_children(schema, schema.clone())
-        # reorder children before cloning
-        schema = Schema()
-        schema.children = list(reversed(schema.children))
-        compare_children(schema, schema.clone())
+        class Item(colander.MappingSchema):
+            x = colander.SchemaNode(colander.Int())
+            pair = Pair()
+
+        class Items(colander.SequenceSchema):
+            item = Item()
 
-    def test_clone_mapping_references(self):
         class Schema(colander.MappingSchema):
-            n1 = colander.SchemaNode(colander.Mapping(unknown='preserve'))
+            items = Items()
+            pair = Pair()
+            pairs = colander.SchemaNode(
+                colander.Tuple(), Pair(name='first'), Pair(name='second')
+            )
+            other = colander.SchemaNode(DummyContainerType())
 
-        foo = {"n1": {"bar": {"baz": "qux"}}}
-        bar = Schema().serialize(foo)
-        bar["n1"]["bar"]["baz"] = "foobar"
-        self.assertEqual(foo["n1"]["bar"]["baz"], "qux")
+        return Schema()
 
-    def test_bind(self):
-        from colander import deferred
+    def _makeAppstruct(self):
+        return {
+            'items': [
+                {'x': 1, 'pair': (1, 2)},
+                {'x': 2, 'pair': (3, 4)},
+            ],
+            'pair': (5, 6),
+            'pairs': ((7, 8), (9, 10)),
+            'other': {'a': {'b': 11}},
+        }
 
-        inner_typ = DummyType()
-        outer_typ = DummyType()
+    def test_get(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        for path in (
+            'items',
+            'items.1',
+            'items.1.pair.b',
+            'items.-1.x',
+            'pair.a',
+            'pairs.second.a',
+            'other.a.b',
+        ):
+            self.assertEqual(
+                schema.accessor(path).get(appstruct),
+                schema.get_value(appstruct, path),
+            )
 
-        def dv(node, kw):
-            self.assertTrue(node.name in ['outer', 'inner'])
-            self.assertTrue('a' in kw)
-            return '123'
+    def test_set(self):
+        schema = self._makeSchema()
+        for path in (
+            'items.1',
+            'items.1.pair.b',
+            'items.0.x',
+            'pair.a',
+            'pairs.second.a',
+            'other.a.b',
+            'other.c',
+        ):
+            expected = self._makeAppstruct()
+            schema.set_value(expected, path, 0)
+            appstruct = self._makeAppstruct()
+            result = schema.accessor(path).set(appstruct, 0)
+            self.assertIs(result, appstruct)
+            self.assertEqual(appstruct, expected)
+
+    def test_set_in_place(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        items = appstruct['items']
+        pair = appstruct['items'][1]['pair']
+        schema.accessor('items.1.pair.a').set(appstruct, 0)
+        self.assertIs(appstruct['items'], items)
+        self.assertEqual(appstruct['items'][1]['pair'], (0, 4))
+        self.assertEqual(pair, (3, 4))
+
+    def test_set_tuple_root(self):
+        schema = self._makeSchema()['pairs']
+        accessor = schema.accessor('first.b')
+        self.assertEqual(accessor.set(((1, 2), (3, 4)), 0), ((1, 0), (3, 4)))
+
+    def test_set_custom_root(self):
+        schema = colander.SchemaNode(DummyContainerType())
+        accessor = schema.accessor('a.b')
+        appstruct = {'a': {}}
+        self.assertIs(accessor.set(appstruct, 1), appstruct)
+        self.assertEqual(appstruct, {'a': {'b': 1}})
+        self.assertEqual(accessor.get(appstruct), 1)
+
+    def test_several_paths(self):
+        schema = self._makeSchema()
+        paths = ['items.1.x', 'items.1.pair.b', 'pair', 'pair.a', 'other.a']
+        appstruct = self._makeAppstruct()
+        expected = [schema.get_value(appstruct, path) for path in paths]
+        accessor = schema.accessor(*paths)
+        self.assertEqual(accessor.get(appstruct), expected)
+        self.assertEqual(schema.get_values(appstruct, paths), expected)
+        self.assertEqual(schema.get_values(appstruct, iter(paths)), expected)
+        self.assertEqual(schema.get_values(appstruct, ['pair']), [(5, 6)])
+        self.assertEqual(schema.get_values(appstruct, []), [])
+        self.assertRaises(ValueError, accessor.set, appstruct, 1)
+
+    def test_several_paths_share_lookups(self):
+        class Counting(dict):
+            lookups = 0
+
+            def __getitem__(self, name):
+                Counting.lookups += 1
+                return dict.__getitem__(self, name)
 
-        dv = deferred(dv)
-        outer_node = self._makeOne(outer_typ, name='outer', missing=dv)
-        inner_node = self._makeOne(
-            inner_typ, name='inner', validator=dv, missing=dv
+        schema = self._makeSchema()
+        appstruct = Counting(self._makeAppstruct())
+        appstruct['items'][1] = Counting(appstruct['items'][1])
+        paths = ['items.1.x', 'items.1.pair.a', 'items.1.pair.b']
+        Counting.lookups = 0
+        self.assertEqual(schema.get_values(appstruct, paths), [2, 3, 4])
+        self.assertEqual(Counting.lookups, 3)
+
+    def test_bad_paths(self):
+        schema = self._makeSchema()
+        self.assertRaises(KeyError, schema.accessor, 'nope')
+        self.assertRaises(KeyError, schema.accessor, 'pair.nope')
+        self.assertRaises(ValueError, schema.accessor, 'items.x')
+        self.assertRaises(AssertionError, schema.accessor, 'pair.a.b')
+        self.assertRaises(KeyError, schema.accessor, 'items.0.x', 'nope')
+        accessor = schema.accessor('items.5')
+        self.assertRaises(IndexError, accessor.get, self._makeAppstruct())
+
+    def test_repr(self):
+        schema = self._makeSchema()
+        self.assertTrue(
+            repr(schema.accessor('pair.a')).endswith("('pair.a',)>")
         )
-        outer_node.children = [inner_node]
-        outer_clone = outer_node.bind(a=1)
-        self.assertFalse(outer_clone is outer_node)
-        self.assertEqual(outer_clone.missing, '123')
-        inner_clone = outer_clone.children[0]
-        self.assertFalse(inner_clone is inner_node)
-        self.assertEqual(inner_clone.missing, '123')
-        self.assertEqual(inner_clone.validator, '123')
 
-    def test_bind_with_after_bind(self):
-        from colander import deferred
 
-        inner_typ = DummyType()
-        outer_typ = DummyType()
+class TestDeserializeLazy(unittest.TestCase):
+    def _makeSchema(self, unknown='ignore', validator=None):
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(colander.Int())
+            qty = colander.SchemaNode(
+                colander.Int(),
+                missing=colander.drop,
+                validator=colander.Range(0, 5),
+            )
 
-        def dv(node, kw):
-            self.assertTrue(node.name in ['outer', 'inner'])
-            self.assertTrue('a' in kw)
-            return '123'
+        class Items(colander.SequenceSchema):
+            item = Item()
 
-        dv = deferred(dv)
+        class Tags(colander.SequenceSchema):
+            tag = colander.SchemaNode(colander.String(), missing=colander.drop)
 
-        def remove_inner(node, kw):
-            self.assertEqual(kw, {'a': 1})
-            del node['inner']
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            note = colander.SchemaNode(colander.String(), missing='')
+            items = Items(validator=colander.Length(max=3))
+            tags = Tags(missing=())
+            pair = colander.SchemaNode(
+                colander.Tuple(),
+                colander.SchemaNode(colander.Int(), name='x'),
+                colander.SchemaNode(colander.Int(), name='y'),
+                missing=colander.drop,
+            )
 
-        outer_node = self._makeOne(
-            outer_typ, name='outer', missing=dv, after_bind=remove_inner
-        )
-        inner_node = self._makeOne(
-            inner_typ, name='inner', validator=dv, missing=dv
+        return Schema(colander.Mapping(unknown=unknown), validator=validator)
+
+    def _makeCstruct(self):
+        return {
+            'name': 'fred',
+            'items': [{'id': '1'}, {'id': '2', 'qty': '3'}],
+            'tags': ['a', '', 'b'],
+        }
+
+    def test_lazy_access(self):
+        from colander import LazyMapping, LazySequence
+
+        schema = self._makeSchema()
+        result = schema.deserialize_lazy(self._makeCstruct())
+        self.assertTrue(isinstance(result, LazyMapping))
+        self.assertEqual(result._pending['name'][2], 'fred')
+        self.assertEqual(result['name'], 'fred')
+        self.assertEqual(result['note'], '')
+        items = result['items']
+        self.assertTrue(isinstance(items, LazySequence))
+        self.assertTrue(result['items'] is items)
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items._values, {})
+        self.assertEqual(items[-1]['qty'], 3)
+        self.assertEqual(items[:1], [{'id': 1}])
+        self.assertEqual(list(result['tags']), ['a', 'b'])
+        self.assertEqual(sorted(result), ['items', 'name', 'note', 'tags'])
+        self.assertEqual(len(result), 4)
+        self.assertFalse('pair' in result)
+        self.assertTrue('name' in result)
+        self.assertRaises(KeyError, result.__getitem__, 'pair')
+
+    def test_droppable_keys(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['items'][0]['qty'] = ''
+        result = schema.deserialize_lazy(cstruct)['items'][0]
+        self.assertFalse('qty' in result)
+        self.assertEqual(dict(result), {'id': 1})
+        result = schema.deserialize_lazy(cstruct)['items'][1]
+        self.assertTrue('qty' in result)
+        self.assertEqual(list(result), ['id', 'qty'])
+
+    def test_equal_to_deserialize(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['pair'] = ['1', '2']
+        result = schema.deserialize_lazy(cstruct)
+        self.assertEqual(result, schema.deserialize(cstruct))
+        self.assertEqual(result.validate(), schema.deserialize(cstruct))
+        self.assertEqual(result['items'], result['items'])
+        self.assertNotEqual(result['items'], ())
+
+    def test_not_a_container(self):
+        schema = self._makeSchema()
+        self.assertEqual(schema['name'].deserialize_lazy('fred'), 'fred')
+        self.assertEqual(
+            schema['pair'].deserialize_lazy(colander.null), colander.drop
         )
-        outer_node.children = [inner_node]
-        outer_clone = outer_node.bind(a=1)
-        self.assertFalse(outer_clone is outer_node)
-        self.assertEqual(outer_clone.missing, '123')
-        self.assertEqual(len(outer_clone.children), 0)
-        self.assertEqual(len(outer_node.children), 1)
+        self.assertRaises(colander.Invalid, schema.deserialize_lazy, 'abc')
 
-    def test_declarative_name_reassignment(self):
-        # see https://github.com/Pylons/colander/issues/39
+    def test_preparer_is_eager(self):
+        schema = self._makeSchema()
+        schema.preparer = lambda value: value
+        result = schema.deserialize_lazy(self._makeCstruct())
+        self.assertEqual(type(result), dict)
 
-        class FnordSchema(colander.Schema):
-            fnord = colander.SchemaNode(
-                colander.Sequence(),
-                colander.SchemaNode(colander.Integer(), name=''),
-                name="fnord[]",
-            )
+    def test_subclass_is_eager(self):
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
 
-        schema = FnordSchema()
-        self.assertEqual(schema['fnord[]'].name, 'fnord[]')
+            def deserialize(self, cstruct=colander.null):
+                return colander.MappingSchema.deserialize(self, cstruct)
 
-    def test_cstruct_children(self):
-        typ = DummyType()
-        typ.cstruct_children = lambda *arg: ['foo']
-        node = self._makeOne(typ)
-        self.assertEqual(node.cstruct_children(None), ['foo'])
+        result = Schema().deserialize_lazy({'name': 'fred'})
+        self.assertEqual(type(result), dict)
 
-    def test_cstruct_children_warning(self):
-        import warnings
+    def test_required_is_eager(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        del cstruct['name']
+        del cstruct['items']
+        with self.assertRaises(colander.Invalid) as cm:
+            schema.deserialize_lazy(cstruct)
+        self.assertEqual(
+            cm.exception.asdict(), {'name': 'Required', 'items': 'Required'}
+        )
 
-        with warnings.catch_warnings(record=True) as w:
-            warnings.simplefilter('always')
-            typ = None
-            node = self._makeOne(typ)
-            self.assertEqual(node.cstruct_children(None), [])
-            self.assertEqual(len(w), 1)
+    def test_unknown_raise_is_eager(self):
+        schema = self._makeSchema(unknown='raise')
+        cstruct = self._makeCstruct()
+        cstruct['extra'] = 1
+        self.assertRaises(
+            colander.UnsupportedFields, schema.deserialize_lazy, cstruct
+        )
 
-    def test_raise_invalid(self):
+    def test_unknown_preserve(self):
+        schema = self._makeSchema(unknown='preserve')
+        cstruct = self._makeCstruct()
+        cstruct['extra'] = [1]
+        result = schema.deserialize_lazy(cstruct)
+        self.assertEqual(result['extra'], [1])
+        self.assertFalse(result['extra'] is cstruct['extra'])
+        self.assertEqual(list(result)[-1], 'extra')
+        self.assertEqual(result.validate()['extra'], [1])
+
+    def test_access_error_is_rooted(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['items'][1]['qty'] = '9'
+        result = schema.deserialize_lazy(cstruct)
+        item = result['items'][1]
+        self.assertEqual(item['id'], 2)
+        with self.assertRaises(colander.Invalid) as cm:
+            item['qty']
+        self.assertTrue(cm.exception.node is schema)
+        self.assertEqual(
+            cm.exception.asdict(),
+            {'items.1.qty': '9 is greater than maximum value 5'},
+        )
+        # failures are not cached
+        self.assertRaises(colander.Invalid, item.__getitem__, 'qty')
 
-        typ = DummyType()
-        node = self._makeOne(typ)
-        self.assertRaises(colander.Invalid, node.raise_invalid, 'Wrong')
+    def test_nested_eager_error_is_rooted(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['items'][0] = 'abc'
+        result = schema.deserialize_lazy(cstruct)
+        with self.assertRaises(colander.Invalid) as cm:
+            result['items'][0]
+        self.assertEqual(list(cm.exception.asdict()), ['items.0'])
+
+    def test_droppable_sequence_errors(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['tags'] = [1, 'a', 2]
+        result = schema.deserialize_lazy(cstruct)
+        with self.assertRaises(colander.Invalid) as cm:
+            result['tags']
+        self.assertEqual(sorted(cm.exception.asdict()), ['tags.0', 'tags.2'])
+
+    def test_validate(self):
+        schema = self._makeSchema()
+        cstruct = self._makeCstruct()
+        cstruct['items'].extend([{'id': 'x'}, {'id': '4'}, {'id': '5'}])
+        cstruct['pair'] = ['1', 'y']
+        result = schema.deserialize_lazy(cstruct)
+        self.assertEqual(result['name'], 'fred')
+        with self.assertRaises(colander.Invalid) as cm:
+            result.validate()
+        self.assertEqual(
+            cm.exception.asdict(),
+            {
+                'items.2.id': '"x" is not a number',
+                'pair.1': '"y" is not a number',
+            },
+        )
+        with self.assertRaises(colander.Invalid) as cm:
+            result['items'].validate()
+        self.assertTrue(cm.exception.node is schema)
+        self.assertEqual(
+            cm.exception.asdict(), {'items.2.id': '"x" is not a number'}
+        )
+
+    def test_validate_runs_container_validators(self):
+        def validator(node, value):
+            raise colander.Invalid(node, 'Bad')
+
+        schema = self._makeSchema(validator=validator)
+        cstruct = self._makeCstruct()
+        cstruct['items'].extend([{'id': '3'}, {'id': '4'}])
+        result = schema.deserialize_lazy(cstruct)
+        result['items'][0]
+        with self.assertRaises(colander.Invalid) as cm:
+            result['items'].validate()
+        self.assertEqual(
+            cm.exception.asdict(),
+            {'items': 'Longer than maximum length 3'},
+        )
+        del cstruct['items'][3]
+        result = schema.deserialize_lazy(cstruct)
+        with self.assertRaises(colander.Invalid) as cm:
+            result.validate()
+        self.assertEqual(cm.exception.asdict(), {'': 'Bad'})
 
 
 class TestSchemaNodeSubclassing(unittest.TestCase):
@@ -4541,6 +7681,44 @@ class FunctionalBase:
         )
         self.assertEqual(schema.get_value(appstruct, 'seq2.1.key'), 3)
 
+    def test_deserialize_only(self):
+        data = {
+            'int': '10',
+            'ob': 'no.way.this.exists',
+            'seq2': [{'key': '1', 'key2': 'y'}, {'key': '3'}],
+            'tup': ('1', 's'),
+        }
+        schema = self._makeSchema()
+        result = schema.deserialize(data, only=['int', 'seq2.*.key', 'tup'])
+        self.assertEqual(
+            result,
+            {'int': 10, 'seq2': [{'key': 1}, {'key': 3}], 'tup': (1, 's')},
+        )
+
+    def test_deserialize_only_invalid(self):
+        data = {'int': '20', 'seq': [('q', 's')], 'tup': ('s', 's')}
+        schema = self._makeSchema()
+        e = invalid_exc(schema.deserialize, data, only=['int', 'seq'])
+        self.assertEqual(
+            e.asdict(),
+            {
+                'schema.int': '20 is greater than maximum value 10',
+                'schema.seq.0.0': '"q" is not a number',
+            },
+        )
+
+    def test_project(self):
+        schema = self._makeSchema()
+        projected = schema.project(['seq2.*.key', 'seq2', 'int', 'int.x'])
+        self.assertEqual([x.name for x in projected.children], ['int', 'seq2'])
+        self.assertEqual(len(projected['seq2'].children[0].children), 2)
+        self.assertEqual(len(schema.children), 5)
+
+    def test_project_through_leaf(self):
+        schema = self._makeSchema()
+        for paths in (['int.x'], ['seq2.*.key.x'], ['seq.*.0.x']):
+            self.assertRaises(KeyError, schema.project, paths)
+
     def test_invalid_asdict(self):
         expected = {
             'schema.int': '20 is greater than maximum value 10',
@@ -4853,6 +8031,22 @@ class Uncooperative:
     __unicode__ = __str__
 
 
+class DummyContainerType(colander.SchemaType):
+    # a container type with its own get_value and set_value methods
+    def get_value(self, node, appstruct, path):
+        for name in path.split('.'):
+            appstruct = appstruct[name]
+        return appstruct
+
+    def set_value(self, node, appstruct, path, value):
+        names = path.split('.')
+        container = appstruct
+        for name in names[:-1]:
+            container = container[name]
+        container[names[-1]] = value
+        return appstruct
+
+
 class DummyType:
     def serialize(self, node, value):
         return value
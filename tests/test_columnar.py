@@ -0,0 +1,391 @@
+import array
+import datetime
+import unittest
+
+import colander
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class Record(colander.MappingSchema):
+    id = colander.SchemaNode(colander.Int(), validator=colander.Range(0, 100))
+    score = colander.SchemaNode(
+        colander.Float(),
+        missing=colander.drop,
+        validator=colander.Range(max=1.5),
+    )
+    active = colander.SchemaNode(colander.Boolean(), missing=False)
+    kind = colander.SchemaNode(
+        colander.String(), validator=colander.OneOf(['a', 'b'])
+    )
+    at = colander.SchemaNode(colander.DateTime(), missing=None)
+    price = colander.SchemaNode(colander.Decimal(), missing=colander.drop)
+
+
+class Records(colander.SequenceSchema):
+    record = Record()
+
+
+def make_cstruct():
+    return [
+        {'id': '1', 'score': '0.5', 'active': 'true', 'kind': 'a'},
+        {'id': 2, 'active': '0', 'kind': 'b', 'at': '2024-01-02T03:04:05Z'},
+        {'id': '3', 'score': 1, 'kind': 'a', 'price': '1.25', 'other': 1},
+    ]
+
+
+class Test_deserialize(unittest.TestCase):
+    use_numpy = False
+
+    def _callFUT(self, schema, cstruct, output='rows'):
+        from colander.columnar import deserialize
+
+        return deserialize(schema, cstruct, output, use_numpy=self.use_numpy)
+
+    def _assertSame(self, schema, cstruct):
+        # the columnar engine gives the same result or errors as the
+        # scalar one
+        try:
+            expected = schema.deserialize(cstruct)
+        except colander.Invalid as e:
+            with self.assertRaises(colander.Invalid) as cm:
+                self._callFUT(schema, cstruct)
+            self.assertEqual(cm.exception.asdict(), e.asdict())
+            self.assertEqual(
+                [(child.node, child.pos) for child in cm.exception.children],
+                [(child.node, child.pos) for child in e.children],
+            )
+        else:
+            self.assertEqual(self._callFUT(schema, cstruct), expected)
+
+    def test_rows(self):
+        schema = Records()
+        cstruct = make_cstruct()
+        result = self._callFUT(schema, cstruct)
+        self.assertEqual(result, schema.deserialize(cstruct))
+        self.assertEqual(
+            list(result[0]), ['id', 'score', 'active', 'kind', 'at']
+        )
+        self.assertEqual(
+            result[1]['at'],
+            datetime.datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc
+            ),
+        )
+
+    def test_columns(self):
+        schema = Records()
+        result = self._callFUT(schema, make_cstruct(), output='columns')
+        self.assertEqual(list(result['id']), [1, 2, 3])
+        self.assertEqual(result['score'][0], 0.5)
+        self.assertEqual(result['score'][1], colander.drop)
+        self.assertEqual(list(result['active']), [True, False, False])
+        self.assertEqual(result['kind'], ['a', 'b', 'a'])
+        self.assertEqual(result['price'][2], colander.decimal.Decimal('1.25'))
+        if self.use_numpy:
+            self.assertEqual(result['id'].dtype, numpy.int64)
+            self.assertEqual(result['active'].dtype, numpy.bool_)
+        else:
+            self.assertEqual(result['id'], array.array('q', [1, 2, 3]))
+            self.assertEqual(result['active'], [True, False, False])
+        result = self._callFUT(
+            schema, [{'id': 1, 'score': 1, 'kind': 'a'}], output='columns'
+        )
+        if self.use_numpy:
+            self.assertEqual(result['score'].dtype, numpy.float64)
+        else:
+            self.assertEqual(result['score'], array.array('d', [1.0]))
+
+    def test_columns_overflow(self):
+        schema = Records().clone()
+        schema['record']['id'].validator = None
+        result = self._callFUT(
+            schema, [{'id': str(2**70), 'kind': 'a'}], output='columns'
+        )
+        self.assertEqual(result['id'], [2**70])
+
+    def test_default_backend(self):
+        from colander.columnar import deserialize
+
+        result = deserialize(Records(), make_cstruct(), output='columns')
+        if numpy is None:  # pragma: no cover
+            self.assertEqual(result['id'], array.array('q', [1, 2, 3]))
+        else:
+            self.assertEqual(result['id'].dtype, numpy.int64)
+
+    def test_empty_column(self):
+        class Record(colander.MappingSchema):
+            value = colander.SchemaNode(
+                colander.Float(),
+                missing=colander.drop,
+                validator=colander.OneOf([0.5]),
+            )
+
+        class Records(colander.SequenceSchema):
+            record = Record()
+
+        self.assertEqual(self._callFUT(Records(), [{}]), [{}])
+
+    def test_bad_output(self):
+        self.assertRaises(ValueError, self._callFUT, Records(), [], 'bad')
+
+    def test_errors(self):
+        schema = Records()
+        cstruct = make_cstruct()
+        cstruct[0]['id'] = '101'
+        cstruct[0]['kind'] = 'c'
+        cstruct[1]['score'] = '2'
+        cstruct[1]['at'] = 'yesterday'
+        cstruct[2]['id'] = 'x'
+        cstruct[2]['active'] = None
+        cstruct.append({'kind': '', 'price': 'x'})
+        self._assertSame(schema, cstruct)
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(schema, cstruct)
+        self.assertEqual(
+            sorted(cm.exception.asdict()),
+            [
+                '0.id',
+                '0.kind',
+                '1.at',
+                '1.score',
+                '2.id',
+                '3.id',
+                '3.kind',
+                '3.price',
+            ],
+        )
+
+    def test_same_as_scalar(self):
+        schema = Records()
+        cells = {
+            'id': ['1', 1, 0, 1.7, False, '', None, 'x', [], '-1', ' 7 '],
+            'score': ['1', 0, 1.5, 2.0, float('nan'), '', 'x', None],
+            'active': ['TRUE', 'false', 0, 1, None, '', 'no'],
+            'kind': ['a', 'b', '', 'c', 1, None, b'a'],
+            'at': ['2024-01-01', '', 'x', None, 5],
+            'price': ['1', '', 'x'],
+        }
+        for name, values in cells.items():
+            for value in values:
+                row = make_cstruct()[0]
+                row[name] = value
+                self._assertSame(schema, [make_cstruct()[1], row])
+
+    def test_boolean_choices(self):
+        class Record(colander.MappingSchema):
+            flag = colander.SchemaNode(
+                colander.Boolean(true_choices=('yes',)),
+                validator=colander.OneOf([True]),
+            )
+
+        class Records(colander.SequenceSchema):
+            record = Record()
+
+        schema = Records()
+        self._assertSame(schema, [{'flag': 'yes'}, {'flag': 'YES'}])
+        self._assertSame(schema, [{'flag': 'yes'}, {'flag': 'false'}])
+        self._assertSame(schema, [{'flag': 'yes'}, {'flag': 'maybe'}])
+
+    def test_validators(self):
+        class Record(colander.MappingSchema):
+            low = colander.SchemaNode(
+                colander.Int(), validator=colander.Range(min=0)
+            )
+            choice = colander.SchemaNode(
+                colander.Int(), validator=colander.OneOf([1, 2.0, 'x'])
+            )
+            exact = colander.SchemaNode(
+                colander.Float(), validator=colander.OneOf([0.5, 1])
+            )
+            big = colander.SchemaNode(
+                colander.Int(), validator=colander.Range(max=2**63)
+            )
+            other = colander.SchemaNode(
+                colander.Int(), validator=colander.Function(lambda v: v != 3)
+            )
+
+        class Records(colander.SequenceSchema):
+            record = Record()
+
+        schema = Records()
+        row = {'low': 0, 'choice': 1, 'exact': 1, 'big': 2**63, 'other': 1}
+        self._assertSame(schema, [row])
+        self._assertSame(
+            schema,
+            [
+                dict(row, low=-1, choice=3),
+                dict(row, choice=2, exact='0.25', big=2**63 + 1, other=3),
+                dict(row, low=-(2**70), choice='4.0'),
+            ],
+        )
+
+    def test_unorderable_range(self):
+        class Record(colander.MappingSchema):
+            value = colander.SchemaNode(
+                colander.Int(), validator=colander.Range(min='a')
+            )
+
+        class Records(colander.SequenceSchema):
+            record = Record()
+
+        self.assertRaises(TypeError, self._callFUT, Records(), [{'value': 1}])
+
+    def test_empty(self):
+        schema = Records().clone()
+        self.assertEqual(self._callFUT(schema, []), [])
+        result = self._callFUT(schema, [], output='columns')
+        self.assertEqual(
+            {name: list(column) for name, column in result.items()},
+            {
+                'id': [],
+                'score': [],
+                'active': [],
+                'kind': [],
+                'at': [],
+                'price': [],
+            },
+        )
+        schema['record']['id'].validator = colander.Range(0, 1)
+        self.assertEqual(self._callFUT(schema, []), [])
+
+    def test_item_without_children(self):
+        class Records(colander.SequenceSchema):
+            record = colander.MappingSchema()
+
+        schema = Records()
+        self.assertEqual(self._callFUT(schema, [{}, {'a': 1}]), [{}, {}])
+        self.assertEqual(
+            self._callFUT(schema, [{}, {'a': 1}], output='columns'), {}
+        )
+
+    def test_not_a_sequence(self):
+        self._assertSame(Records(), 'abc')
+        self._assertSame(Records(), colander.null)
+        schema = Records(missing=colander.drop)
+        self.assertEqual(
+            self._callFUT(schema, colander.null, output='columns'),
+            colander.drop,
+        )
+
+    def test_other_items(self):
+        import collections
+
+        class Records(colander.SequenceSchema):
+            record = Record(missing=None)
+
+        schema = Records()
+        cstruct = make_cstruct()
+        cstruct.insert(1, colander.null)
+        cstruct.insert(0, colander.drop)
+        cstruct.append(collections.OrderedDict(id='4', kind='b'))
+        self._assertSame(schema, cstruct)
+        result = self._callFUT(schema, cstruct, output='columns')
+        self.assertEqual(list(result['id']), [1, colander.drop, 2, 3, 4])
+        self.assertEqual(
+            result['score'][:3], [0.5, colander.drop, colander.drop]
+        )
+        cstruct.append('x')
+        cstruct[3]['id'] = 'x'
+        self._assertSame(schema, cstruct)
+
+    def test_dropped_items(self):
+        class Records(colander.SequenceSchema):
+            record = Record(missing=colander.drop)
+
+        schema = Records()
+        cstruct = [colander.null] + make_cstruct()
+        self._assertSame(schema, cstruct)
+
+    def test_row_validators(self):
+        import collections
+
+        def validator(node, value):
+            if value['id'] == 2:
+                raise colander.Invalid(node, 'No 2')
+
+        class Records(colander.SequenceSchema):
+            record = Record(validator=validator)
+
+        schema = Records()
+        cstruct = make_cstruct()
+        self._assertSame(schema, cstruct)
+        cstruct[0]['id'] = 'x'
+        self._assertSame(schema, cstruct)
+        cstruct[1]['id'] = '3'
+        cstruct.append(collections.OrderedDict(id='2', kind='a'))
+        self._assertSame(schema, cstruct)
+        with self.assertRaises(colander.Invalid):
+            self._callFUT(schema, cstruct, output='columns')
+        cstruct[-1]['id'] = '5'
+        cstruct[0]['id'] = '1'
+        self._assertSame(schema, cstruct)
+        result = self._callFUT(schema, cstruct, output='columns')
+        self.assertEqual(list(result['id']), [1, 3, 3, 5])
+
+    def test_sequence_validator(self):
+        schema = Records(validator=colander.Length(max=2))
+        self._assertSame(schema, make_cstruct())
+        with self.assertRaises(colander.Invalid):
+            self._callFUT(schema, make_cstruct(), output='columns')
+        result = self._callFUT(schema, make_cstruct()[:2], output='columns')
+        self.assertEqual(list(result['id']), [1, 2])
+
+    def test_unbound_deferred_validator(self):
+        schema = Records().clone()
+        schema['record']['id'].validator = colander.deferred(lambda n, kw: 1)
+        self.assertRaises(
+            colander.UnboundDeferredError,
+            self._callFUT,
+            schema,
+            make_cstruct(),
+        )
+
+    def test_fallback_to_schema(self):
+        schema = Records(preparer=lambda value: value[:1])
+        self._assertSame(schema, make_cstruct())
+        result = self._callFUT(schema, make_cstruct(), output='columns')
+        self.assertEqual(list(result['id']), [1])
+        self.assertEqual(result['at'], [None])
+        schema = Records().clone()
+        schema['record'].typ = colander.Mapping(unknown='raise')
+        self._assertSame(schema, make_cstruct())
+        schema = Records(colander.Sequence(accept_scalar=True))
+        self._assertSame(schema, make_cstruct()[0])
+
+    def test_fallback_per_field(self):
+        class Lower(colander.SchemaNode):
+            schema_type = colander.String
+
+            def deserialize(self, cstruct=colander.null):
+                return colander.SchemaNode.deserialize(self, cstruct).lower()
+
+        class Record(colander.MappingSchema):
+            name = Lower()
+            strict = colander.SchemaNode(colander.Int(strict=True))
+            stamp = colander.SchemaNode(
+                colander.DateTime(format='%Y'), preparer=lambda v: v
+            )
+
+        class Records(colander.SequenceSchema):
+            record = Record()
+
+        schema = Records()
+        self._assertSame(
+            schema, [{'name': 'ABC', 'strict': '1', 'stamp': '2020'}]
+        )
+        self._assertSame(schema, [{'name': 'a', 'strict': 1.5, 'stamp': 'x'}])
+        result = self._callFUT(
+            schema,
+            [{'name': 'ABC', 'strict': '1', 'stamp': '2020'}],
+            output='columns',
+        )
+        self.assertEqual(result['name'], ['abc'])
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class Test_deserialize_numpy(Test_deserialize):
+    use_numpy = True
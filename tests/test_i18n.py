@@ -0,0 +1,173 @@
+import gettext
+import os
+import shutil
+import tempfile
+import translationstring
+import unittest
+
+import colander
+
+
+class Test_load_catalogs(unittest.TestCase):
+    def _callFUT(self, *arg, **kw):
+        from colander.i18n import load_catalogs
+
+        return load_catalogs(*arg, **kw)
+
+    def test_default(self):
+        from colander.i18n import LOCALE_DIR
+
+        catalogs = self._callFUT()
+        self.assertIn('de', catalogs)
+        self.assertIn('pt_BR', catalogs)
+        self.assertEqual(catalogs['de']['Required'], 'Pflichtangabe')
+        self.assertNotIn('', catalogs['de'])
+        translations = gettext.translation('colander', LOCALE_DIR, ['fr'])
+        for msgid, msgstr in catalogs['fr'].items():
+            self.assertEqual(translations.gettext(msgid), msgstr)
+
+    def test_locales(self):
+        catalogs = self._callFUT(locales=['de', 'fr'])
+        self.assertEqual(sorted(catalogs), ['de', 'fr'])
+        self.assertRaises(OSError, self._callFUT, locales=['xx'])
+
+    def test_localedir(self):
+        from colander.i18n import LOCALE_DIR
+
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        os.makedirs(os.path.join(tmpdir, 'de', 'LC_MESSAGES'))
+        os.makedirs(os.path.join(tmpdir, 'fr', 'LC_MESSAGES'))
+        shutil.copy(
+            os.path.join(LOCALE_DIR, 'de', 'LC_MESSAGES', 'colander.mo'),
+            os.path.join(tmpdir, 'de', 'LC_MESSAGES', 'other.mo'),
+        )
+        catalogs = self._callFUT(tmpdir, 'other')
+        self.assertEqual(list(catalogs), ['de'])
+        self.assertEqual(self._callFUT(tmpdir), {})
+
+
+class TestTranslator(unittest.TestCase):
+    def _makeOne(self, catalogs=None, **kw):
+        from colander.i18n import Translator
+
+        return Translator(catalogs, **kw)
+
+    def _reference(self, locale):
+        from colander.i18n import LOCALE_DIR
+
+        translations = gettext.translation('colander', LOCALE_DIR, [locale])
+        return translationstring.Translator(
+            translations, translationstring.ugettext_policy
+        )
+
+    def test_same_as_translationstring(self):
+        _ = colander._
+        msgs = [
+            _('Required'),
+            _('"${val}" is not a number', mapping={'val': 'x'}),
+            _('"${val}" is not a number', mapping={'val': 'y'}),
+            _('unknown ${val}', mapping={'val': 'z'}),
+            _('Required', default='Needed'),
+            'Required',
+            'plain',
+        ]
+        translator = self._makeOne()
+        for locale in ('de', 'ja'):
+            reference = self._reference(locale)
+            translate = translator.for_locale(locale)
+            for msg in msgs:
+                self.assertEqual(translate(msg), reference(msg))
+
+    def test_translate(self):
+        translator = self._makeOne()
+        msg = colander._('"${val}" is not a number', mapping={'val': 1})
+        result = translator.translate(msg, 'de')
+        self.assertEqual(result, '"1" ist keine Zahl')
+        self.assertIs(type(result), str)
+        self.assertEqual(
+            translator.translate(msg, 'xx'), '"1" is not a number'
+        )
+
+    def test_context(self):
+        catalogs = {'de': {'a\x04Required': 'A', 'Required': 'B'}}
+        translator = self._makeOne(catalogs)
+        msg = translationstring.TranslationString('Required', context='a')
+        self.assertEqual(translator.translate(msg, 'de'), 'A')
+        msg = translationstring.TranslationString('Required')
+        self.assertEqual(translator.translate(msg, 'de'), 'B')
+
+    def test_cache(self):
+        translator = self._makeOne({'de': {'${a}': 'x${a}'}}, maxsize=2)
+        translate = translator.for_locale('de')
+        self.assertIs(translator.for_locale('de'), translate)
+        for val in (1, 2, 1, 1):
+            msg = translationstring.TranslationString(
+                '${a}', mapping={'a': val}
+            )
+            self.assertEqual(translate(msg), 'x%d' % val)
+        info = translator.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+        translator.catalogs['de']['${a}'] = 'y${a}'
+        self.assertEqual(translate(msg), 'x1')
+        translator.cache_clear()
+        self.assertEqual(translate(msg), 'y1')
+
+    def test_cache_equal_values(self):
+        translator = self._makeOne({})
+        translate = translator.for_locale('de')
+        for val in (1, True, 1.0, 1):
+            msg = translationstring.TranslationString(
+                '${a}', mapping={'a': val}
+            )
+            self.assertEqual(translate(msg), str(val))
+        info = translator.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 3))
+
+    def test_cache_default(self):
+        translator = self._makeOne({})
+        translate = translator.for_locale('de')
+        msg1 = translationstring.TranslationString('a', default='one')
+        msg2 = translationstring.TranslationString('a', default='two')
+        self.assertEqual(translate(msg1), 'one')
+        self.assertEqual(translate(msg2), 'two')
+
+    def test_unhashable_mapping(self):
+        translator = self._makeOne({})
+        msg = translationstring.TranslationString('${a}', mapping={'a': [1]})
+        self.assertEqual(translator.translate(msg, 'de'), '[1]')
+        self.assertEqual(translator.cache_info().currsize, 0)
+
+    def test_asdict(self):
+        node = colander.SchemaNode(
+            colander.Mapping(),
+            colander.SchemaNode(colander.Int(), name='a'),
+            colander.SchemaNode(colander.Int(), name='b'),
+        )
+        try:
+            node.deserialize({'a': 'x'})
+        except colander.Invalid as e:
+            exc = e
+        translator = self._makeOne()
+        translate = translator.for_locale('de')
+        expected = {'a': '"x" ist keine Zahl', 'b': 'Pflichtangabe'}
+        self.assertEqual(exc.asdict(translate), expected)
+        self.assertEqual(exc.asdict(translator.for_locale('de')), expected)
+        self.assertEqual(translator.cache_info().misses, 2)
+
+    def test_error_collector(self):
+        node = colander.SchemaNode(colander.Int())
+        errors = colander.ErrorCollector()
+        for cstruct in ('x', 'y', 'x', colander.null):
+            node.deserialize(cstruct, errors=errors)
+        translator = self._makeOne()
+        self.assertEqual(
+            errors.messages(translator.for_locale('fr')),
+            [
+                '"x" n\'est pas un nombre',
+                '"y" n\'est pas un nombre',
+                '"x" n\'est pas un nombre',
+                'Requis',
+            ],
+        )
+        self.assertEqual(translator.cache_info().misses, 3)
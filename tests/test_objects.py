@@ -0,0 +1,262 @@
+import dataclasses
+import unittest
+
+import colander
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int = 0
+
+
+class PointSchema(colander.MappingSchema):
+    x = colander.SchemaNode(colander.Int())
+    y = colander.SchemaNode(colander.Int(), missing=colander.drop)
+
+
+class TestRecord(unittest.TestCase):
+    def _makeClass(self):
+        from colander.objects import Record
+
+        class Pair(Record):
+            __slots__ = ('a', 'b')
+
+        return Pair
+
+    def test_init(self):
+        pair = self._makeClass()(a=1, b=2)
+        self.assertEqual((pair.a, pair.b), (1, 2))
+        self.assertFalse(hasattr(pair, '__dict__'))
+        self.assertRaises(AttributeError, self._makeClass(), c=1)
+
+    def test_eq(self):
+        Pair = self._makeClass()
+        self.assertEqual(Pair(a=1, b=2), Pair(a=1, b=2))
+        self.assertNotEqual(Pair(a=1, b=2), Pair(a=1, b=3))
+        self.assertNotEqual(Pair(a=1), Pair(a=1, b=colander.drop))
+        self.assertEqual(Pair(a=1), Pair(a=1, b=colander.null))
+        self.assertNotEqual(Pair(a=1, b=2), self._makeClass()(a=1, b=2))
+
+    def test_repr(self):
+        Pair = self._makeClass()
+        self.assertEqual(repr(Pair(a=1, b='x')), "Pair(a=1, b='x')")
+        self.assertEqual(repr(Pair(b=2)), 'Pair(b=2)')
+
+
+class Test_record_class(unittest.TestCase):
+    def _callFUT(self, node, name=None):
+        from colander.objects import record_class
+
+        return record_class(node, name)
+
+    def test_slots(self):
+        from colander.objects import Record
+
+        cls = self._callFUT(PointSchema())
+        self.assertTrue(issubclass(cls, Record))
+        self.assertEqual(cls.__slots__, ('x', 'y'))
+        self.assertEqual(cls.__name__, 'PointSchema')
+
+    def test_name(self):
+        node = colander.SchemaNode(
+            colander.Mapping(), colander.SchemaNode(colander.Int(), name='a')
+        )
+        self.assertEqual(self._callFUT(node).__name__, 'Record')
+        self.assertEqual(self._callFUT(node, 'Row').__name__, 'Row')
+
+
+class Test_namedtuple_class(unittest.TestCase):
+    def _callFUT(self, node, name=None):
+        from colander.objects import namedtuple_class
+
+        return namedtuple_class(node, name)
+
+    def test_fields(self):
+        cls = self._callFUT(PointSchema())
+        self.assertEqual(cls._fields, ('x', 'y'))
+        self.assertEqual(cls.__name__, 'PointSchema')
+        self.assertEqual(cls(x=1), (1, colander.null))
+        self.assertEqual(self._callFUT(PointSchema(), 'Row').__name__, 'Row')
+
+
+class TestObject(unittest.TestCase):
+    def _makeOne(self, factory=Point, **kw):
+        from colander.objects import Object
+
+        return PointSchema(Object(factory, **kw))
+
+    def test_deserialize(self):
+        schema = self._makeOne()
+        self.assertEqual(schema.deserialize({'x': '1', 'y': '2'}), Point(1, 2))
+        self.assertEqual(schema.deserialize({'x': '1'}), Point(1))
+        self.assertRaises(colander.Invalid, schema.deserialize, {'y': '1'})
+        self.assertRaises(colander.Invalid, schema.deserialize, 'x')
+        self.assertRaises(colander.Invalid, schema.deserialize, colander.null)
+
+    def test_deserialize_records(self):
+        schema = self._makeOne(None)
+        point = schema.deserialize({'x': '1', 'y': '2'})
+        self.assertEqual(type(point).__name__, 'PointSchema')
+        self.assertEqual((point.x, point.y), (1, 2))
+        self.assertIs(type(schema.deserialize({'x': '3'})), type(point))
+
+    def test_serialize(self):
+        schema = self._makeOne()
+        expected = {'x': '1', 'y': '2'}
+        self.assertEqual(schema.serialize(Point(1, 2)), expected)
+        self.assertEqual(schema.serialize({'x': 1, 'y': 2}), expected)
+        self.assertEqual(
+            schema.serialize(colander.null),
+            {'x': colander.null, 'y': colander.null},
+        )
+        self.assertEqual(
+            schema.serialize_json(Point(1, 2)), '{"x": "1", "y": "2"}'
+        )
+        record = self._makeOne(None).deserialize({'x': '1'})
+        self.assertEqual(
+            schema.serialize(record), {'x': '1', 'y': colander.null}
+        )
+
+    def test_serialize_not_an_object(self):
+        schema = self._makeOne()
+        self.assertRaises(colander.Invalid, schema.serialize, 1)
+
+    def test_unknown(self):
+        schema = self._makeOne(dict, unknown='preserve')
+        self.assertEqual(
+            schema.deserialize({'x': '1', 'z': 'a'}), {'x': 1, 'z': 'a'}
+        )
+        schema = self._makeOne(unknown='raise')
+        self.assertEqual(schema.serialize(Point(1)), {'x': '1', 'y': '0'})
+        self.assertIsNone(schema.check_appstruct(Point(1)))
+        self.assertIsNotNone(schema.validate({'x': '1', 'z': 'a'}))
+
+    def test_try_deserialize(self):
+        class Points(colander.SequenceSchema):
+            point = self._makeOne()
+
+        schema = Points()
+        appstruct, error = schema.try_deserialize([{'x': '1'}, {'x': '2'}])
+        self.assertEqual(appstruct, [Point(1), Point(2)])
+        self.assertIsNone(error)
+        appstruct, error = schema.try_deserialize([{'x': '1'}, {'y': 'x'}])
+        self.assertIs(appstruct, colander.null)
+        self.assertEqual(
+            error.asdict(),
+            {'1.x': 'Required', '1.y': '"x" is not a number'},
+        )
+        self.assertIsNone(schema.validate([{'x': '1'}]))
+        self.assertEqual(
+            schema.validate([{'y': '1'}]).asdict(), {'0.x': 'Required'}
+        )
+
+    def test_check_appstruct(self):
+        schema = self._makeOne()
+        self.assertIsNone(schema.check_appstruct(Point(1, 2)))
+        self.assertEqual(
+            schema._check_appstruct(Point(1.5, 2)), (Point(1, 2), None)
+        )
+        self.assertEqual(
+            schema.check_appstruct(Point('x')).asdict(),
+            {'x': '"x" is not a number'},
+        )
+
+    def test_missing_attribute(self):
+        class Partial:
+            x = 1
+
+        schema = self._makeOne()
+        self.assertEqual(
+            schema.serialize(Partial()), {'x': '1', 'y': colander.null}
+        )
+        self.assertIsNone(schema.check_appstruct(Partial()))
+        del Partial.x
+        self.assertEqual(
+            schema.check_appstruct(Partial()).asdict(), {'x': 'Required'}
+        )
+
+    def test_subclass(self):
+        from colander.objects import Object
+
+        class Custom(Object):
+            def deserialize(self, node, cstruct):
+                return super().deserialize(node, cstruct)
+
+        schema = PointSchema(Custom(Point))
+        self.assertEqual(schema.try_deserialize({'x': '1'}), (Point(1), None))
+        self.assertEqual(
+            schema.validate({'x': 'x'}).asdict(), {'x': '"x" is not a number'}
+        )
+        self.assertIsNone(schema.check_appstruct(Point(1)))
+
+    def test_record_modes(self):
+        class Points(colander.SequenceSchema):
+            point = self._makeOne(None, record_mode='namedtuple')
+
+        schema = Points()
+        points = schema.deserialize([{'x': '1', 'y': '2'}, {'x': '3'}])
+        self.assertEqual(points, [(1, 2), (3, colander.null)])
+        self.assertEqual(type(points[0])._fields, ('x', 'y'))
+        self.assertEqual(points[1].x, 3)
+        expected = [{'x': '1', 'y': '2'}, {'x': '3', 'y': colander.null}]
+        self.assertEqual(schema.serialize(points), expected)
+        self.assertIsNone(schema.check_appstruct(points))
+        self.assertEqual(
+            schema.try_deserialize([{'x': '1'}]), ([(1, colander.null)], None)
+        )
+        schema['point'].typ.record_mode = 'tuple'
+        points = schema.deserialize([{'x': '1', 'y': '2'}, {'x': '3'}])
+        self.assertEqual(points, [(1, 2), (3, colander.null)])
+        self.assertIs(type(points[0]), tuple)
+        self.assertEqual(schema.serialize(points), expected)
+        self.assertIsNone(schema.check_appstruct(points))
+
+    def test_record_mode_invalid(self):
+        self.assertRaises(ValueError, self._makeOne, record_mode='dict')
+        schema = self._makeOne(None)
+        self.assertEqual(schema.typ.record_mode, 'slots')
+        with self.assertRaises(ValueError):
+            schema.typ.record_mode = 'dict'
+
+    def test_preserve_without_factory(self):
+        for record_mode in ('slots', 'namedtuple', 'tuple'):
+            self.assertRaises(
+                ValueError,
+                self._makeOne,
+                None,
+                unknown='preserve',
+                record_mode=record_mode,
+            )
+        schema = self._makeOne(dict, unknown='preserve', record_mode='tuple')
+        typ = schema.typ
+        with self.assertRaises(ValueError):
+            typ.factory = None
+        self.assertIs(typ.factory, dict)
+        typ.unknown = 'ignore'
+        typ.factory = None
+        with self.assertRaises(ValueError):
+            typ.unknown = 'preserve'
+        self.assertEqual(typ.unknown, 'ignore')
+
+    def test_record_mode_cache(self):
+        schema = self._makeOne(None)
+        record = schema.deserialize({'x': '1'})
+        schema.typ.record_mode = 'namedtuple'
+        self.assertEqual(schema.deserialize({'x': '1'}), (1, colander.null))
+        schema.typ.record_mode = 'slots'
+        self.assertIs(type(schema.deserialize({'x': '1'})), type(record))
+
+    def test_serialize_tuple(self):
+        schema = self._makeOne()
+        self.assertEqual(schema.serialize((1, 2)), {'x': '1', 'y': '2'})
+        with self.assertRaises(colander.Invalid) as cm:
+            schema.serialize((1,))
+        self.assertEqual(
+            cm.exception.asdict(),
+            {
+                '': '"(1,)" has an incorrect number of elements '
+                '(expected 2, was 1)'
+            },
+        )
+        self.assertIsNotNone(schema.check_appstruct((1, 2, 3)))
@@ -0,0 +1,499 @@
+import unittest
+
+import colander
+
+
+def unique_ids(node, value):
+    ids = [item['id'] for item in value]
+    if len(ids) != len(set(ids)):
+        raise colander.Invalid(node, 'Duplicate ids')
+
+
+class Test_parse_pointer(unittest.TestCase):
+    def _callFUT(self, pointer):
+        from colander.patch import parse_pointer
+
+        return parse_pointer(pointer)
+
+    def test_root(self):
+        self.assertEqual(self._callFUT(''), [])
+
+    def test_escapes(self):
+        self.assertEqual(self._callFUT('/a~1b/~01/'), ['a/b', '~1', ''])
+
+    def test_invalid(self):
+        from colander.patch import PatchError
+
+        self.assertRaises(PatchError, self._callFUT, 'a/b')
+
+
+class Test_apply_patch(unittest.TestCase):
+    def _callFUT(self, schema, appstruct, patch):
+        from colander.patch import apply_patch
+
+        return apply_patch(schema, appstruct, patch)
+
+    def _makeSchema(self, items_validator=None, validator=None):
+        class Item(colander.MappingSchema):
+            id = colander.SchemaNode(colander.Int())
+            qty = colander.SchemaNode(
+                colander.Int(),
+                missing=colander.drop,
+                validator=colander.Range(0, 5),
+            )
+            note = colander.SchemaNode(colander.String(), missing='')
+
+        class Items(colander.SequenceSchema):
+            item = Item()
+
+        class Pair(colander.TupleSchema):
+            x = colander.SchemaNode(colander.Int())
+            y = colander.SchemaNode(colander.Int(), missing=colander.drop)
+
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            alias = colander.SchemaNode(
+                colander.String(), missing=colander.drop
+            )
+            count = colander.SchemaNode(colander.Int(), missing=colander.drop)
+            items = Items(validator=items_validator)
+            pair = Pair()
+
+        return Schema(validator=validator)
+
+    def _makeAppstruct(self):
+        return {
+            'name': 'fred',
+            'items': [{'id': 1, 'note': ''}, {'id': 2, 'qty': 3, 'note': ''}],
+            'pair': (1, 2),
+        }
+
+    def _assertPatchError(self, patch, schema=None):
+        from colander.patch import PatchError
+
+        if schema is None:
+            schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        self.assertRaises(PatchError, self._callFUT, schema, appstruct, patch)
+        self.assertEqual(appstruct, self._makeAppstruct())
+
+    def test_add_and_replace(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        result = self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'add', 'path': '/alias', 'value': 'freddy'},
+                {'op': 'replace', 'path': '/items/1/qty', 'value': '4'},
+                {'op': 'replace', 'path': '/pair/y', 'value': '9'},
+            ],
+        )
+        self.assertEqual(result['alias'], 'freddy')
+        self.assertEqual(result['items'][1]['qty'], 4)
+        self.assertEqual(result['pair'], (1, 9))
+        self.assertEqual(appstruct, self._makeAppstruct())
+        self.assertTrue(result['items'][0] is appstruct['items'][0])
+
+    def test_add_replaces_tuple_element(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [{'op': 'add', 'path': '/pair/x', 'value': '5'}],
+        )
+        self.assertEqual(result['pair'], (5, 2))
+
+    def test_add_sequence_items(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {'op': 'add', 'path': '/items/0', 'value': {'id': '5'}},
+                {'op': 'add', 'path': '/items/-', 'value': {'id': '6'}},
+            ],
+        )
+        self.assertEqual(
+            [item['id'] for item in result['items']], [5, 1, 2, 6]
+        )
+
+    def test_add_drop(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['alias'] = 'freddy'
+        result = self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'add', 'path': '/alias', 'value': colander.null},
+                {'op': 'add', 'path': '/count', 'value': colander.null},
+            ],
+        )
+        self.assertFalse('alias' in result)
+        self.assertFalse('count' in result)
+
+    def test_add_drop_sequence_item(self):
+        schema = self._makeSchema()
+        schema['items'].children[0].missing = colander.drop
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [{'op': 'add', 'path': '/items/0', 'value': colander.null}],
+        )
+        self.assertEqual(len(result['items']), 2)
+
+    def test_replace_drop(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {'op': 'replace', 'path': '/items/1/qty', 'value': ''},
+                {'op': 'replace', 'path': '/pair/y', 'value': ''},
+            ],
+        )
+        self.assertFalse('qty' in result['items'][1])
+        self.assertEqual(result['pair'], (1, colander.drop))
+
+    def test_replace_root(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {
+                    'op': 'replace',
+                    'path': '',
+                    'value': {'name': 'bob', 'items': [], 'pair': ('3', '4')},
+                },
+                {'op': 'add', 'path': '/alias', 'value': 'bobby'},
+            ],
+        )
+        self.assertEqual(
+            result,
+            {'name': 'bob', 'alias': 'bobby', 'items': [], 'pair': (3, 4)},
+        )
+
+    def test_add_root(self):
+        schema = self._makeSchema()
+        value = {'name': 'bob', 'items': [], 'pair': ('3', '4')}
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [{'op': 'add', 'path': '', 'value': value}],
+        )
+        self.assertEqual(result, {'name': 'bob', 'items': [], 'pair': (3, 4)})
+
+    def test_add_root_invalid(self):
+        schema = self._makeSchema()
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                self._makeAppstruct(),
+                [{'op': 'add', 'path': '', 'value': {}}],
+            )
+        self.assertTrue(cm.exception.node is schema)
+        self.assertEqual(
+            cm.exception.asdict(),
+            {'name': 'Required', 'items': 'Required', 'pair': 'Required'},
+        )
+
+    def test_remove(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {'op': 'remove', 'path': '/items/0'},
+                {'op': 'remove', 'path': '/items/0/qty'},
+                {'op': 'remove', 'path': '/items/0/note'},
+            ],
+        )
+        self.assertEqual(result['items'], [{'id': 2, 'note': ''}])
+
+    def test_remove_note_uses_missing(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['items'][0]['note'] = 'hello'
+        result = self._callFUT(
+            schema, appstruct, [{'op': 'remove', 'path': '/items/0/note'}]
+        )
+        self.assertEqual(result['items'][0]['note'], '')
+
+    def test_remove_required(self):
+        schema = self._makeSchema()
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                self._makeAppstruct(),
+                [{'op': 'remove', 'path': '/items/1/id'}],
+            )
+        self.assertTrue(cm.exception.node is schema)
+        self.assertEqual(cm.exception.asdict(), {'items.1.id': 'Required'})
+
+    def test_remove_errors(self):
+        self._assertPatchError([{'op': 'remove', 'path': ''}])
+        self._assertPatchError([{'op': 'remove', 'path': '/pair/x'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/alias'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/items/2'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/items/-'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/items/01'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/items/x/id'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/name/x'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/unknown'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/pair/z'}])
+        self._assertPatchError([{'op': 'remove', 'path': '/alias/x'}])
+
+    def test_move(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['alias'] = 'freddy'
+        result = self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'move', 'from': '/items/0', 'path': '/items/-'},
+                {'op': 'move', 'from': '/alias', 'path': '/name'},
+                {'op': 'move', 'from': '/items/0/qty', 'path': '/count'},
+                {'op': 'move', 'from': '/pair', 'path': '/pair'},
+            ],
+        )
+        self.assertEqual([item['id'] for item in result['items']], [2, 1])
+        self.assertEqual(result['name'], 'freddy')
+        self.assertFalse('alias' in result)
+        self.assertEqual(result['count'], 3)
+        self.assertFalse('qty' in result['items'][0])
+        self.assertEqual(appstruct['alias'], 'freddy')
+
+    def test_move_into_itself(self):
+        self._assertPatchError(
+            [{'op': 'move', 'from': '/items', 'path': '/items/0'}]
+        )
+
+    def test_move_to_root(self):
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+
+        class Outer(colander.MappingSchema):
+            inner = Schema()
+
+        schema = Outer()
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                {'inner': {'name': 'fred'}},
+                [{'op': 'move', 'from': '/inner/name', 'path': ''}],
+            )
+        self.assertTrue(cm.exception.node is schema)
+
+    def test_copy(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        result = self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'copy', 'from': '/items/1', 'path': '/items/0'},
+                {'op': 'replace', 'path': '/items/0/id', 'value': '7'},
+                {'op': 'copy', 'from': '/pair/x', 'path': '/count'},
+            ],
+        )
+        self.assertEqual([item['id'] for item in result['items']], [7, 1, 2])
+        self.assertEqual(result['count'], 1)
+        self.assertEqual(appstruct, self._makeAppstruct())
+
+    def test_copy_root(self):
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+
+        schema = Schema()
+        appstruct = {'name': 'fred'}
+        result = self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'copy', 'from': '', 'path': ''},
+                {'op': 'replace', 'path': '/name', 'value': 'bob'},
+            ],
+        )
+        self.assertEqual(result, {'name': 'bob'})
+        self.assertEqual(appstruct, {'name': 'fred'})
+
+    def test_copy_invalid(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        appstruct['alias'] = 'freddy'
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                appstruct,
+                [{'op': 'copy', 'from': '/alias', 'path': '/count'}],
+            )
+        self.assertEqual(
+            cm.exception.asdict(), {'count': '"freddy" is not a number'}
+        )
+
+    def test_test(self):
+        schema = self._makeSchema()
+        result = self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {'op': 'test', 'path': '/items/1/qty', 'value': '3'},
+                {'op': 'test', 'path': '/pair', 'value': ['1', '2']},
+            ],
+        )
+        self.assertEqual(result, self._makeAppstruct())
+
+    def test_test_fails(self):
+        self._assertPatchError(
+            [{'op': 'test', 'path': '/items/1/qty', 'value': '4'}]
+        )
+        self._assertPatchError(
+            [{'op': 'test', 'path': '/items/0/qty', 'value': '4'}]
+        )
+        self._assertPatchError(
+            [{'op': 'move', 'from': '/pair/y', 'path': '/count'}]
+        )
+
+    def test_invalid_value(self):
+        schema = self._makeSchema()
+        appstruct = self._makeAppstruct()
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                appstruct,
+                [
+                    {'op': 'add', 'path': '/alias', 'value': 'freddy'},
+                    {'op': 'replace', 'path': '/items/1/qty', 'value': '6'},
+                ],
+            )
+        self.assertTrue(cm.exception.node is schema)
+        self.assertEqual(
+            cm.exception.asdict(),
+            {'items.1.qty': '6 is greater than maximum value 5'},
+        )
+        self.assertEqual(appstruct, self._makeAppstruct())
+
+    def test_ancestor_validators(self):
+        schema = self._makeSchema(items_validator=unique_ids)
+        patch = [{'op': 'add', 'path': '/items/-', 'value': {'id': '1'}}]
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(schema, self._makeAppstruct(), patch)
+        self.assertEqual(cm.exception.asdict(), {'items': 'Duplicate ids'})
+        patch.append({'op': 'remove', 'path': '/items/0'})
+        result = self._callFUT(schema, self._makeAppstruct(), patch)
+        self.assertEqual([item['id'] for item in result['items']], [2, 1])
+
+    def test_ancestor_validators_are_incremental(self):
+        calls = []
+
+        def validator(node, value):
+            calls.append(node.name)
+
+        schema = self._makeSchema(items_validator=validator)
+        schema['items'].children[0].validator = validator
+        schema['pair'].validator = validator
+        self._callFUT(
+            schema,
+            self._makeAppstruct(),
+            [
+                {'op': 'replace', 'path': '/items/1/qty', 'value': '1'},
+                {'op': 'add', 'path': '/items/0', 'value': {'id': '3'}},
+            ],
+        )
+        # the inserted item is validated when deserialized, the item it
+        # shifted is validated once the patch has been applied
+        self.assertEqual(calls, ['item', 'item', 'items'])
+
+    def test_dirty_paths_follow_removals(self):
+        calls = []
+
+        def validator(node, value):
+            calls.append(value['id'])
+
+        schema = self._makeSchema()
+        schema['items'].children[0].validator = validator
+        appstruct = self._makeAppstruct()
+        appstruct['items'].append({'id': 3, 'note': ''})
+        self._callFUT(
+            schema,
+            appstruct,
+            [
+                {'op': 'remove', 'path': '/items/1/qty'},
+                {'op': 'remove', 'path': '/items/2/note'},
+                {'op': 'remove', 'path': '/items/1'},
+                {'op': 'replace', 'path': '/items/0/note', 'value': 'x'},
+                {'op': 'replace', 'path': '/items/0', 'value': {'id': '4'}},
+            ],
+        )
+        self.assertEqual(calls, [4, 3])
+
+    def test_root_validator(self):
+        def validator(node, value):
+            if value['name'] == value.get('alias'):
+                raise colander.Invalid(node, 'Same alias')
+
+        schema = self._makeSchema(validator=validator)
+        with self.assertRaises(colander.Invalid) as cm:
+            self._callFUT(
+                schema,
+                self._makeAppstruct(),
+                [{'op': 'add', 'path': '/alias', 'value': 'fred'}],
+            )
+        self.assertEqual(cm.exception.asdict(), {'': 'Same alias'})
+
+    def test_malformed_operations(self):
+        self._assertPatchError([{'path': '/name'}])
+        self._assertPatchError([{'op': 'add'}])
+        self._assertPatchError([{'op': 'add', 'path': 1, 'value': 'x'}])
+        self._assertPatchError(['add'])
+        self._assertPatchError([{'op': 'add', 'path': '/name'}])
+        self._assertPatchError([{'op': 'move', 'path': '/name'}])
+        self._assertPatchError([{'op': 'frobnicate', 'path': '/name'}])
+
+    def test_bad_paths(self):
+        self._assertPatchError(
+            [{'op': 'add', 'path': '/items/3', 'value': {'id': '1'}}]
+        )
+        self._assertPatchError(
+            [{'op': 'replace', 'path': '/items/-', 'value': {'id': '1'}}]
+        )
+        self._assertPatchError(
+            [{'op': 'replace', 'path': '/alias', 'value': 'x'}]
+        )
+        self._assertPatchError(
+            [{'op': 'copy', 'from': '/alias', 'path': '/name'}]
+        )
+        self._assertPatchError(
+            [{'op': 'copy', 'from': '/name', 'path': '/unknown'}]
+        )
+
+
+class Test_deserialize_patch(unittest.TestCase):
+    def _callFUT(self, schema, appstruct, delta):
+        from colander.patch import deserialize_patch
+
+        return deserialize_patch(schema, appstruct, delta)
+
+    def test_same_as_method(self):
+        class Schema(colander.MappingSchema):
+            name = colander.SchemaNode(colander.String())
+            age = colander.SchemaNode(
+                colander.Int(), validator=colander.Range(0, 200)
+            )
+
+        schema = Schema()
+        appstruct = {'name': 'fred', 'age': 20}
+        for delta in ({'age': '30'}, {'name': 'bob', 'age': '300'}):
+            result, error = self._callFUT(schema, appstruct, delta)
+            expected, expected_error = schema.deserialize_patch(
+                appstruct, delta
+            )
+            self.assertEqual(result, expected)
+            self.assertEqual(
+                error and error.asdict(),
+                expected_error and expected_error.asdict(),
+            )
+        self.assertEqual(appstruct, {'name': 'fred', 'age': 20})
@@ -0,0 +1,336 @@
+import io
+import json
+import unittest
+
+import colander
+
+
+def _makeSchema(unknown='ignore'):
+    class Item(colander.MappingSchema):
+        id = colander.SchemaNode(colander.Int())
+        price = colander.SchemaNode(
+            colander.Float(), validator=colander.Range(0, 100)
+        )
+        tags = colander.SchemaNode(colander.List(), missing=colander.drop)
+
+    class Items(colander.SequenceSchema):
+        item = Item()
+
+    class Pair(colander.TupleSchema):
+        x = colander.SchemaNode(colander.Int())
+        y = colander.SchemaNode(colander.String())
+
+    class Schema(colander.MappingSchema):
+        name = colander.SchemaNode(colander.String())
+        note = colander.SchemaNode(colander.String(), missing='')
+        items = Items(validator=colander.Length(max=3))
+        pair = Pair(missing=colander.drop)
+        size = colander.SchemaNode(
+            colander.Int(),
+            preparer=lambda value: value and value * 2,
+            missing=0,
+        )
+
+    return Schema(colander.Mapping(unknown=unknown))
+
+
+class Reader:
+    def __init__(self, data):
+        if isinstance(data, bytes):
+            self.fp = io.BytesIO(data)
+        else:
+            self.fp = io.StringIO(data)
+        self.reads = 0
+
+    def read(self, size):
+        self.reads += 1
+        return self.fp.read(size)
+
+
+class Test_deserialize(unittest.TestCase):
+    def _callFUT(self, schema, data, chunk_size=65536):
+        from colander.stream import deserialize
+
+        return deserialize(schema, Reader(data), chunk_size)
+
+    def _assertSame(self, schema, text):
+        expected = schema.deserialize(json.loads(text))
+        for data in (text, text.encode('utf-8')):
+            for chunk_size in (1, 2, 3, 7, 65536):
+                result = self._callFUT(schema, data, chunk_size)
+                self.assertEqual(result, expected)
+
+    def _assertSameError(self, schema, text):
+        e = invalid_exc(schema.deserialize, json.loads(text))
+        for chunk_size in (1, 5, 65536):
+            e2 = invalid_exc(self._callFUT, schema, text, chunk_size)
+            self.assertEqual(e2.asdict(), e.asdict())
+
+    def _makeText(self, **kw):
+        doc = {
+            'name': 'café ☃',
+            'items': [
+                {'id': 1, 'price': 1.5, 'tags': ['a', {'b': None}]},
+                {'id': '-2', 'price': 2e1},
+            ],
+            'pair': [3, 'y'],
+            'size': 21,
+        }
+        doc.update(kw)
+        return json.dumps(doc)
+
+    def test_deserialize(self):
+        schema = _makeSchema()
+        self._assertSame(schema, self._makeText())
+
+    def test_deserialize_compact(self):
+        schema = _makeSchema()
+        text = json.dumps(json.loads(self._makeText()), separators=(',', ':'))
+        self._assertSame(schema, text)
+
+    def test_deserialize_whitespace(self):
+        schema = _makeSchema()
+        text = json.dumps(json.loads(self._makeText()), indent=2)
+        self._assertSame(schema, '\n ' + text + '\n')
+        self._assertSame(schema, '{"name" : "a" , "items" : [ ] }')
+
+    def test_deserialize_numbers(self):
+        schema = _makeSchema()
+        for price in ('1.5e1', '-0', '0.25', '1E+1', 'NaN', '1e-3'):
+            text = '{"name": "a", "items": [{"id": 10, "price": %s}]}' % price
+            result = self._callFUT(schema, text, 1)
+            expected = schema.deserialize(json.loads(text))
+            self.assertEqual(repr(result), repr(expected))
+
+    def test_deserialize_escaped_keys(self):
+        schema = _makeSchema()
+        self._assertSame(schema, '{"n\\u0061me": "a", "items": [], "\\"": 1}')
+
+    def test_deserialize_missing(self):
+        schema = _makeSchema()
+        self._assertSame(schema, '{"name": "a", "items": []}')
+        self._assertSameError(schema, '{"items": [{"id": 1}]}')
+
+    def test_deserialize_invalid_values(self):
+        schema = _makeSchema()
+        text = self._makeText(
+            name=1,
+            items=[{'id': 'x', 'price': 200}, {'id': 1, 'price': 1}],
+            pair=['x', 'y'],
+        )
+        self._assertSameError(schema, text)
+
+    def test_deserialize_container_validator(self):
+        schema = _makeSchema()
+        items = [{'id': 1, 'price': 1}] * 4
+        self._assertSameError(schema, self._makeText(items=items))
+
+    def test_deserialize_unknown(self):
+        schema = _makeSchema()
+        self._assertSame(schema, self._makeText(extra={'a': [1]}))
+        schema = _makeSchema(unknown='preserve')
+        self._assertSame(schema, self._makeText(extra={'a': [1]}))
+        schema = _makeSchema(unknown='raise')
+        self._assertSameError(schema, self._makeText(extra={'a': [1]}))
+
+    def test_deserialize_wrong_container(self):
+        schema = _makeSchema()
+        self._assertSameError(schema, self._makeText(items={'a': 1}))
+        self._assertSameError(schema, self._makeText(items=[1]))
+        self._assertSameError(schema, self._makeText(pair='xy'))
+        self._assertSameError(schema, '[]')
+
+    def test_deserialize_tuple_length(self):
+        schema = _makeSchema()
+        self._assertSameError(schema, self._makeText(pair=[1]))
+        self._assertSameError(schema, self._makeText(pair=[]))
+        self._assertSameError(schema, self._makeText(pair=[1, 'y', 2, 3]))
+        self._assertSameError(schema, self._makeText(pair=['x']))
+
+    def test_deserialize_accept_scalar(self):
+        schema = _makeSchema()
+        schema['items'].typ.accept_scalar = True
+        self._assertSame(schema, self._makeText(items={'id': 1, 'price': 1}))
+
+    def test_deserialize_custom_nodes(self):
+        class Items(colander.SequenceSchema):
+            item = colander.SchemaNode(colander.Int())
+
+            def deserialize(self, cstruct=colander.null):
+                return 'custom'
+
+        class Schema(colander.MappingSchema):
+            items = Items()
+            prepared = colander.SchemaNode(
+                colander.Mapping(unknown='preserve'), preparer=len
+            )
+
+        schema = Schema()
+        self._assertSame(schema, '{"items": [1, 2], "prepared": {"a": 1}}')
+
+    def test_deserialize_leaf(self):
+        node = colander.SchemaNode(colander.Int())
+        self._assertSame(node, ' 12 ')
+        self._assertSameError(node, '"x"')
+
+    def test_abort_stops_reading(self):
+        from colander.stream import deserialize
+
+        schema = _makeSchema(unknown='raise')
+        items = [{'id': 1, 'price': 1}] * 1000
+        text = '{"name": "a", "other": 1, "items": %s}' % json.dumps(items)
+        reader = Reader(text)
+        e = invalid_exc(deserialize, schema, reader, 10)
+        self.assertEqual(
+            e.asdict(),
+            {'': 'Unrecognized keys in mapping: ' '"{\'other\': 1}"'},
+        )
+        self.assertEqual(reader.reads, 3)
+
+    def test_malformed(self):
+        from colander.stream import StreamError
+
+        schema = _makeSchema()
+        for text in (
+            '',
+            ' ',
+            '{',
+            '{"name"',
+            '{"name" "a"}',
+            '{"name": "a" "items": []}',
+            '{"name": "a",}',
+            '{name: "a"}',
+            '{"name": "a", "items": [{"id": 1,}]}',
+            '{"name": "a", "items": [{"id": 1} {"id": 2}]}',
+            '{"name": "a", "items": [{"id": 1, "price": 1},]}',
+            '{"name": "a", "items": []]',
+            '{"name": "a", "items": [], "pair": [1 "x"]}',
+            '{"name": tru}',
+            '{"name": "abc}',
+            '{"name": "\\x"}',
+            '{"na\\me": 1}',
+            '{"name": "a", "items": []} x',
+            '{"name": "a", "items": [], "size": 1.}',
+            '{"name": "a", "x": [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, }',
+        ):
+            for chunk_size in (1, 65536):
+                self.assertRaises(
+                    StreamError, self._callFUT, schema, text, chunk_size
+                )
+
+    def test_malformed_position(self):
+        from colander.stream import StreamError
+
+        schema = _makeSchema()
+        text = '{"name": "a", "items": [{"id": 1}, {"id": 2}}'
+        try:
+            self._callFUT(schema, text, 4)
+        except StreamError as e:
+            self.assertEqual(str(e), "Expecting ',' delimiter: char 44")
+        else:  # pragma: no cover
+            self.fail('StreamError not raised')
+
+    def test_invalid_utf8(self):
+        from colander.stream import StreamError
+
+        schema = _makeSchema()
+        self.assertRaises(
+            StreamError, self._callFUT, schema, b'{"name": "\xff"}'
+        )
+
+
+class Test_iterdeserialize(unittest.TestCase):
+    def _callFUT(self, schema, fp, chunk_size=65536):
+        from colander.stream import iterdeserialize
+
+        return iterdeserialize(schema, fp, chunk_size)
+
+    def _makeSchema(self):
+        return _makeSchema()['items'].clone()
+
+    def test_items(self):
+        schema = self._makeSchema()
+        text = json.dumps([{'id': n, 'price': n} for n in range(100)])
+        reader = Reader(text)
+        result = self._callFUT(schema, reader, 16)
+        self.assertEqual(next(result), {'id': 0, 'price': 0.0})
+        self.assertEqual(reader.reads, 2)
+        self.assertEqual(len(list(result)), 99)
+
+    def test_multibyte_characters(self):
+        from colander.stream import StreamError
+
+        schema = colander.SchemaNode(
+            colander.Sequence(), colander.SchemaNode(colander.String())
+        )
+        data = '["h\u00e9llo", "\u20ac\U0001f600"]'.encode('utf-8')
+        for chunk_size in (1, 2, 3):
+            result = self._callFUT(schema, io.BytesIO(data), chunk_size)
+            self.assertEqual(list(result), ['h\u00e9llo', '\u20ac\U0001f600'])
+        result = self._callFUT(schema, io.BytesIO(data[:4]), 1)
+        self.assertRaises(StreamError, list, result)
+
+    def test_empty(self):
+        schema = self._makeSchema()
+        self.assertEqual(list(self._callFUT(schema, Reader(' [ ] '))), [])
+
+    def test_drop(self):
+        class Ints(colander.SequenceSchema):
+            item = colander.SchemaNode(
+                colander.Int(),
+                preparer=lambda value: colander.null if value else value,
+                missing=colander.drop,
+            )
+
+        result = self._callFUT(Ints(), Reader('[0, 1, 0]'))
+        self.assertEqual(list(result), [0, 0])
+
+    def test_invalid_item(self):
+        schema = self._makeSchema()
+        text = '[{"id": 1, "price": 1}, {"id": "x", "price": 1}, 1]'
+        result = self._callFUT(schema, Reader(text))
+        self.assertEqual(next(result), {'id': 1, 'price': 1.0})
+        e = invalid_exc(next, result)
+        self.assertEqual(e.asdict(), {'items.1.id': '"x" is not a number'})
+
+    def test_wrong_item(self):
+        schema = self._makeSchema()
+        result = self._callFUT(schema, Reader('[1]'))
+        e = invalid_exc(list, result)
+        self.assertEqual(list(e.asdict()), ['items.0'])
+
+    def test_not_a_sequence(self):
+        schema = self._makeSchema()
+        result = self._callFUT(schema, Reader('{"id": 1, "price": 1}'))
+        e = invalid_exc(list, result)
+        self.assertEqual(list(e.asdict()), ['items'])
+        schema.typ.accept_scalar = True
+        result = self._callFUT(schema, Reader('{"id": 1, "price": 1}'))
+        self.assertEqual(list(result), [{'id': 1, 'price': 1.0}])
+
+    def test_malformed(self):
+        from colander.stream import StreamError
+
+        schema = self._makeSchema()
+        result = self._callFUT(schema, Reader('[] []'))
+        self.assertRaises(StreamError, list, result)
+        result = self._callFUT(schema, Reader('[{"id": 1, "price": 1}'))
+        self.assertRaises(StreamError, list, result)
+        schema.typ.accept_scalar = True
+        result = self._callFUT(schema, Reader('{"id": 1, "price": 1} 1'))
+        self.assertRaises(StreamError, list, result)
+
+    def test_schema_not_a_sequence(self):
+        schema = _makeSchema()
+        self.assertRaises(ValueError, self._callFUT, schema, Reader('[]'))
+
+
+def invalid_exc(func, *arg, **kw):
+    from colander import Invalid
+
+    try:
+        func(*arg, **kw)
+    except Invalid as e:
+        return e
+    else:
+        raise AssertionError('Invalid not raised')  # pragma: no cover
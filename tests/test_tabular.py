@@ -0,0 +1,280 @@
+import io
+import unittest
+
+import colander
+
+
+class Point(colander.SchemaType):
+    # a leaf type with its own flattened layout
+    def serialize(self, node, appstruct):
+        if appstruct is colander.null:
+            return colander.null
+        return (str(appstruct[0]), str(appstruct[1]))
+
+    def deserialize(self, node, cstruct):
+        return (int(cstruct[0]), int(cstruct[1]))
+
+    def flatten(self, node, appstruct, prefix='', listitem=False):
+        if not listitem:
+            prefix = f'{prefix}{node.name}.'
+        return {prefix + 'x': appstruct[0], prefix + 'y': appstruct[1]}
+
+    def unflatten(self, node, paths, fstruct):
+        return (fstruct[node.name + '.x'], fstruct[node.name + '.y'])
+
+
+class Friend(colander.TupleSchema):
+    rank = colander.SchemaNode(colander.Int())
+    name = colander.SchemaNode(colander.String())
+
+
+class Phone(colander.MappingSchema):
+    location = colander.SchemaNode(colander.String())
+    number = colander.SchemaNode(colander.String(), missing='')
+
+
+class Friends(colander.SequenceSchema):
+    friend = Friend()
+
+
+class Phones(colander.SequenceSchema):
+    phone = Phone()
+
+
+class Person(colander.MappingSchema):
+    name = colander.SchemaNode(colander.String())
+    age = colander.SchemaNode(colander.Int(), missing=None)
+    friends = Friends(missing=())
+    phones = Phones(missing=())
+    home = colander.SchemaNode(Point())
+
+
+def make_rows():
+    return [
+        {
+            'name': 'keith',
+            'age': 20,
+            'friends': [(1, 'jim'), (2, 'bob, jr.')],
+            'phones': [{'location': 'home', 'number': '555-1212'}],
+            'home': (1, 2),
+        },
+        {
+            'name': 'fred',
+            'age': None,
+            'friends': [(3, 'joe')],
+            'phones': [],
+            'home': (3, 4),
+        },
+    ]
+
+
+HEADER = (
+    'name,age,friends.0.rank,friends.0.name,friends.1.rank,friends.1.name,'
+    'phones.0.location,phones.0.number,home.x,home.y\r\n'
+)
+
+
+class Test_read_csv(unittest.TestCase):
+    def _callFUT(self, schema, text, **kw):
+        from colander.tabular import read_csv
+
+        return read_csv(schema, io.StringIO(text), **kw)
+
+    def test_read(self):
+        text = (
+            HEADER
+            + 'keith,20,1,jim,2,"bob, jr.",home,555-1212,1,2\r\n'
+            + '\r\n'
+            + 'fred,,3,joe,4,ann,work,,3,4\r\n'
+        )
+        result = list(self._callFUT(Person(), text))
+        self.assertEqual(result[0], make_rows()[0])
+        self.assertEqual(
+            result[1],
+            {
+                'name': 'fred',
+                'age': None,
+                'friends': [(3, 'joe'), (4, 'ann')],
+                'phones': [{'location': 'work', 'number': ''}],
+                'home': (3, 4),
+            },
+        )
+
+    def test_same_as_unflatten(self):
+        import csv
+
+        schema = Person()
+        text = HEADER + 'keith,20,1,jim,2,bob,home,555,1,2\r\n'
+        expected = [
+            schema.deserialize(schema.unflatten(row))
+            for row in csv.DictReader(io.StringIO(text))
+        ]
+        self.assertEqual(list(self._callFUT(schema, text)), expected)
+
+    def test_read_tsv(self):
+        schema = Person()
+        text = HEADER.replace(',', '\t') + 'a\t\t1\tb\t2\tc\th\t5\t1\t2\n'
+        result = list(self._callFUT(schema, text, dialect='excel-tab'))
+        self.assertEqual(result[0]['friends'], [(1, 'b'), (2, 'c')])
+
+    def test_read_named_schema(self):
+        schema = Person(name='person')
+        text = 'person.name,person.home.x,person.home.y\r\na,1,2\r\n'
+        result = list(self._callFUT(schema, text))
+        self.assertEqual(
+            result,
+            [
+                {
+                    'name': 'a',
+                    'age': None,
+                    'friends': (),
+                    'phones': (),
+                    'home': (1, 2),
+                }
+            ],
+        )
+        self.assertRaises(ValueError, self._callFUT, schema, 'name\r\n')
+
+    def test_read_container_column(self):
+        text = 'name,phones,home.x,home.y\r\na,x,1,2\r\n'
+        result = list(self._callFUT(Person(), text))
+        self.assertEqual(result[0]['phones'], [])
+
+    def test_read_empty(self):
+        self.assertEqual(list(self._callFUT(Person(), '')), [])
+
+    def test_read_invalid_row(self):
+        text = 'name,age,home.x,home.y\r\na,1,1,2\r\nb,x,1,2\r\n'
+        result = self._callFUT(Person(), text)
+        self.assertEqual(next(result)['name'], 'a')
+        self.assertRaises(colander.Invalid, next, result)
+
+    def test_read_wrong_width(self):
+        text = 'name,home.x,home.y\r\na,1,2\r\nb,1\r\n'
+        result = self._callFUT(Person(), text)
+        next(result)
+        self.assertRaises(ValueError, next, result)
+
+    def test_bad_header(self):
+        schema = Person()
+        for header in (
+            'nope',
+            'name.first',
+            'phones.0.nope',
+            'phones.x.location',
+            'phones.1.location',
+            'friends.0.rank',
+            'friends.0.rank,friends.0.nope',
+            'name,name',
+        ):
+            self.assertRaises(
+                ValueError, self._callFUT, schema, header + '\r\n'
+            )
+
+
+class Test_write_csv(unittest.TestCase):
+    def _callFUT(self, schema, rows, **kw):
+        from colander.tabular import write_csv
+
+        fileobj = io.StringIO()
+        write_csv(schema, rows, fileobj, **kw)
+        return fileobj.getvalue()
+
+    def test_write(self):
+        result = self._callFUT(Person(), make_rows())
+        self.assertEqual(
+            result,
+            HEADER
+            + 'keith,20,1,jim,2,"bob, jr.",home,555-1212,1,2\r\n'
+            + 'fred,,3,joe,,,,,3,4\r\n',
+        )
+
+    def test_roundtrip(self):
+        from colander.tabular import read_csv
+
+        schema = Person()
+        rows = make_rows()
+        rows[1]['friends'].append((4, 'ann'))
+        rows[1]['phones'].append({'location': 'work', 'number': ''})
+        text = self._callFUT(schema, iter(rows))
+        self.assertEqual(list(read_csv(schema, io.StringIO(text))), rows)
+
+    def test_same_as_flatten(self):
+        schema = Person()
+        row = make_rows()[0]
+        flat = schema.flatten(schema.serialize(row))
+        result = self._callFUT(schema, [row])
+        self.assertEqual(result.split('\r\n')[0].split(','), list(flat))
+
+    def test_write_columns(self):
+        schema = Person()
+        columns = ['name', 'phones.0.number', 'home.x', 'home.y']
+        result = self._callFUT(schema, make_rows(), columns=columns)
+        self.assertEqual(
+            result,
+            'name,phones.0.number,home.x,home.y\r\n'
+            'keith,555-1212,1,2\r\n'
+            'fred,,3,4\r\n',
+        )
+
+    def test_write_tuple_columns(self):
+        schema = Person()
+        columns = ['friends.0.name', 'friends.1.rank']
+        result = self._callFUT(schema, make_rows(), columns=columns)
+        self.assertEqual(
+            result, 'friends.0.name,friends.1.rank\r\njim,2\r\njoe,\r\n'
+        )
+
+    def test_write_nulls(self):
+        schema = Person()
+        row = {'home': (1, 2), 'phones': [{}]}
+        result = self._callFUT(
+            schema, [row], columns=HEADER.strip().split(',')
+        )
+        self.assertEqual(result.split('\r\n')[1], ',,,,,,,,1,2')
+        result = self._callFUT(schema, [row])
+        self.assertEqual(
+            result,
+            'name,age,phones.0.location,phones.0.number,home.x,home.y\r\n'
+            ',,,,1,2\r\n',
+        )
+
+    def test_write_null_containers(self):
+        class Outer(colander.MappingSchema):
+            phone = Phone()
+            friend = Friend()
+            phones = Phones()
+
+        result = self._callFUT(Outer(), [{}])
+        self.assertEqual(
+            result,
+            'phone.location,phone.number,friend.rank,friend.name\r\n'
+            ',,,\r\n',
+        )
+
+    def test_write_too_many_items(self):
+        rows = make_rows()
+        rows.reverse()
+        self.assertRaises(ValueError, self._callFUT, Person(), rows)
+
+    def test_write_empty(self):
+        self.assertEqual(self._callFUT(Person(), []), '')
+        self.assertEqual(
+            self._callFUT(Person(), [], columns=['name']), 'name\r\n'
+        )
+
+    def test_bad_columns(self):
+        for columns in (
+            ['nope'],
+            ['name.x'],
+            ['friends.0.nope'],
+            ['friends.1.rank'],
+            ['name', 'name'],
+        ):
+            self.assertRaises(
+                ValueError,
+                self._callFUT,
+                Person(),
+                make_rows(),
+                columns=columns,
+            )